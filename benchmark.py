@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for the headless simulation paths, plus a fixed-seed suite
+of simulation and rendering scenarios for gating releases against a baseline
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+sys.path.append(os.path.dirname(__file__))
+
+from pacman_engine import *
+
+def bench_batch(args):
+    """Compare episode throughput of GameEngine objects against BatchEngine"""
+    from pacman_batch import BatchEngine
+
+    print("🎮 Object vs Batch Episode Throughput")
+    print("=" * 50)
+
+    start = time.perf_counter()
+    frames = 0
+    for _ in range(args.object_games):
+        engine = GameEngine()
+        engine.run(args.max_frames)
+        frames += engine.frame_count
+    object_time = time.perf_counter() - start
+    object_rate = args.object_games / object_time
+    print(f"🐢 GameEngine:  {args.object_games:6d} games in {object_time:7.2f}s "
+          f"({object_rate:8.1f} games/s, mean {frames / args.object_games:.0f} frames)")
+
+    start = time.perf_counter()
+    results = BatchEngine(args.games, seed=args.seed).run(args.max_frames)
+    batch_time = time.perf_counter() - start
+    batch_rate = args.games / batch_time
+    print(f"🚀 BatchEngine: {args.games:6d} games in {batch_time:7.2f}s "
+          f"({batch_rate:8.1f} games/s, mean {results['frames'].mean():.0f} frames)")
+
+    print(f"\n⚡ Speedup: {batch_rate / object_rate:.0f}x")
+
+def bench_distances(args):
+    """Build time and memory of the all-pairs maze distance index as mazes grow"""
+    print("🗺️  Maze Distance Index Scaling")
+    print("=" * 50)
+
+    rng = random.Random(args.seed)
+    layouts = [("default", Maze().walls, MAZE_WIDTH, MAZE_HEIGHT)]
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split("x"))
+        # Border plus scattered wall cells at the default maze's density
+        walls = {(x, y) for x in range(width) for y in range(height)
+                 if x in (0, width - 1) or y in (0, height - 1) or rng.random() < 0.06}
+        layouts.append((size, walls, width, height))
+
+    for name, walls, width, height in layouts:
+        cells = width * height - len(walls)
+        estimate = MazeDistances.estimate_bytes(cells)
+        if estimate > args.max_mb * 2**20:
+            print(f"⏭️  {name:>9}: {cells:6d} cells would need {estimate / 2**20:9.1f} MB, skipped")
+            continue
+        stats = MazeDistances(walls, width, height).stats()
+        print(f"📐 {name:>9}: {stats['cells']:6d} cells  {stats['bytes'] / 2**20:9.1f} MB  "
+              f"built in {stats['build_ms']:8.1f} ms  (diameter {stats['diameter']})")
+
+def bench_swarm(args):
+    """Engine frame time against ghost count, with and without the spatial hash"""
+    print("👻 Swarm Frame Time")
+    print("=" * 50)
+    print(f"{'ghosts':>8} {'hash ms':>10} {'scan ms':>10}")
+
+    for count in args.counts:
+        times = []
+        for spatial_hash in (True, False):
+            random.seed(args.seed)
+            engine = GameEngine(ghost_count=count, spatial_hash=spatial_hash)
+            # Keep the swarm running through collisions
+            engine.lives = args.frames + 1
+            start = time.perf_counter()
+            for _ in range(args.frames):
+                engine.update()
+            times.append((time.perf_counter() - start) / args.frames * 1000)
+        print(f"{count:8d} {times[0]:10.3f} {times[1]:10.3f}")
+
+def bench_ghosts(args):
+    """Memory and attribute access of slotted ghosts against pooled ghost views"""
+    import timeit
+    import tracemalloc
+
+    print("🧮 Ghost Storage")
+    print("=" * 50)
+
+    pool = GhostPool(args.count)
+    factories = (("Ghost", lambda: Ghost(400, 200, GhostType.RED, NEON_RED)),
+                 ("PooledGhost", lambda: pool.add(400, 200, GhostType.RED, NEON_RED)))
+    for name, factory in factories:
+        tracemalloc.start()
+        ghosts = [factory() for _ in range(args.count)]
+        memory = tracemalloc.get_traced_memory()[0] / args.count
+        tracemalloc.stop()
+        ghost = ghosts[0]
+        access = timeit.timeit(lambda: ghost.x + ghost.y, number=100000) * 10
+        print(f"👻 {name:>11}: {memory:6.0f} bytes/ghost, x + y read in {access * 1000:6.1f} ns")
+    print(f"📦 Pool buffers: {pool.bytes_per_ghost()} bytes/ghost")
+
+    for ghost_pool in (False, True):
+        random.seed(args.seed)
+        engine = GameEngine(ghost_count=args.count_engine, ghost_pool=ghost_pool)
+        engine.lives = args.frames + 1
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            engine.update()
+        frame = (time.perf_counter() - start) / args.frames * 1000
+        print(f"⏱️  {args.count_engine} {'pooled' if ghost_pool else 'slotted'} ghosts: {frame:.3f} ms/frame")
+
+def bench_generate(args):
+    """Procedural maze generation time as grids grow"""
+    print("🏗️  Maze Generation Time")
+    print("=" * 50)
+
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split("x"))
+        times = []
+        for seed in range(args.seed, args.seed + args.repeat):
+            maze = Maze(width, height, seed=seed)
+            times.append(maze.generate_time * 1000)
+        cells = width * height
+        print(f"🧱 {size:>9}: {cells:8d} cells  best {min(times):8.2f} ms  "
+              f"mean {sum(times) / len(times):8.2f} ms  ({maze.remaining_pellets()} pellets)")
+
+def bench_levels(args):
+    """Regenerating a level pack against memory-mapping it from disk"""
+    import os
+    import tempfile
+    from pacman_levels import LevelPack, save_level_pack
+
+    print("💾 Level Pack Loading")
+    print("=" * 50)
+
+    width, height = (int(v) for v in args.size.split("x"))
+    start = time.perf_counter()
+    mazes = [Maze(width, height, seed=args.seed + i) for i in range(args.levels)]
+    generate_time = time.perf_counter() - start
+    print(f"🏗️  Generate {args.levels} {args.size} mazes: {generate_time * 1000:9.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "levels.pack")
+        start = time.perf_counter()
+        save_level_pack(path, mazes)
+        print(f"💾 Write pack:  {(time.perf_counter() - start) * 1000:9.1f} ms "
+              f"({os.path.getsize(path) / 2**20:.1f} MB)")
+
+        start = time.perf_counter()
+        with LevelPack(path) as pack:
+            open_time = time.perf_counter() - start
+            loaded = list(pack)
+        load_time = time.perf_counter() - start
+        print(f"📂 Open pack:   {open_time * 1000:9.3f} ms")
+        print(f"🗺️  Map levels:  {load_time * 1000:9.1f} ms ({generate_time / load_time:.0f}x faster than generating)")
+        assert all((a.cells == b.cells).all() for a, b in zip(mazes, loaded))
+        # Release the mappings before the directory goes
+        del loaded
+
+def bench_snapshot(args):
+    """Cost of cloning game state: deepcopy against packed snapshots"""
+    import copy
+    import timeit
+
+    print("📸 Snapshot and Restore")
+    print("=" * 50)
+
+    engine = GameEngine(ghost_count=args.ghosts, rng=random.Random(args.seed))
+    engine.lives = args.frames + 1
+    for _ in range(args.frames):
+        engine.update()
+    snapshot = engine.snapshot()
+    light = engine.snapshot(rng=False)
+
+    def per_call(function, number):
+        return timeit.timeit(function, number=number) / number * 1e6
+
+    timings = [
+        ("copy.deepcopy", per_call(lambda: copy.deepcopy(engine), max(1, args.number // 100))),
+        ("snapshot()", per_call(engine.snapshot, args.number)),
+        ("snapshot(rng=False)", per_call(lambda: engine.snapshot(rng=False), args.number)),
+        ("restore()", per_call(lambda: engine.restore(snapshot), args.number)),
+        ("restore() without RNG", per_call(lambda: engine.restore(light), args.number)),
+        ("clone()", per_call(engine.clone, max(1, args.number // 10))),
+    ]
+    for name, micros in timings:
+        print(f"⏱️  {name:>22}: {micros:9.2f} µs  ({1e6 / micros:10.0f}/s)")
+    print(f"📦 Packed state: {snapshot.nbytes()} bytes + {len(snapshot.grid)} byte grid shared copy-on-write")
+
+# Release-gate scenarios: (description, rendered, ghost count, maze size or
+# None for the classic layout, forced power mode)
+SUITE_SCENARIOS = {
+    'idle': ("classic maze, Pacman idle", True, 4, None, False),
+    'power': ("power mode held, every glow pulsing", True, 4, None, True),
+    'swarm-50': ("50 ghosts", True, 50, None, False),
+    'swarm-200': ("200 ghosts", True, 200, None, False),
+    'large-maze': ("160x120 generated maze, headless", False, 16, (160, 120), False),
+    'large-maze-rendered': ("160x120 generated maze, drawn", True, 16, (160, 120), False),
+    'headless': ("classic maze, simulation only", False, 4, None, False),
+}
+# Per suite metric: whether larger is better, and the smallest absolute
+# change that counts, so sub-tick jitter on tiny values never fails a gate.
+# alloc_peak_kb is the mean over traced frames of the tracemalloc peak
+# above the frame's starting memory: transient bytes, not an allocation count.
+SUITE_METRICS = {
+    'updates_per_sec': (True, 0),
+    'draws_per_sec': (True, 0),
+    'frame_p95_ms': (False, 0.1),
+    'alloc_peak_kb': (False, 1.0),
+    'peak_rss_mb': (False, 5.0),
+}
+
+def peak_rss_mb():
+    """Peak resident set size of this process, None where unavailable"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+def run_scenario(name, frames, alloc_frames, seed):
+    """Metrics of one suite scenario; run in a fresh process so peak RSS is its own"""
+    import statistics
+    import tracemalloc
+
+    _, rendered, ghost_count, size, power = SUITE_SCENARIOS[name]
+    maze = Maze(size[0], size[1], seed=seed) if size is not None else None
+    engine = GameEngine(ghost_count=ghost_count, maze=maze, rng=random.Random(seed))
+    # Nobody steers, so keep the game from ending mid-measurement
+    engine.lives = frames + alloc_frames + 100
+    game = None
+    if rendered:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        from pacman_neon import Game
+        game = Game(engine=engine, rng=random.Random(seed))
+        game.audio.wait()
+
+    def frame():
+        if power:
+            engine.power_mode = True
+            engine.power_timer = POWER_MODE_FRAMES
+        start = time.perf_counter()
+        if game is not None:
+            game.update()
+        else:
+            engine.update()
+        middle = time.perf_counter()
+        if game is not None:
+            game.draw()
+        return middle - start, time.perf_counter() - middle
+
+    for _ in range(30):  # Warm the render caches
+        frame()
+    timings = [frame() for _ in range(frames)]
+    update_time = sum(update for update, _ in timings)
+    draw_time = sum(draw for _, draw in timings)
+
+    # Allocation pass, separate because tracing slows everything down
+    tracemalloc.start()
+    transient = []
+    for _ in range(alloc_frames):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        frame()
+        transient.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    return {
+        'updates_per_sec': frames / update_time,
+        'draws_per_sec': frames / draw_time if game is not None else None,
+        'frame_p95_ms': statistics.quantiles([sum(t) for t in timings], n=20)[-1] * 1000,
+        'alloc_peak_kb': statistics.mean(transient) / 1024 if transient else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+def bench_scenario(args):
+    """One suite scenario as JSON on stdout, for bench_suite's child processes"""
+    import json
+    print(json.dumps(run_scenario(args.name, args.frames, args.alloc_frames, args.seed)))
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Per-metric (scenario, metric, value, baseline, change, regressed) rows"""
+    rows = []
+    for name, metrics in results['scenarios'].items():
+        reference = baseline.get('scenarios', {}).get(name, {})
+        for metric, (higher_is_better, noise) in SUITE_METRICS.items():
+            value, base = metrics.get(metric), reference.get(metric)
+            if value is None or not base:
+                continue
+            change = value / base - 1
+            worse = base - value if higher_is_better else value - base
+            regressed = worse > noise and worse / base > tolerance
+            rows.append((name, metric, value, base, change, regressed))
+    return rows
+
+def bench_suite(args):
+    """Fixed-seed scenarios as JSON, optionally gated against a stored baseline"""
+    import json
+    import platform
+    import subprocess
+
+    print("🏁 Benchmark Suite")
+    print("=" * 50)
+
+    names = args.scenarios or list(SUITE_SCENARIOS)
+    results = {
+        'version': 1,
+        'seed': args.seed,
+        'frames': args.frames,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scenarios': {},
+    }
+    for name in names:
+        if name not in SUITE_SCENARIOS:
+            sys.exit(f"unknown scenario {name!r} (choose from {', '.join(SUITE_SCENARIOS)})")
+        samples = []
+        for _ in range(args.repeat):
+            child = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "scenario", name, "--frames", str(args.frames),
+                 "--alloc-frames", str(args.alloc_frames), "--seed", str(args.seed)],
+                check=True, capture_output=True, text=True)
+            samples.append(json.loads(child.stdout.strip().splitlines()[-1]))
+        # Best of the repeats: noise only ever makes a run slower
+        metrics = {}
+        for metric, (higher_is_better, _) in SUITE_METRICS.items():
+            values = [sample[metric] for sample in samples if sample[metric] is not None]
+            metrics[metric] = (max if higher_is_better else min)(values) if values else None
+        results['scenarios'][name] = metrics
+        draws = f"{metrics['draws_per_sec']:8.0f}" if metrics['draws_per_sec'] is not None else "       -"
+        print(f"📊 {name:>19}: {metrics['updates_per_sec']:9.0f} updates/s {draws} draws/s  "
+              f"p95 {metrics['frame_p95_ms']:6.2f} ms  {metrics['alloc_peak_kb']:7.1f} KB peak/frame  "
+              f"RSS {metrics['peak_rss_mb'] or 0:6.1f} MB")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"\nℹ️  No baseline at {args.baseline}; store one with --update-baseline")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows = compare_to_baseline(results, baseline, args.tolerance)
+    print(f"\n📏 Against {args.baseline} (tolerance {args.tolerance:.0%})")
+    if (baseline.get('platform'), baseline.get('python')) != (results['platform'], results['python']):
+        print(f"⚠️  Baseline is from {baseline.get('platform')}, Python {baseline.get('python')}; "
+              f"timings only compare on the same machine (refresh it with --update-baseline)")
+    for name, metric, value, base, change, regressed in rows:
+        print(f"{'❌' if regressed else '✅'} {name:>19} {metric:<19} {value:10.2f} vs {base:10.2f} ({change:+.1%})")
+    regressions = sum(row[5] for row in rows)
+    if regressions:
+        print(f"\n❌ {regressions} metric(s) regressed beyond {args.tolerance:.0%}")
+        sys.exit(1)
+    print("\n✅ No regressions")
+
+def main():
+    parser = argparse.ArgumentParser(description="Neon Pacman simulation benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    batch = subparsers.add_parser("batch", help="object-per-game vs vectorized batch throughput")
+    # The speedup passes 100x from about 10,000 games (see BatchEngine)
+    batch.add_argument("--games", type=int, default=20000, help="games simulated by the batch")
+    batch.add_argument("--object-games", type=int, default=100, help="games simulated one by one")
+    batch.add_argument("--max-frames", type=int, default=3000, help="frame limit per game")
+    batch.add_argument("--seed", type=int, default=None, help="batch random seed")
+    batch.set_defaults(func=bench_batch)
+
+    distances = subparsers.add_parser("distances", help="maze distance index build time and memory")
+    distances.add_argument("--sizes", nargs="*", default=["60x45", "80x60"],
+                           help="extra maze sizes as WIDTHxHEIGHT")
+    distances.add_argument("--max-mb", type=float, default=512, help="skip indexes larger than this")
+    distances.add_argument("--seed", type=int, default=0, help="wall layout seed")
+    distances.set_defaults(func=bench_distances)
+
+    swarm = subparsers.add_parser("swarm", help="engine frame time against ghost count")
+    swarm.add_argument("--counts", type=int, nargs="*", default=[4, 50, 100, 200, 400],
+                       help="ghost counts to time")
+    swarm.add_argument("--frames", type=int, default=300, help="frames per run")
+    swarm.add_argument("--seed", type=int, default=0, help="random seed")
+    swarm.set_defaults(func=bench_swarm)
+
+    ghosts = subparsers.add_parser("ghosts", help="ghost memory and attribute access, slotted vs pooled")
+    ghosts.add_argument("--count", type=int, default=10000, help="ghosts created for the memory figure")
+    ghosts.add_argument("--count-engine", type=int, default=200, help="ghosts in the timed engine")
+    ghosts.add_argument("--frames", type=int, default=300, help="frames per engine run")
+    ghosts.add_argument("--seed", type=int, default=0, help="random seed")
+    ghosts.set_defaults(func=bench_ghosts)
+
+    generate = subparsers.add_parser("generate", help="procedural maze generation time")
+    generate.add_argument("--sizes", nargs="*", default=["40x30", "200x200", "1000x1000"],
+                          help="maze sizes as WIDTHxHEIGHT")
+    generate.add_argument("--repeat", type=int, default=5, help="mazes generated per size")
+    generate.add_argument("--seed", type=int, default=0, help="first layout seed")
+    generate.set_defaults(func=bench_generate)
+
+    levels = subparsers.add_parser("levels", help="level pack write and memory-mapped load time")
+    levels.add_argument("--levels", type=int, default=200, help="mazes in the pack")
+    levels.add_argument("--size", default="200x200", help="maze size as WIDTHxHEIGHT")
+    levels.add_argument("--seed", type=int, default=0, help="first layout seed")
+    levels.set_defaults(func=bench_levels)
+
+    snapshot = subparsers.add_parser("snapshot", help="game state clone and restore cost")
+    snapshot.add_argument("--ghosts", type=int, default=4, help="ghosts in the engine")
+    snapshot.add_argument("--frames", type=int, default=300, help="frames played before timing")
+    snapshot.add_argument("--number", type=int, default=20000, help="calls timed per operation")
+    snapshot.add_argument("--seed", type=int, default=0, help="random seed")
+    snapshot.set_defaults(func=bench_snapshot)
+
+    suite = subparsers.add_parser("suite", help="fixed-seed release-gate scenarios, JSON and baseline check")
+    suite.add_argument("scenarios", nargs="*", help=f"scenarios to run (default all: {', '.join(SUITE_SCENARIOS)})")
+    suite.add_argument("--frames", type=int, default=600, help="timed frames per scenario")
+    suite.add_argument("--alloc-frames", type=int, default=60, help="frames traced for allocations")
+    suite.add_argument("--repeat", type=int, default=3, help="runs per scenario, best kept")
+    suite.add_argument("--seed", type=int, default=0, help="random seed")
+    suite.add_argument("--output", help="write results JSON here")
+    suite.add_argument("--baseline", default="benchmark_baseline.json", help="stored baseline JSON")
+    suite.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    suite.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    suite.set_defaults(func=bench_suite)
+
+    scenario = subparsers.add_parser("scenario", help="one suite scenario as JSON (used by suite)")
+    scenario.add_argument("name", choices=list(SUITE_SCENARIOS))
+    scenario.add_argument("--frames", type=int, default=600, help="timed frames")
+    scenario.add_argument("--alloc-frames", type=int, default=60, help="frames traced for allocations")
+    scenario.add_argument("--seed", type=int, default=0, help="random seed")
+    scenario.set_defaults(func=bench_scenario)
+
+    args = parser.parse_args()
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(__file__))
 
-from pacman_neon import *
+from pacman_engine import *
 import time
 
 def demo_enhanced_features():
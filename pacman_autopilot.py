@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Autopilot for Neon Pacman - picks Pacman's moves by Monte Carlo search,
+simulating the real ghost AI in rollouts spread over a process pool, within
+a per-move time budget
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pacman_engine import (
+    CELL_SIZE, CELL_WALL, CELL_PELLET, CELL_POWER_PELLET, DIRECTIONS, TICK_RATE,
+    Direction, EngineSnapshot, GameEngine, Maze, MazeDistances,
+)
+
+# Rollout scoring: points won, minus a heavy price per life, plus a pull
+# toward the nearest pellet so empty stretches still have a direction
+DEATH_PENALTY = 1000
+CLEAR_BONUS = 2000
+PELLET_DISTANCE_WEIGHT = 2
+# Largest maze distance matrix a search builds for its pellet pull; bigger
+# mazes (or ones past the uint16 index limit) use Manhattan distance
+PELLET_DISTANCE_MAX_BYTES = 256 * 2**20
+
+OPPOSITE = {direction: Direction((-direction.value[0], -direction.value[1])) for direction in Direction}
+
+def engine_spec(engine: GameEngine) -> tuple:
+    """Picklable description of an engine's options and maze, to rebuild it in a worker"""
+    maze = engine.maze
+    return (engine.pathfinding, engine.junction_ai, len(engine.ghosts), engine.ghost_hash is not None,
+            bytes(maze.grid), maze.width, maze.height,
+            maze.pacman_start, list(maze.ghost_starts), list(maze.ghost_respawns), engine.ghost_config)
+
+class RolloutSearch:
+    """One process's search state: a private engine to play rollouts on
+
+    The root of the search is Pacman's next direction; each one is scored
+    by random playouts from the current state with UCB1 choosing which to
+    try next. Rollouts run the real engine, ghosts and all, with Pacman
+    turning at random at cell centers but never reversing.
+    """
+
+    def __init__(self, spec: tuple, depth: int = 40, exploration: float = 50.0):
+        (pathfinding, junction_ai, ghost_count, spatial_hash, grid, width, height,
+         pacman_start, ghost_starts, ghost_respawns, ghost_config) = spec
+        maze = Maze.from_grid(bytearray(grid), width, height)
+        maze.pacman_start = pacman_start
+        maze.ghost_starts = ghost_starts
+        maze.ghost_respawns = ghost_respawns
+        self.engine = GameEngine(pathfinding, junction_ai, ghost_count, spatial_hash,
+                                 maze=maze, rng=random.Random(), ghost_config=ghost_config)
+        self.depth = depth
+        self.exploration = exploration
+        self.width = width
+        self.distances = None
+        walkable = width * height - maze.count(CELL_WALL)
+        if (walkable <= MazeDistances.UNREACHABLE and
+                MazeDistances.estimate_bytes(walkable) <= PELLET_DISTANCE_MAX_BYTES):
+            # Cell number of every grid position, for pellet distance lookups
+            self.distances = maze.distances()
+            self.cell_numbers = np.full(width * height, -1, dtype=np.intp)
+            for number, (x, y) in enumerate(self.distances.cells):
+                self.cell_numbers[y * width + x] = number
+
+    def nearest_pellet(self) -> int:
+        """Maze distance from Pacman to the closest pellet, 0 when none are left
+        
+        Mazes too big to index use Manhattan distance instead.
+        """
+        engine = self.engine
+        pellets = np.flatnonzero(engine.maze.cells.ravel() & (CELL_PELLET | CELL_POWER_PELLET))
+        if not len(pellets):
+            return 0
+        if self.distances is None:
+            x, y = engine.pacman.get_grid_pos()
+            ys, xs = np.divmod(pellets, self.width)
+            return int((np.abs(xs - x) + np.abs(ys - y)).min())
+        start = self.distances.index.get(engine.pacman.get_grid_pos())
+        if start is None:
+            return 0
+        return int(self.distances.matrix[start, self.cell_numbers[pellets]].min())
+
+    def rollout(self, snapshot: EngineSnapshot, first: Direction, rng: random.Random) -> float:
+        """Play one random continuation starting with first and score it"""
+        engine = self.engine
+        engine.restore(snapshot)
+        engine.rng.seed(rng.random())
+        score, lives = engine.score, engine.lives
+        pacman = engine.pacman
+        maze = engine.maze
+        pacman.set_direction(first)
+        for frame in range(self.depth):
+            if engine.game_over:
+                break
+            if frame and pacman.x % CELL_SIZE == 0 and pacman.y % CELL_SIZE == 0:
+                x, y = pacman.get_grid_pos()
+                choices = [d for d in DIRECTIONS if d is not OPPOSITE[pacman.direction]
+                           and maze.is_valid_position(x + d.value[0], y + d.value[1])]
+                if choices:
+                    pacman.set_direction(rng.choice(choices))
+            engine.update()
+        value = engine.score - score - DEATH_PENALTY * (lives - engine.lives)
+        if engine.game_over and engine.lives > 0:
+            value += CLEAR_BONUS
+        return value - PELLET_DISTANCE_WEIGHT * self.nearest_pellet()
+
+    def search(self, snapshot: EngineSnapshot, candidates: Sequence[Direction], seed: int,
+               time_budget: Optional[float], max_rollouts: Optional[int]) -> List[Tuple[float, int]]:
+        """(total value, rollouts) per candidate, within the time budget or rollout cap"""
+        rng = random.Random(seed)
+        totals = [0.0] * len(candidates)
+        visits = [0] * len(candidates)
+        deadline = time.perf_counter() + time_budget if time_budget is not None else math.inf
+        count = 0
+        while count < len(candidates) or (time.perf_counter() < deadline and
+                                         (max_rollouts is None or count < max_rollouts)):
+            if count < len(candidates):
+                choice = count
+            else:
+                log_count = math.log(count)
+                choice = max(range(len(candidates)), key=lambda i: totals[i] / visits[i] +
+                             self.exploration * math.sqrt(log_count / visits[i]))
+            totals[choice] += self.rollout(snapshot, candidates[choice], rng)
+            visits[choice] += 1
+            count += 1
+        return list(zip(totals, visits))
+
+# The search of each pool worker, built once by the initializer
+_worker_search: Optional[RolloutSearch] = None
+
+def _init_worker(spec: tuple, depth: int, exploration: float):
+    global _worker_search
+    _worker_search = RolloutSearch(spec, depth, exploration)
+
+def _worker_run(snapshot, candidates, seed, time_budget, max_rollouts):
+    return _worker_search.search(snapshot, candidates, seed, time_budget, max_rollouts)
+
+class Autopilot:
+    """Steers Pacman by root-parallel Monte Carlo search
+
+    Each worker process searches the same position independently with its
+    own seed and the root statistics are summed, so more cores mean more
+    rollouts per move. A move is only planned when Pacman reaches a cell
+    center or is blocked; in between it keeps going. With workers=0 the
+    search runs in this process, and with time_budget=None every worker
+    runs exactly max_rollouts rollouts, for reproducible results.
+    """
+
+    def __init__(self, engine: GameEngine, workers: Optional[int] = None, time_budget: Optional[float] = 0.010,
+                 max_rollouts: Optional[int] = None, depth: int = 40, exploration: float = 50.0,
+                 seed: int = 0):
+        if time_budget is None and max_rollouts is None:
+            raise ValueError("Autopilot needs a time budget or a rollout cap")
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.time_budget = time_budget
+        self.max_rollouts = max_rollouts
+        self.seed = seed
+        spec = engine_spec(engine)
+        if self.workers:
+            # Workers only need the picklable spec, so start them fresh rather
+            # than forking a process that may be running SDL and loader threads
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            self.pool = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker,
+                                            initargs=(spec, depth, exploration))
+            self.local = None
+        else:
+            self.pool = None
+            self.local = RolloutSearch(spec, depth, exploration)
+        self.last_position = None
+        self.rollouts = 0
+        self.decisions = 0
+        self.search_time = 0.0
+
+    def candidates(self, engine: GameEngine) -> List[Direction]:
+        """Directions Pacman can move in from its cell"""
+        x, y = engine.pacman.get_grid_pos()
+        return [d for d in DIRECTIONS if engine.maze.is_valid_position(x + d.value[0], y + d.value[1])]
+
+    def plan(self, engine: GameEngine) -> Dict[Direction, Tuple[float, int]]:
+        """(total value, rollouts) of every candidate direction from the engine's state"""
+        candidates = self.candidates(engine)
+        snapshot = engine.snapshot(rng=False)
+        seed = self.seed * 1000003 + engine.frame_count
+        if self.pool is None:
+            results = [self.local.search(snapshot, candidates, seed, self.time_budget, self.max_rollouts)]
+        else:
+            futures = [self.pool.submit(_worker_run, snapshot, candidates, seed * 64 + worker,
+                                        self.time_budget, self.max_rollouts)
+                       for worker in range(self.workers)]
+            results = [future.result() for future in futures]
+        merged = {}
+        for index, direction in enumerate(candidates):
+            merged[direction] = (sum(result[index][0] for result in results),
+                                 sum(result[index][1] for result in results))
+        return merged
+
+    def choose(self, engine: GameEngine) -> Optional[Direction]:
+        """Direction to steer before the engine's next update, None to keep going"""
+        pacman = engine.pacman
+        position = (pacman.x, pacman.y)
+        aligned = pacman.x % CELL_SIZE == 0 and pacman.y % CELL_SIZE == 0
+        blocked = position == self.last_position
+        self.last_position = position
+        if engine.game_over or not (aligned or blocked):
+            return None
+        start = time.perf_counter()
+        scores = self.plan(engine)
+        self.search_time += time.perf_counter() - start
+        self.decisions += 1
+        if not scores:
+            return None
+        self.rollouts += sum(visits for _, visits in scores.values())
+        return max(scores, key=lambda d: scores[d][0] / max(1, scores[d][1]))
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    def stats(self) -> dict:
+        """Search effort so far"""
+        return {
+            'workers': self.workers,
+            'decisions': self.decisions,
+            'rollouts': self.rollouts,
+            'rollouts_per_decision': self.rollouts / max(1, self.decisions),
+            'ms_per_decision': self.search_time / max(1, self.decisions) * 1000,
+        }
+
+def play(engine: GameEngine, autopilot: Autopilot, max_frames: int) -> int:
+    """Let the autopilot play a headless game; returns the score"""
+    return engine.run(max_frames, controller=autopilot.choose)
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Neon Pacman games played by the autopilot")
+    parser.add_argument("--games", type=int, default=3, help="games to play")
+    parser.add_argument("--workers", type=int, default=None, help="rollout processes (0 runs in-process)")
+    parser.add_argument("--budget", type=float, default=0.010, help="search seconds per move")
+    parser.add_argument("--depth", type=int, default=40, help="rollout length in frames")
+    parser.add_argument("--max-frames", type=int, default=3000, help="frame limit per game")
+    parser.add_argument("--seed", type=int, default=0, help="first game seed")
+    args = parser.parse_args()
+
+    for game in range(args.games):
+        engine = GameEngine(rng=random.Random(args.seed + game))
+        autopilot = Autopilot(engine, args.workers, args.budget, depth=args.depth, seed=args.seed + game)
+        start = time.perf_counter()
+        try:
+            score = play(engine, autopilot, args.max_frames)
+        finally:
+            autopilot.close()
+        elapsed = time.perf_counter() - start
+        stats = autopilot.stats()
+        print(f"🤖 Game {game + 1}: score {score:5d}, lives {engine.lives}, {engine.frame_count} frames "
+              f"({engine.frame_count / TICK_RATE / elapsed:.1f}x real time), "
+              f"{stats['rollouts_per_decision']:.0f} rollouts/move on {stats['workers']} workers")
+
+if __name__ == "__main__":
+    main()
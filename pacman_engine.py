@@ -0,0 +1,1513 @@
+#!/usr/bin/env python3
+"""
+Neon Pacman simulation engine - maze, Pacman, ghost AI, scoring and collisions
+without any pygame dependency, so games can be simulated headlessly
+"""
+
+import math
+import random
+import struct
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping, MutableSet
+from enum import Enum
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Set, Tuple, Optional
+
+import numpy as np
+
+from pacman_profiler import NULL_PROFILER
+
+# Constants
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+CELL_SIZE = 20
+MAZE_WIDTH = SCREEN_WIDTH // CELL_SIZE
+MAZE_HEIGHT = SCREEN_HEIGHT // CELL_SIZE
+
+# Neon Colors
+NEON_BLUE = (0, 255, 255)
+NEON_PINK = (255, 20, 147)
+NEON_GREEN = (57, 255, 20)
+NEON_YELLOW = (255, 255, 0)
+NEON_PURPLE = (138, 43, 226)
+NEON_RED = (255, 0, 100)
+NEON_ORANGE = (255, 165, 0)
+BLACK = (0, 0, 0)
+DARK_BLUE = (0, 0, 50)
+GLOW_WHITE = (255, 255, 255)
+
+# Game Constants
+PACMAN_SPEED = 4
+GHOST_SPEED = 3
+PELLET_SCORE = 10
+POWER_PELLET_SCORE = 50
+LIVES = 3
+
+POWER_MODE_FRAMES = 300  # 5 seconds at 60 FPS
+GHOST_SCORE = 200
+
+# Fixed simulation rate, and how many ticks a slow frame may catch up on
+TICK_RATE = 60
+MAX_CATCH_UP_TICKS = 5
+
+# Initial ghost positions in the classic layout; respawns use maze.ghost_respawns (see GameEngine.respawn_point)
+GHOST_STARTS = [
+    (CELL_SIZE * 18, CELL_SIZE * 10),
+    (CELL_SIZE * 20, CELL_SIZE * 10),
+    (CELL_SIZE * 18, CELL_SIZE * 12),
+    (CELL_SIZE * 20, CELL_SIZE * 12),
+]
+
+class Direction(Enum):
+    UP = (0, -1)
+    DOWN = (0, 1)
+    LEFT = (-1, 0)
+    RIGHT = (1, 0)
+
+# Directions in definition order with their (dx, dy), for hot loops
+DIRECTIONS = list(Direction)
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTIONS)}
+DIRECTION_STEPS = tuple((direction, direction.value) for direction in DIRECTIONS)
+
+class GhostType(Enum):
+    RED = "aggressive"
+    PINK = "ambush"
+    BLUE = "patrol"
+    PURPLE = "random"
+
+class GhostConfig(NamedTuple):
+    """Tunable numbers of the ghost AI, shared by every ghost of an engine"""
+    prediction_cells: int = 4  # How far ahead of Pacman the pink ghost aims
+    chase_radius_cells: int = 5  # Distance at which the blue ghost leaves its patrol
+    retarget_chance: float = 0.15  # Per-frame chance the purple ghost picks a new target
+    chase_chance: float = 0.3  # Share of purple retargets aimed near Pacman
+    mode_period: int = 300  # Frames between scatter/chase switches
+
+DEFAULT_GHOST_CONFIG = GhostConfig()
+
+def ghost_patrol_route(ghost_type: GhostType, width: int = MAZE_WIDTH,
+                       height: int = MAZE_HEIGHT) -> Tuple[Tuple[int, int], ...]:
+    """Patrol route of a ghost type in a width x height maze, empty for non-patrolling types"""
+    if ghost_type != GhostType.BLUE:
+        return ()
+    return (
+        (2 * CELL_SIZE, 2 * CELL_SIZE),
+        ((width - 3) * CELL_SIZE, 2 * CELL_SIZE),
+        ((width - 3) * CELL_SIZE, (height - 3) * CELL_SIZE),
+        (2 * CELL_SIZE, (height - 3) * CELL_SIZE),
+    )
+
+def ghost_home_corner(ghost_type: GhostType, width: int = MAZE_WIDTH,
+                      height: int = MAZE_HEIGHT) -> Optional[Tuple[int, int]]:
+    """Scatter-mode home corner of a ghost type in a width x height maze"""
+    return {
+        GhostType.RED: ((width - 2) * CELL_SIZE, 2 * CELL_SIZE),
+        GhostType.PINK: (2 * CELL_SIZE, 2 * CELL_SIZE),
+        GhostType.BLUE: ((width - 2) * CELL_SIZE, (height - 2) * CELL_SIZE),
+        GhostType.PURPLE: (2 * CELL_SIZE, (height - 2) * CELL_SIZE),
+    }.get(ghost_type)
+
+# Wall layouts whose distance index and junction graph stay shared between
+# mazes; older layouts keep theirs only as long as a Maze holds them
+LAYOUT_CACHE_SIZE = 4
+
+# Cell flags of the maze grid
+CELL_WALL = 1
+CELL_PELLET = 2
+CELL_POWER_PELLET = 4
+
+class CellSet(MutableSet):
+    """Set-style view of the maze cells carrying one flag
+    
+    Membership, add and discard are single grid reads and writes, and the
+    count is kept by the maze, so len() and truth tests never scan.
+    Set algebra with other sets returns plain sets.
+    """
+    
+    __slots__ = ('maze', 'flag')
+    
+    def __init__(self, maze: 'Maze', flag: int):
+        self.maze = maze
+        self.flag = flag
+    
+    @classmethod
+    def _from_iterable(cls, iterable):
+        return set(iterable)
+    
+    def __contains__(self, cell) -> bool:
+        try:
+            x, y = cell
+        except (TypeError, ValueError):
+            return False
+        maze = self.maze
+        return (0 <= x < maze.width and 0 <= y < maze.height and
+                bool(maze.grid[y * maze.width + x] & self.flag))
+    
+    def __iter__(self):
+        ys, xs = np.nonzero(self.maze.cells & self.flag)
+        return zip(xs.tolist(), ys.tolist())
+    
+    def __len__(self) -> int:
+        return self.maze.counts[self.flag]
+    
+    def __repr__(self) -> str:
+        return f"CellSet({set(self)!r})"
+    
+    def add(self, cell: Tuple[int, int]):
+        self.maze.set_flag(cell[0], cell[1], self.flag)
+    
+    def discard(self, cell: Tuple[int, int]):
+        if cell in self:
+            self.maze.clear_flag(cell[0], cell[1], self.flag)
+    
+    def clear(self):
+        self.maze.clear_all(self.flag)
+
+def _cell_set_property(flag: int, name: str):
+    """Maze attribute reading as a CellSet; assigning an iterable replaces its cells"""
+    def replace(maze: 'Maze', cells):
+        cells = list(cells)
+        maze.clear_all(flag)
+        for x, y in cells:
+            maze.set_flag(x, y, flag)
+    return property(lambda maze: maze.cell_sets[flag], replace, doc=f"Cells holding {name}")
+
+class Maze:
+    """Represents the game maze
+    
+    Cells are one byte of CELL_* flags each in a row-major bytearray, with
+    a NumPy view (cells) for vectorized passes. walls, pellets and
+    power_pellets are set-style views over it; every write goes through
+    set_flag, clear_flag and clear_all, which keep per-flag counts and drop
+    the cached path indexes when walls change.
+    
+    Without a seed the classic hand-placed layout is built, with pellets
+    drawn from rng (the global random module by default); with one,
+    generate_procedural builds a reproducible symmetric layout of any size.
+    """
+    
+    walls = _cell_set_property(CELL_WALL, "walls")
+    pellets = _cell_set_property(CELL_PELLET, "pellets")
+    power_pellets = _cell_set_property(CELL_POWER_PELLET, "power pellets")
+    
+    def __init__(self, width: int = MAZE_WIDTH, height: int = MAZE_HEIGHT, seed: Optional[int] = None,
+                 rng: Optional[random.Random] = None):
+        self._attach(bytearray(width * height), width, height)
+        if seed is None:
+            self.generate_maze(rng if rng is not None else random)
+        else:
+            self.generate_procedural(seed)
+    
+    def _attach(self, grid, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.grid = grid
+        self.cells = np.frombuffer(self.grid, dtype=np.uint8).reshape(self.height, self.width)
+        self.counts = {CELL_WALL: 0, CELL_PELLET: 0, CELL_POWER_PELLET: 0}
+        self.cell_sets = {flag: CellSet(self, flag) for flag in self.counts}
+        self._distances = None
+        self._junctions = None
+        # Bumped on every write; frozen_grid reuses its copy while it holds
+        self.version = 0
+        self._frozen = None
+        self._frozen_version = -1
+        # Spawn cells for Pacman and the classic four ghosts
+        self.pacman_start = (2, 2)
+        self.ghost_starts = [(x // CELL_SIZE, y // CELL_SIZE) for x, y in GHOST_STARTS]
+        self.ghost_respawns = [(18 + index % 2, 10 + index // 2) for index in range(len(GHOST_STARTS))]
+        self.generate_time = 0.0
+    
+    @classmethod
+    def from_grid(cls, grid, width: int, height: int, counts: Optional[Dict[int, int]] = None) -> 'Maze':
+        """Maze over an existing writable buffer of width * height flag bytes
+        
+        The buffer is used in place, not copied, so a copy-on-write mmap
+        keeps the file's pages shared until cells change. counts, when
+        known, saves a pass over the grid.
+        """
+        if len(grid) != width * height:
+            raise ValueError(f"grid of {len(grid)} bytes does not fit a {width}x{height} maze")
+        maze = cls.__new__(cls)
+        maze._attach(grid, width, height)
+        for flag in maze.counts:
+            maze.counts[flag] = counts[flag] if counts is not None else maze.count(flag)
+        return maze
+    
+    def generate_maze(self, rng=random):
+        """Generate a simple maze layout"""
+        # Create border walls
+        for x in range(self.width):
+            self.walls.add((x, 0))
+            self.walls.add((x, self.height - 1))
+        for y in range(self.height):
+            self.walls.add((0, y))
+            self.walls.add((self.width - 1, y))
+        
+        # Add some internal walls for complexity
+        wall_patterns = [
+            # Horizontal walls
+            [(x, 5) for x in range(5, 15)],
+            [(x, 10) for x in range(10, 20)],
+            [(x, 15) for x in range(5, 25)],
+            [(x, 20) for x in range(15, 30)],
+            # Vertical walls
+            [(10, y) for y in range(8, 13)],
+            [(20, y) for y in range(3, 8)],
+            [(30, y) for y in range(12, 18)],
+        ]
+        
+        for pattern in wall_patterns:
+            for pos in pattern:
+                if 0 < pos[0] < self.width - 1 and 0 < pos[1] < self.height - 1:
+                    self.walls.add(pos)
+        
+        # Generate pellets in empty spaces, writing the grid directly
+        grid = self.grid
+        for x in range(1, self.width - 1):
+            for y in range(1, self.height - 1):
+                index = y * self.width + x
+                if not grid[index] & CELL_WALL:
+                    # Add power pellets in corners
+                    if (x < 3 or x > self.width - 4) and (y < 3 or y > self.height - 4):
+                        if rng.random() < 0.3:  # 30% chance for power pellet in corners
+                            grid[index] |= CELL_POWER_PELLET
+                    else:
+                        # Regular pellets everywhere else
+                        if rng.random() < 0.7:  # 70% chance for regular pellet
+                            grid[index] |= CELL_PELLET
+        self.counts[CELL_PELLET] = self.count(CELL_PELLET)
+        self.counts[CELL_POWER_PELLET] = self.count(CELL_POWER_PELLET)
+    
+    def generate_procedural(self, seed: int, braid: float = 1.0, center_links: float = 0.3):
+        """Generate a connected, left-right symmetric layout from seed
+        
+        The left half is a sidewinder maze on the odd-coordinate lattice,
+        built with whole-array passes so it scales to 1000x1000 grids.
+        braid is the chance that each dead end is opened into a loop, and
+        center_links the chance that a lattice row crosses the center
+        (the top row always does, which joins the two halves). Every open
+        cell gets a pellet except the spawns, with power pellets in the
+        four corners.
+        """
+        start = time.perf_counter()
+        width, height = self.width, self.height
+        rng = np.random.default_rng(seed)
+        # Lattice rows and left-half columns; the last lattice column stays
+        # clear of the center so the halves only meet through center links
+        center = (width - 1) // 2
+        rows, cols = (height - 1) // 2, center // 2
+        if rows < 3 or cols < 3:
+            raise ValueError(f"a {width}x{height} maze is too small to generate, need at least 13x7")
+        last = 2 * cols - 1
+        
+        # Sidewinder: the top row is one corridor, every other row is cut
+        # into runs that each open north from one random member
+        east = rng.random((rows, cols)) < 0.5
+        east[:, -1] = False
+        east[0, :-1] = True
+        run_starts = np.concatenate(([True], ~east.ravel()[:-1]))
+        keys = rng.random(rows * cols)
+        run_max = np.maximum.reduceat(keys, np.flatnonzero(run_starts))
+        north = (keys == run_max[np.cumsum(run_starts) - 1]).reshape(rows, cols)
+        north[0] = False
+        links = rng.random(rows) < center_links
+        links[0] = True
+        
+        # Braid: open one closed side of each dead end, toward another
+        # lattice cell or the center
+        exits = east.astype(np.int8) + north
+        exits[:, 1:] += east[:, :-1]
+        exits[:-1] += north[1:]
+        exits[:, -1] += links
+        closed = np.zeros((5, rows, cols), dtype=bool)
+        closed[0, :, :-1] = ~east[:, :-1]
+        closed[1, :, 1:] = ~east[:, :-1]
+        closed[2, 1:] = ~north[1:]
+        closed[3, :-1] = ~north[1:]
+        closed[4, :, -1] = ~links
+        dead = (exits == 1) & (rng.random((rows, cols)) < braid)
+        choice = np.argmax(rng.random((5, rows, cols)) * closed, axis=0)
+        opened = [dead & (choice == side) & closed[side] for side in range(5)]
+        east |= opened[0]
+        east[:, :-1] |= opened[1][:, 1:]
+        north |= opened[2]
+        north[1:] |= opened[3][:-1]
+        links |= opened[4][:, -1]
+        
+        # Carve the half grid, then mirror it onto the right
+        half = np.full((height, center + 1), CELL_WALL, dtype=np.uint8)
+        half[1:2 * rows:2, 1:2 * cols:2] = 0
+        half[1:2 * rows:2, 2:2 * cols - 1:2][east[:, :-1]] = 0
+        half[2:2 * rows - 1:2, 1:2 * cols:2][north[1:]] = 0
+        half[2 * np.flatnonzero(links) + 1, last + 1:] = 0
+        cells = self.cells
+        cells[:, :center + 1] = half
+        cells[:, width - center - 1:] = half[:, ::-1]
+        
+        # Spawns: Pacman on the left edge, ghosts either side of the center
+        middle = 2 * (rows // 2) + 1
+        below = middle + 2 if middle + 2 < 2 * rows else middle - 2
+        self.pacman_start = (1, middle)
+        self.ghost_starts = [(last, middle), (width - 1 - last, middle),
+                             (last, below), (width - 1 - last, below)]
+        self.ghost_respawns = list(self.ghost_starts)
+        
+        bottom = 2 * rows - 1
+        corners = [(1, 1), (width - 2, 1), (1, bottom), (width - 2, bottom)]
+        open_cells = cells == 0
+        for x, y in corners:
+            cells[y, x] = CELL_POWER_PELLET
+        open_cells[[y for _, y in corners], [x for x, _ in corners]] = False
+        for x, y in [self.pacman_start] + self.ghost_starts:
+            open_cells[y, x] = False
+        cells[open_cells] = CELL_PELLET
+        
+        for flag in self.counts:
+            self.counts[flag] = self.count(flag)
+        self._changed(CELL_WALL)
+        self.generate_time = time.perf_counter() - start
+    
+    def is_wall(self, x: int, y: int) -> bool:
+        """Check if position is a wall"""
+        return self.has_flag(x, y, CELL_WALL)
+    
+    def is_valid_position(self, x: int, y: int) -> bool:
+        """Check if position is valid (not a wall and within bounds)"""
+        width = self.width
+        return (0 <= x < width and 0 <= y < self.height and 
+                not self.grid[y * width + x] & CELL_WALL)
+    
+    def has_flag(self, x: int, y: int, flag: int) -> bool:
+        """Whether the cell carries flag; cells off the grid carry none"""
+        return (0 <= x < self.width and 0 <= y < self.height and
+                bool(self.grid[y * self.width + x] & flag))
+    
+    def set_flag(self, x: int, y: int, flag: int):
+        """Add flag to a cell"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"cell {(x, y)} is outside the {self.width}x{self.height} maze")
+        index = y * self.width + x
+        if not self.grid[index] & flag:
+            self.grid[index] |= flag
+            self.counts[flag] += 1
+            self._changed(flag)
+    
+    def clear_flag(self, x: int, y: int, flag: int):
+        """Remove flag from a cell"""
+        index = y * self.width + x
+        if self.grid[index] & flag:
+            self.grid[index] &= ~flag
+            self.counts[flag] -= 1
+            self._changed(flag)
+    
+    def clear_all(self, flag: int):
+        """Remove flag from every cell"""
+        self.cells &= ~np.uint8(flag)
+        self.counts[flag] = 0
+        self._changed(flag)
+    
+    def _changed(self, flag: int):
+        self.version += 1
+        if flag == CELL_WALL:
+            self._distances = None
+            self._junctions = None
+    
+    def frozen_grid(self) -> bytes:
+        """Immutable copy of the grid, shared by every caller until the grid changes"""
+        if self._frozen_version != self.version:
+            self._frozen = bytes(self.grid)
+            self._frozen_version = self.version
+        return self._frozen
+    
+    def restore_grid(self, frozen: bytes, counts: Tuple[int, int, int]):
+        """Put back a frozen_grid copy of this layout and its (wall, pellet, power pellet) counts"""
+        if frozen is self._frozen and self._frozen_version == self.version:
+            return
+        self.grid[:] = frozen
+        self.counts[CELL_WALL], self.counts[CELL_PELLET], self.counts[CELL_POWER_PELLET] = counts
+        self.version += 1
+        self._frozen = frozen
+        self._frozen_version = self.version
+    
+    def copy(self) -> 'Maze':
+        """Independent maze in the same state, sharing the layout's path indexes"""
+        copy = Maze.from_grid(bytearray(self.frozen_grid()), self.width, self.height, self.counts)
+        copy.pacman_start = self.pacman_start
+        copy.ghost_starts = list(self.ghost_starts)
+        copy.ghost_respawns = list(self.ghost_respawns)
+        copy.attach_tables(self._distances, self._junctions)
+        return copy
+    
+    def __reduce__(self):
+        # Pickle the grid and spawn cells; the grid views and path indexes are rebuilt
+        return (_unpickle_maze, (self.frozen_grid(), self.width, self.height, dict(self.counts),
+                                 self.pacman_start, list(self.ghost_starts), list(self.ghost_respawns)))
+    
+    def count(self, flags: int) -> int:
+        """Cells carrying any of flags, counted over the grid"""
+        return int(np.count_nonzero(self.cells & flags))
+    
+    def remaining_pellets(self) -> int:
+        """Pellets and power pellets left"""
+        return self.counts[CELL_PELLET] + self.counts[CELL_POWER_PELLET]
+    
+    def distances(self) -> 'MazeDistances':
+        """Shortest path lengths between walkable cells, built on first use"""
+        if self._distances is None:
+            self._distances = MazeDistances.for_walls(self.walls, self.width, self.height)
+        return self._distances
+    
+    def attach_tables(self, distances: Optional['MazeDistances'] = None,
+                      junctions: Optional['JunctionGraph'] = None):
+        """Use prebuilt path indexes, e.g. loaded with the level, for this layout"""
+        if distances is not None:
+            self._distances = distances
+        if junctions is not None:
+            self._junctions = junctions
+    
+    def junctions(self) -> 'JunctionGraph':
+        """Junctions and the corridors between them, built on first use"""
+        if self._junctions is None:
+            self._junctions = JunctionGraph.for_walls(self.walls, self.width, self.height)
+        return self._junctions
+
+def _unpickle_maze(grid: bytes, width: int, height: int, counts: Dict[int, int], pacman_start,
+                   ghost_starts, ghost_respawns) -> Maze:
+    maze = Maze.from_grid(bytearray(grid), width, height, counts)
+    maze.pacman_start = pacman_start
+    maze.ghost_starts = ghost_starts
+    maze.ghost_respawns = ghost_respawns
+    return maze
+
+def _layout_cached(cache: OrderedDict, cls, walls, width: int, height: int):
+    """cls(walls, width, height) from a LAYOUT_CACHE_SIZE-entry LRU cache"""
+    key = (frozenset(walls), width, height)
+    table = cache.get(key)
+    if table is None:
+        table = cache[key] = cls(walls, width, height)
+        if len(cache) > LAYOUT_CACHE_SIZE:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return table
+
+class MazeDistances:
+    """All-pairs BFS distances between the walkable cells of a wall layout
+    
+    BFS runs from every cell at once: each cell keeps the set of sources
+    that reached it as a packed bit row, so one BFS level is a handful of
+    row gathers, and level numbers are collected as bit planes. Distances
+    are stored in a uint16 matrix indexed by cell number, with UNREACHABLE
+    for disconnected pairs, so a lookup is O(1) but memory grows with the
+    square of the walkable cell count.
+    """
+    
+    UNREACHABLE = 0xFFFF
+    
+    # Indexes of recent layouts, keyed by (walls, width, height)
+    _cache: 'OrderedDict[Tuple[FrozenSet[Tuple[int, int]], int, int], MazeDistances]' = OrderedDict()
+    
+    def __init__(self, walls, width: int, height: int):
+        start = time.perf_counter()
+        self.width = width
+        self.height = height
+        self.cells = [(x, y) for y in range(height) for x in range(width) if (x, y) not in walls]
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        count = len(self.cells)
+        if count > self.UNREACHABLE:
+            raise ValueError(f"{count} walkable cells do not fit uint16 distances")
+        
+        # Neighbor cell numbers per direction, a cell standing in for missing neighbors
+        neighbors = []
+        for direction in Direction:
+            dx, dy = direction.value
+            neighbors.append(np.array([self.index.get((x + dx, y + dy), i)
+                                       for i, (x, y) in enumerate(self.cells)], dtype=np.intp))
+        
+        # Packed identity: each cell starts out reached by itself
+        reached = np.zeros((count, (count + 7) // 8), dtype=np.uint8)
+        cell = np.arange(count)
+        reached[cell, cell >> 3] = 0x80 >> (cell & 7)
+        frontier = reached.copy()
+        planes = []
+        level = 0
+        while True:
+            level += 1
+            grown = frontier[neighbors[0]]
+            for other in neighbors[1:]:
+                grown |= frontier[other]
+            frontier = grown & ~reached
+            if not frontier.any():
+                break
+            reached |= frontier
+            for bit in range(level.bit_length()):
+                if bit == len(planes):
+                    planes.append(np.zeros_like(reached))
+                if level >> bit & 1:
+                    planes[bit] |= frontier
+        
+        self.matrix = np.zeros((count, count), dtype=np.uint16)
+        for bit, plane in enumerate(planes):
+            self.matrix |= np.unpackbits(plane, axis=1, count=count).astype(np.uint16) << bit
+        self.matrix[np.unpackbits(~reached, axis=1, count=count).astype(bool)] = self.UNREACHABLE
+        self.diameter = level - 1
+        self.build_time = time.perf_counter() - start
+    
+    @classmethod
+    def from_matrix(cls, walls: np.ndarray, matrix: np.ndarray, diameter: int) -> 'MazeDistances':
+        """Index over a prebuilt distance matrix, for a height x width wall mask"""
+        distances = cls.__new__(cls)
+        distances.height, distances.width = walls.shape
+        ys, xs = np.nonzero(~walls)
+        distances.cells = list(zip(xs.tolist(), ys.tolist()))
+        distances.index = {cell: i for i, cell in enumerate(distances.cells)}
+        if matrix.shape != (len(distances.cells),) * 2:
+            raise ValueError(f"{matrix.shape} matrix does not fit {len(distances.cells)} walkable cells")
+        distances.matrix = matrix
+        distances.diameter = diameter
+        distances.build_time = 0.0
+        return distances
+    
+    @classmethod
+    def for_walls(cls, walls, width: int, height: int) -> 'MazeDistances':
+        """Index for a wall layout, shared with other recent mazes of that layout"""
+        return _layout_cached(cls._cache, cls, walls, width, height)
+    
+    @staticmethod
+    def estimate_bytes(cells: int) -> int:
+        """Matrix size for a maze with the given number of walkable cells"""
+        return cells * cells * np.dtype(np.uint16).itemsize
+    
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        return cell in self.index
+    
+    def distance(self, a: Tuple[int, int], b: Tuple[int, int]) -> int:
+        """Steps between two cells, UNREACHABLE if either is a wall or off the grid"""
+        i = self.index.get(a)
+        j = self.index.get(b)
+        if i is None or j is None:
+            return self.UNREACHABLE
+        return int(self.matrix[i, j])
+    
+    def stats(self) -> dict:
+        """Size and build cost of the index"""
+        return {
+            'cells': len(self.cells),
+            'diameter': self.diameter,
+            'bytes': self.matrix.nbytes,
+            'build_ms': self.build_time * 1000,
+        }
+
+def _wall_mask(walls, width: int, height: int) -> np.ndarray:
+    """height x width bool mask of walls given as a cell set, CellSet or mask"""
+    if isinstance(walls, np.ndarray):
+        return walls.astype(bool, copy=False)
+    if isinstance(walls, CellSet) and (walls.maze.width, walls.maze.height) == (width, height):
+        return (walls.maze.cells & walls.flag) != 0
+    mask = np.zeros((height, width), dtype=bool)
+    cells = [(x, y) for x, y in walls if 0 <= x < width and 0 <= y < height]
+    if cells:
+        xs, ys = zip(*cells)
+        mask[list(ys), list(xs)] = True
+    return mask
+
+class CellExits(Mapping):
+    """Exit directions of every walkable cell, read off a wall mask on first use
+    
+    Building the full table is a Python pass over every cell; corridors
+    and ghosts only ever ask about a few, so each cell's exits are worked
+    out when looked up and kept.
+    """
+    
+    def __init__(self, walls: np.ndarray):
+        self.height, self.width = walls.shape
+        # Padded with walls, so neighbor reads never leave the grid
+        self.open = np.pad(~walls, 1, constant_values=False)
+        self.count = int(np.count_nonzero(self.open))
+        self._exits: Dict[Tuple[int, int], Tuple[Direction, ...]] = {}
+    
+    def __getitem__(self, cell: Tuple[int, int]) -> Tuple[Direction, ...]:
+        exits = self._exits.get(cell)
+        if exits is None:
+            if cell not in self:
+                raise KeyError(cell)
+            x, y = cell
+            exits = self._exits[cell] = tuple(
+                d for d in DIRECTIONS if self.open[y + 1 + d.value[1], x + 1 + d.value[0]])
+        return exits
+    
+    def __contains__(self, cell) -> bool:
+        try:
+            x, y = cell
+        except (TypeError, ValueError):
+            return False
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self.open[y + 1, x + 1])
+    
+    def __iter__(self):
+        ys, xs = np.nonzero(self.open[1:-1, 1:-1])
+        return zip(xs.tolist(), ys.tolist())
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def exit_counts(self) -> np.ndarray:
+        """Open neighbors of every cell, as a height x width array"""
+        open_cells = self.open.astype(np.int8)
+        return (open_cells[:-2, 1:-1] + open_cells[2:, 1:-1] +
+                open_cells[1:-1, :-2] + open_cells[1:-1, 2:])
+
+class JunctionGraph:
+    """Decision points of a wall layout and the corridors between them
+    
+    Nodes are walkable cells with other than two exits: junctions, where a
+    ghost has a real choice, and dead ends, where it has to turn back.
+    Edges follow a corridor from a node, around its corners, to the next
+    node; a route is the list of moves along one.
+    """
+    
+    # Graphs of recent layouts, keyed by (walls, width, height)
+    _cache: 'OrderedDict[Tuple[FrozenSet[Tuple[int, int]], int, int], JunctionGraph]' = OrderedDict()
+    
+    def __init__(self, walls, width: int, height: int, edges=None):
+        self.exits = CellExits(_wall_mask(walls, width, height))
+        if edges is not None:
+            # Prebuilt edges list every node, so no cell needs visiting
+            self.nodes = set(edges)
+        else:
+            ys, xs = np.nonzero(self.exits.open[1:-1, 1:-1] & (self.exits.exit_counts() != 2))
+            self.nodes = set(zip(xs.tolist(), ys.tolist()))
+        self._routes = {}
+        # Corridor lengths out of every node, by exit direction; prebuilt
+        # edges skip walking the corridors
+        self.edges = edges if edges is not None else {
+            node: {direction: (self.route_end(node, direction), len(self.route(node, direction)))
+                   for direction in self.exits[node]}
+            for node in self.nodes
+        }
+    
+    @classmethod
+    def for_walls(cls, walls, width: int, height: int) -> 'JunctionGraph':
+        """Graph for a wall layout, shared with other recent mazes of that layout"""
+        return _layout_cached(cls._cache, cls, walls, width, height)
+    
+    def __contains__(self, cell: Tuple[int, int]) -> bool:
+        return cell in self.exits
+    
+    def route(self, cell: Tuple[int, int], direction: Direction) -> Tuple[Direction, ...]:
+        """Moves from cell, leaving in direction, until the next node
+        
+        A corridor that loops back without a node ends where it started.
+        """
+        key = (cell, direction)
+        if key not in self._routes:
+            moves = [direction]
+            x, y = cell[0] + direction.value[0], cell[1] + direction.value[1]
+            while (x, y) not in self.nodes and (x, y) != cell:
+                back = Direction((-direction.value[0], -direction.value[1]))
+                direction = next(d for d in self.exits[(x, y)] if d != back)
+                moves.append(direction)
+                x, y = x + direction.value[0], y + direction.value[1]
+            self._routes[key] = tuple(moves)
+        return self._routes[key]
+    
+    def route_end(self, cell: Tuple[int, int], direction: Direction) -> Tuple[int, int]:
+        """Cell a route from cell in direction arrives at"""
+        x, y = cell
+        for move in self.route(cell, direction):
+            x, y = x + move.value[0], y + move.value[1]
+        return (x, y)
+    
+    def stats(self) -> dict:
+        """Size of the graph"""
+        return {
+            'cells': len(self.exits),
+            'nodes': len(self.nodes),
+            'edges': sum(len(edges) for edges in self.edges.values()),
+            'mean_corridor': (sum(length for edges in self.edges.values() for _, length in edges.values())
+                              / max(1, sum(len(edges) for edges in self.edges.values()))),
+        }
+
+class SpatialHash:
+    """Uniform grid of buckets for proximity queries over moving entities
+    
+    Entries are keys (ghost indices) at pixel positions, bucketed by
+    cell_size squares, so a query only visits the buckets its radius
+    overlaps. move() touches the buckets only when a key changes cell.
+    """
+    
+    def __init__(self, cell_size: int = CELL_SIZE):
+        self.cell_size = cell_size
+        self.buckets: Dict[Tuple[int, int], Set[int]] = {}
+        self.cells: Dict[int, Tuple[int, int]] = {}
+    
+    def __len__(self) -> int:
+        return len(self.cells)
+    
+    def move(self, key: int, x: int, y: int):
+        """Insert key at (x, y), or update its position"""
+        cell = (x // self.cell_size, y // self.cell_size)
+        old = self.cells.get(key)
+        if old == cell:
+            return
+        if old is not None:
+            bucket = self.buckets[old]
+            bucket.discard(key)
+            if not bucket:
+                del self.buckets[old]
+        self.cells[key] = cell
+        self.buckets.setdefault(cell, set()).add(key)
+    
+    def remove(self, key: int):
+        """Drop key from the hash"""
+        cell = self.cells.pop(key)
+        bucket = self.buckets[cell]
+        bucket.discard(key)
+        if not bucket:
+            del self.buckets[cell]
+    
+    def sync(self, positions: Iterable[Tuple[int, int]]):
+        """Move keys 0..n-1 to the given positions and drop any others"""
+        count = 0
+        for key, (x, y) in enumerate(positions):
+            self.move(key, x, y)
+            count += 1
+        for key in [key for key in self.cells if key >= count]:
+            self.remove(key)
+    
+    def query(self, x: int, y: int, radius: int) -> List[int]:
+        """Keys in buckets within radius of (x, y), sorted; callers check exact distances"""
+        size = self.cell_size
+        found = []
+        for cell_x in range((x - radius) // size, (x + radius) // size + 1):
+            for cell_y in range((y - radius) // size, (y + radius) // size + 1):
+                bucket = self.buckets.get((cell_x, cell_y))
+                if bucket:
+                    found.extend(bucket)
+        found.sort()
+        return found
+
+class Pacman:
+    """Player-controlled Pacman character"""
+    
+    __slots__ = ('x', 'y', 'direction', 'next_direction', 'speed', 'radius',
+                 'mouth_angle', 'mouth_speed')
+    
+    def __init__(self, x: int, y: int):
+        self.x = x
+        self.y = y
+        self.direction = Direction.RIGHT
+        self.next_direction = Direction.RIGHT
+        self.speed = PACMAN_SPEED
+        self.radius = CELL_SIZE // 2 - 2
+        self.mouth_angle = 0
+        self.mouth_speed = 8
+    
+    def update(self, maze: Maze):
+        """Update Pacman's position and animation"""
+        # Try to change direction if requested
+        dx, dy = self.next_direction.value
+        next_x = self.x + dx * self.speed
+        next_y = self.y + dy * self.speed
+        
+        if maze.is_valid_position(next_x // CELL_SIZE, next_y // CELL_SIZE):
+            self.direction = self.next_direction
+        
+        # Move in current direction
+        dx, dy = self.direction.value
+        new_x = self.x + dx * self.speed
+        new_y = self.y + dy * self.speed
+        
+        # Check collision with walls
+        if maze.is_valid_position(new_x // CELL_SIZE, new_y // CELL_SIZE):
+            self.x = new_x
+            self.y = new_y
+        
+        # Screen wrapping
+        if self.x < 0:
+            self.x = maze.width * CELL_SIZE
+        elif self.x > maze.width * CELL_SIZE:
+            self.x = 0
+        
+        # Update mouth animation
+        self.mouth_angle = (self.mouth_angle + self.mouth_speed) % 360
+    
+    def set_direction(self, direction: Direction):
+        """Set the next direction for Pacman"""
+        self.next_direction = direction
+    
+    def get_grid_pos(self) -> Tuple[int, int]:
+        """Get Pacman's position in grid coordinates"""
+        return (self.x // CELL_SIZE, self.y // CELL_SIZE)
+
+class Ghost:
+    """AI-powered ghost with different behavioral patterns"""
+    
+    __slots__ = ('x', 'y', 'ghost_type', 'color', 'direction', 'speed', 'target_x', 'target_y',
+                 'patrol_points', 'current_patrol', 'stuck_counter', 'mode_timer', 'scatter_mode',
+                 'pathfinding', 'junction_ai', 'route', 'route_index', 'route_cell', 'home_corner', 'rng', 'config',
+                 'maze_width', 'maze_height')
+    
+    def __init__(self, x: int, y: int, ghost_type: GhostType, color: Tuple[int, int, int],
+                 rng: Optional[random.Random] = None):
+        self.x = x
+        self.y = y
+        self.ghost_type = ghost_type
+        self.color = color
+        self.rng = rng if rng is not None else random  # Source of all AI randomness
+        self.direction = self.rng.choice(DIRECTIONS)
+        self.speed = GHOST_SPEED
+        self.target_x = x
+        self.target_y = y
+        self.patrol_points = ()
+        self.current_patrol = 0
+        self.stuck_counter = 0
+        self.mode_timer = 0
+        self.scatter_mode = False
+        self.pathfinding = False  # Steer by maze distance instead of straight-line distance
+        self.junction_ai = False  # Only run the AI at junctions, following corridors in between
+        self.route = None  # Moves left along the current corridor (junction AI)
+        self.route_index = 0
+        self.route_cell = None  # Cell whose corner the ghost heads for (junction AI)
+        self.home_corner = (x, y)  # Each ghost's home corner
+        self.config = DEFAULT_GHOST_CONFIG
+        self.set_maze_size(MAZE_WIDTH, MAZE_HEIGHT)
+    
+    def set_maze_size(self, width: int, height: int):
+        """Fit the patrol route, home corner and random targets to a width x height maze"""
+        self.maze_width = width
+        self.maze_height = height
+        self.patrol_points = ghost_patrol_route(self.ghost_type, width, height)
+        self.home_corner = ghost_home_corner(self.ghost_type, width, height) or self.home_corner
+        
+    def update(self, maze: Maze, pacman: Pacman, other_ghosts: List['Ghost'],
+               nearby: Optional[SpatialHash] = None):
+        """Update ghost AI and movement
+        
+        nearby, if given, is a spatial hash of indices into other_ghosts,
+        used for proximity checks instead of scanning the whole list.
+        """
+        # Update mode timer for scatter/chase behavior
+        self.mode_timer += 1
+        if self.mode_timer > self.config.mode_period:  # Every 5 seconds at 60 FPS by default
+            self.scatter_mode = not self.scatter_mode
+            self.mode_timer = 0
+        
+        if self.junction_ai and self.follow_junctions(maze, pacman, other_ghosts, nearby):
+            return
+        
+        self.choose_target(pacman, other_ghosts, nearby)
+        self.move_towards_target(maze)
+    
+    def follow_junctions(self, maze: Maze, pacman: Pacman, other_ghosts: List['Ghost'],
+                         nearby: Optional[SpatialHash] = None) -> bool:
+        """Junction AI: run choose_target only at nodes and follow corridors otherwise
+        
+        The ghost heads for the corner of route_cell; on reaching it, it
+        takes the next move of its route, or decides at a node. Leftover
+        speed carries over, so any speed works. Returns False, leaving the
+        frame to the regular AI, while the ghost cannot join the graph
+        (inside walls, or off the grid lines).
+        """
+        if self.speed <= 0:
+            return False
+        graph = maze.junctions()
+        
+        if self.route_cell is not None:
+            # Drop the route if the ghost was moved, e.g. respawned
+            dx, dy = self.direction.value
+            gap_x = self.route_cell[0] * CELL_SIZE - self.x
+            gap_y = self.route_cell[1] * CELL_SIZE - self.y
+            gap = abs(gap_x) + abs(gap_y)
+            if (gap_x, gap_y) != (dx * gap, dy * gap) or gap > CELL_SIZE:
+                self.route_cell = None
+        
+        if self.route_cell is None:
+            # Join on a grid line, at the next cell corner ahead
+            self.route = None
+            dx, dy = self.direction.value
+            if (self.y if dx else self.x) % CELL_SIZE:
+                return False
+            cell = (-(-self.x // CELL_SIZE) if dx > 0 else self.x // CELL_SIZE,
+                    -(-self.y // CELL_SIZE) if dy > 0 else self.y // CELL_SIZE)
+            if cell not in graph:
+                return False
+            self.route_cell = cell
+        
+        remaining = self.speed
+        while remaining > 0:
+            corner_x = self.route_cell[0] * CELL_SIZE
+            corner_y = self.route_cell[1] * CELL_SIZE
+            gap = abs(corner_x - self.x) + abs(corner_y - self.y)
+            if remaining < gap:
+                self.x += self.direction.value[0] * remaining
+                self.y += self.direction.value[1] * remaining
+                break
+            self.x, self.y = corner_x, corner_y
+            remaining -= gap
+            
+            cell = self.route_cell
+            if self.route is not None and self.route_index < len(self.route):
+                # In a corridor, or turning one of its corners
+                self.direction = self.route[self.route_index]
+                self.route_index += 1
+            elif graph.exits[cell]:
+                # Arrived at a node (or just joined the graph): decide
+                self.choose_target(pacman, other_ghosts, nearby)
+                self.direction = self.choose_exit(maze, graph.exits[cell])
+                self.route = graph.route(cell, self.direction)
+                self.route_index = 1
+            else:
+                # Walled-in cell, nowhere to go
+                self.route_cell = None
+                break
+            self.route_cell = (cell[0] + self.direction.value[0], cell[1] + self.direction.value[1])
+        
+        self.stuck_counter = 0
+        return True
+    
+    def choose_exit(self, maze: Maze, exits: Tuple[Direction, ...]) -> Direction:
+        """Pick the exit closest to the target, turning back only at dead ends"""
+        back = Direction((-self.direction.value[0], -self.direction.value[1]))
+        candidates = [d for d in exits if d != back] or list(exits)
+        distances = self.steering_distances(maze)
+        return min(candidates, key=lambda d: self.move_distance(d, distances))
+    
+    def choose_target(self, pacman: Pacman, other_ghosts: List['Ghost'],
+                      nearby: Optional[SpatialHash] = None):
+        """Choose target based on ghost AI type and current mode"""
+        # In scatter mode, all ghosts go to their home corners
+        if self.scatter_mode:
+            self.target_x = self.home_corner[0]
+            self.target_y = self.home_corner[1]
+            return
+        
+        if self.ghost_type == GhostType.RED:
+            # Aggressive: Direct chase with slight randomness to avoid clustering
+            self.target_x = pacman.x
+            self.target_y = pacman.y
+            
+            # Add slight offset if too close to other red ghosts
+            close_range = CELL_SIZE * 3
+            if nearby is not None:
+                candidates = [other_ghosts[i] for i in nearby.query(self.x, self.y, close_range)]
+            else:
+                candidates = other_ghosts
+            for ghost in candidates:
+                if ghost != self and ghost.ghost_type == GhostType.RED:
+                    if (self.x - ghost.x)**2 + (self.y - ghost.y)**2 < close_range**2:
+                        offset = self.rng.randint(-2, 2) * CELL_SIZE
+                        self.target_x += offset
+                        self.target_y += offset
+            
+        elif self.ghost_type == GhostType.PINK:
+            # Ambush: Predict Pacman's movement with improved logic
+            prediction_distance = self.config.prediction_cells * CELL_SIZE
+            
+            # Consider Pacman's current direction and speed
+            future_x = pacman.x + pacman.direction.value[0] * prediction_distance
+            future_y = pacman.y + pacman.direction.value[1] * prediction_distance
+            
+            # Add strategic positioning - try to cut off escape routes
+            if abs(pacman.x - self.x) > abs(pacman.y - self.y):
+                # Pacman is more horizontally distant, predict vertical movement
+                future_y += pacman.direction.value[1] * prediction_distance * 2
+            else:
+                # Pacman is more vertically distant, predict horizontal movement
+                future_x += pacman.direction.value[0] * prediction_distance * 2
+            
+            self.target_x = future_x
+            self.target_y = future_y
+            
+        elif self.ghost_type == GhostType.BLUE:
+            # Patrol: Enhanced patrol with dynamic adjustment
+            if self.patrol_points:
+                target_point = self.patrol_points[self.current_patrol]
+                distance_to_target = math.sqrt(
+                    (self.x - target_point[0])**2 + (self.y - target_point[1])**2
+                )
+                
+                if distance_to_target < CELL_SIZE * 1.5:
+                    self.current_patrol = (self.current_patrol + 1) % len(self.patrol_points)
+                
+                # If Pacman is very close, temporarily chase instead of patrol
+                pacman_distance = math.sqrt((self.x - pacman.x)**2 + (self.y - pacman.y)**2)
+                if pacman_distance < CELL_SIZE * self.config.chase_radius_cells:
+                    self.target_x = pacman.x
+                    self.target_y = pacman.y
+                else:
+                    self.target_x = target_point[0]
+                    self.target_y = target_point[1]
+            
+        elif self.ghost_type == GhostType.PURPLE:
+            # Random: Improved random movement with occasional chase
+            rng = self.rng
+            config = self.config
+            if rng.random() < config.retarget_chance:  # 15% chance to change target by default
+                if rng.random() < config.chase_chance:  # 30% of the time, chase Pacman
+                    self.target_x = pacman.x + rng.randint(-3, 3) * CELL_SIZE
+                    self.target_y = pacman.y + rng.randint(-3, 3) * CELL_SIZE
+                else:
+                    # Random movement
+                    self.target_x = rng.randint(2, self.maze_width - 3) * CELL_SIZE
+                    self.target_y = rng.randint(2, self.maze_height - 3) * CELL_SIZE
+    
+    def move_towards_target(self, maze: Maze):
+        """Move towards the chosen target using pathfinding
+        
+        With pathfinding on, moves are ranked by the maze distance from the
+        cell they head into, straight-line distance breaking ties; targets
+        off the walkable grid fall back to straight-line distance.
+        """
+        # Simple pathfinding: choose direction that gets closest to target
+        best_direction = self.direction
+        best_distance = (float('inf'), float('inf'))
+        distances = self.steering_distances(maze)
+        x, y, speed = self.x, self.y, self.speed
+        back_x, back_y = self.direction.value
+        
+        for direction, (dx, dy) in DIRECTION_STEPS:
+            new_x = x + dx * speed
+            new_y = y + dy * speed
+            
+            # Check if move is valid
+            if maze.is_valid_position(new_x // CELL_SIZE, new_y // CELL_SIZE):
+                # Avoid reversing direction unless stuck
+                if dx == -back_x and dy == -back_y:
+                    if self.stuck_counter < 10:
+                        continue
+                
+                if distances is None:
+                    distance = (0, math.sqrt((new_x - self.target_x)**2 + (new_y - self.target_y)**2))
+                else:
+                    distance = self.move_distance(direction, distances)
+                
+                if distance < best_distance:
+                    best_distance = distance
+                    best_direction = direction
+        
+        # Move in chosen direction
+        dx, dy = best_direction.value
+        new_x = x + dx * speed
+        new_y = y + dy * speed
+        
+        if maze.is_valid_position(new_x // CELL_SIZE, new_y // CELL_SIZE):
+            self.x = new_x
+            self.y = new_y
+            self.direction = best_direction
+            self.stuck_counter = 0
+        else:
+            self.stuck_counter += 1
+        
+        # Screen wrapping
+        if self.x < 0:
+            self.x = maze.width * CELL_SIZE
+        elif self.x > maze.width * CELL_SIZE:
+            self.x = 0
+    
+    def steering_distances(self, maze: Maze) -> Optional[MazeDistances]:
+        """Distance index to steer by, None for straight-line steering"""
+        if not self.pathfinding:
+            return None
+        distances = maze.distances()
+        if (self.target_x // CELL_SIZE, self.target_y // CELL_SIZE) not in distances:
+            return None
+        return distances
+    
+    def move_distance(self, direction: Direction, distances: Optional[MazeDistances]) -> Tuple[int, float]:
+        """Ranking key of a move: maze distance from the cell it heads into, then straight-line distance"""
+        new_x = self.x + direction.value[0] * self.speed
+        new_y = self.y + direction.value[1] * self.speed
+        path_length = 0
+        if distances is not None:
+            ahead = (self.x // CELL_SIZE + direction.value[0], self.y // CELL_SIZE + direction.value[1])
+            path_length = distances.distance(ahead, (self.target_x // CELL_SIZE, self.target_y // CELL_SIZE))
+        return (path_length, math.sqrt((new_x - self.target_x)**2 + (new_y - self.target_y)**2))
+    
+    def get_grid_pos(self) -> Tuple[int, int]:
+        """Get ghost's position in grid coordinates"""
+        return (self.x // CELL_SIZE, self.y // CELL_SIZE)
+
+def _pool_field(name: str, decode=None, encode=int):
+    """Property reading and writing a GhostPool buffer at the ghost's index"""
+    if decode is None:
+        return property(lambda self: getattr(self.pool, name)[self.index],
+                        lambda self, value: getattr(self.pool, name).__setitem__(self.index, encode(value)))
+    return property(lambda self: decode(getattr(self.pool, name)[self.index]),
+                    lambda self, value: getattr(self.pool, name).__setitem__(self.index, encode(value)))
+
+class GhostPool:
+    """Structure-of-arrays storage for the numeric state of many ghosts
+    
+    Each field is one fixed-capacity array.array of C ints, with a NumPy
+    view over the same memory for vectorized passes. Ghosts created by
+    add() are PooledGhost views that read and write their slot.
+    """
+    
+    FIELDS = ('x', 'y', 'direction', 'speed', 'target_x', 'target_y',
+              'current_patrol', 'stuck_counter', 'mode_timer', 'scatter_mode')
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.count = 0
+        self.arrays = {}
+        for name in self.FIELDS:
+            buffer = array('i', bytes(capacity * array('i').itemsize))
+            setattr(self, name, buffer)
+            self.arrays[name] = np.frombuffer(buffer, dtype=np.intc)
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def add(self, x: int, y: int, ghost_type: GhostType, color: Tuple[int, int, int],
+            rng: Optional[random.Random] = None) -> 'PooledGhost':
+        """Create a ghost in the next free slot"""
+        if self.count == self.capacity:
+            raise ValueError(f"GhostPool is full ({self.capacity} ghosts)")
+        self.count += 1
+        return PooledGhost(self, self.count - 1, x, y, ghost_type, color, rng)
+    
+    def view(self, name: str) -> np.ndarray:
+        """NumPy view of a field over the ghosts added so far"""
+        return self.arrays[name][:self.count]
+    
+    def within(self, x: int, y: int, radius: int) -> np.ndarray:
+        """Indices of ghosts closer than radius to (x, y), in ghost order"""
+        dx = self.view('x') - x
+        dy = self.view('y') - y
+        return np.flatnonzero(dx * dx + dy * dy < radius * radius)
+    
+    def bytes_per_ghost(self) -> int:
+        """Buffer memory per ghost slot"""
+        return sum(buffer.itemsize for buffer in (getattr(self, name) for name in self.FIELDS))
+
+class PooledGhost(Ghost):
+    """Ghost whose numeric state lives in a GhostPool slot"""
+    
+    __slots__ = ('pool', 'index')
+    
+    x = _pool_field('x')
+    y = _pool_field('y')
+    direction = _pool_field('direction', DIRECTIONS.__getitem__, DIRECTION_INDEX.__getitem__)
+    speed = _pool_field('speed')
+    target_x = _pool_field('target_x')
+    target_y = _pool_field('target_y')
+    current_patrol = _pool_field('current_patrol')
+    stuck_counter = _pool_field('stuck_counter')
+    mode_timer = _pool_field('mode_timer')
+    scatter_mode = _pool_field('scatter_mode', bool)
+    
+    def __init__(self, pool: GhostPool, index: int, x: int, y: int,
+                 ghost_type: GhostType, color: Tuple[int, int, int], rng: Optional[random.Random] = None):
+        self.pool = pool
+        self.index = index
+        super().__init__(x, y, ghost_type, color, rng)
+
+# score, lives, power timer, frame count, game over, power mode, then
+# Pacman's x, y, direction, next direction and mouth angle
+ENGINE_STATE = struct.Struct("<iiii??iiBBi")
+# Ints saved per ghost by GameEngine.snapshot
+GHOST_STATE_FIELDS = 10
+
+class EngineSnapshot:
+    """Packed copy of the mutable state of a GameEngine
+    
+    Scalars are one struct, ghosts a flat int array, and the maze grid an
+    immutable bytes copy shared with every other snapshot taken while the
+    grid was unchanged, so snapshots between pellets cost no grid copy.
+    """
+    
+    __slots__ = ('state', 'ghosts', 'routes', 'grid', 'counts', 'rng_state')
+    
+    def __init__(self, state: bytes, ghosts: array, routes: Optional[tuple], grid: bytes,
+                 counts: Tuple[int, int, int], rng_state):
+        self.state = state
+        self.ghosts = ghosts
+        self.routes = routes
+        self.grid = grid
+        self.counts = counts
+        self.rng_state = rng_state
+    
+    def nbytes(self) -> int:
+        """Bytes of packed state, not counting the shared grid"""
+        return len(self.state) + self.ghosts.itemsize * len(self.ghosts)
+
+class GameEngine:
+    """Pure-Python game simulation: maze, Pacman, ghosts, score, power mode and collisions"""
+    
+    def __init__(self, pathfinding: bool = False, junction_ai: bool = False,
+                 ghost_count: int = 4, spatial_hash: bool = True, ghost_pool: bool = False,
+                 maze: Optional[Maze] = None, rng: Optional[random.Random] = None,
+                 ghost_config: Optional[GhostConfig] = None):
+        # Game state
+        self.score = 0
+        self.lives = LIVES
+        self.game_over = False
+        self.power_mode = False
+        self.power_timer = 0
+        self.frame_count = 0
+        
+        # Events raised by the last update, as (name, payload) tuples
+        self.events = []
+        
+        # All randomness comes from rng, so a seeded random.Random and the same
+        # inputs replay a game exactly; the random module is the default
+        self.rng = rng if rng is not None else random
+        
+        # Initialize game objects
+        self.maze = maze if maze is not None else Maze(rng=self.rng)
+        self.pacman = Pacman(*self.pacman_start())
+        
+        # Create ghosts with different AI types
+        ghost_types = [
+            (GhostType.RED, NEON_RED),
+            (GhostType.PINK, NEON_PINK),
+            (GhostType.BLUE, NEON_BLUE),
+            (GhostType.PURPLE, NEON_PURPLE),
+        ]
+        # Swarm variants cycle through the line-up; ghosts past the classic
+        # four start, and respawn, spread over the maze
+        swarm = self.swarm_starts(ghost_count - len(GHOST_STARTS))
+        starts = [(x * CELL_SIZE, y * CELL_SIZE) for x, y in self.maze.ghost_starts]
+        # Optionally keep ghost state in contiguous buffers
+        self.ghost_pool = GhostPool(ghost_count) if ghost_pool else None
+        create = self.ghost_pool.add if ghost_pool else Ghost
+        self.ghosts = [create(x, y, *ghost_types[i % len(ghost_types)], self.rng)
+                       for i, (x, y) in enumerate(starts[:ghost_count] + swarm)]
+        self.respawns = [(x * CELL_SIZE, y * CELL_SIZE) for x, y in self.maze.ghost_respawns[:ghost_count]] + swarm
+        
+        # Ghost indices bucketed by cell, for collision and proximity queries
+        self.ghost_hash = SpatialHash(CELL_SIZE) if spatial_hash else None
+        
+        # Ghosts steer by precomputed maze distances instead of straight lines
+        self.pathfinding = pathfinding
+        # Ghosts only think at junctions and follow corridors in between
+        self.junction_ai = junction_ai
+        # Tunable AI numbers, see GhostConfig
+        self.ghost_config = ghost_config if ghost_config is not None else DEFAULT_GHOST_CONFIG
+        for ghost in self.ghosts:
+            ghost.pathfinding = pathfinding
+            ghost.junction_ai = junction_ai
+            ghost.config = self.ghost_config
+            ghost.set_maze_size(self.maze.width, self.maze.height)
+        
+        # Times the ghost AI when a pacman_profiler.FrameProfiler is set
+        self.profiler = NULL_PROFILER
+    
+    def pacman_start(self) -> Tuple[int, int]:
+        """Pacman's spawn position in this maze"""
+        x, y = self.maze.pacman_start
+        return (x * CELL_SIZE, y * CELL_SIZE)
+    
+    def respawn_point(self, index: int) -> Tuple[int, int]:
+        """Where the ghost at index goes when eaten or after a lost life"""
+        if index < len(self.respawns):
+            return self.respawns[index]
+        x, y = self.maze.ghost_respawns[index % len(self.maze.ghost_respawns)]
+        return (x * CELL_SIZE, y * CELL_SIZE)
+    
+    def swarm_starts(self, count: int) -> List[Tuple[int, int]]:
+        """Evenly spaced walkable cells away from Pacman's start, for extra ghosts"""
+        if count <= 0:
+            return []
+        start_x, start_y = self.maze.pacman_start
+        cells = [(x, y) for y in range(1, self.maze.height - 1) for x in range(1, self.maze.width - 1)
+                 if (x, y) not in self.maze.walls and max(abs(x - start_x), abs(y - start_y)) > 5]
+        return [(cells[i * len(cells) // count][0] * CELL_SIZE, cells[i * len(cells) // count][1] * CELL_SIZE)
+                for i in range(count)]
+    
+    def update(self) -> List[Tuple[str, object]]:
+        """Advance the simulation by one frame and return the events it raised
+        
+        Events: ('pellet', cell), ('power_pellet', cell), ('ghost_eaten', ghost),
+        ('life_lost', ghost), ('game_over', None), ('level_cleared', None)
+        """
+        self.events = []
+        if self.game_over:
+            return self.events
+        
+        self.frame_count += 1
+        
+        # Update power mode
+        if self.power_mode:
+            self.power_timer -= 1
+            if self.power_timer <= 0:
+                self.power_mode = False
+        
+        # Update Pacman
+        self.pacman.update(self.maze)
+        
+        # Update ghosts, keeping the spatial hash current as each one moves
+        start = self.profiler.begin()
+        nearby = self.ghost_hash
+        if nearby is not None:
+            nearby.sync((ghost.x, ghost.y) for ghost in self.ghosts)
+        for index, ghost in enumerate(self.ghosts):
+            ghost.update(self.maze, self.pacman, self.ghosts, nearby)
+            if nearby is not None:
+                nearby.move(index, ghost.x, ghost.y)
+        self.profiler.lap('engine.ghosts', start)
+        
+        # Check pellet collection
+        pacman_grid = self.pacman.get_grid_pos()
+        if pacman_grid in self.maze.pellets:
+            self.maze.pellets.remove(pacman_grid)
+            self.score += PELLET_SCORE
+            self.events.append(('pellet', pacman_grid))
+        
+        if pacman_grid in self.maze.power_pellets:
+            self.maze.power_pellets.remove(pacman_grid)
+            self.score += POWER_PELLET_SCORE
+            self.power_mode = True
+            self.power_timer = POWER_MODE_FRAMES
+            self.events.append(('power_pellet', pacman_grid))
+        
+        # Check ghost collisions, in ghost order
+        if nearby is not None:
+            candidates = nearby.query(self.pacman.x, self.pacman.y, CELL_SIZE)
+        else:
+            candidates = range(len(self.ghosts))
+        for index in candidates:
+            ghost = self.ghosts[index]
+            if (self.pacman.x - ghost.x)**2 + (self.pacman.y - ghost.y)**2 < CELL_SIZE**2:
+                if self.power_mode:
+                    # In power mode, ghosts are vulnerable
+                    self.score += GHOST_SCORE
+                    # Reset ghost position
+                    ghost.x, ghost.y = self.respawn_point(index)
+                    self.events.append(('ghost_eaten', ghost))
+                else:
+                    # Normal collision - lose life
+                    self.lives -= 1
+                    self.events.append(('life_lost', ghost))
+                    if self.lives <= 0:
+                        self.game_over = True
+                        self.events.append(('game_over', None))
+                    else:
+                        # Reset positions
+                        self.pacman.x, self.pacman.y = self.pacman_start()
+                        for i, g in enumerate(self.ghosts):
+                            g.x, g.y = self.respawn_point(i)
+        
+        # Check win condition
+        if not self.maze.remaining_pellets():
+            self.game_over = True
+            self.events.append(('level_cleared', None))
+        
+        return self.events
+    
+    def snapshot(self, rng: bool = True) -> EngineSnapshot:
+        """Capture the game state for restore() or clone()
+        
+        Saving the RNG state is about two thirds of the cost; searches that
+        reseed their rollouts can leave it out with rng=False.
+        """
+        pacman = self.pacman
+        state = ENGINE_STATE.pack(self.score, self.lives, self.power_timer, self.frame_count,
+                                  self.game_over, self.power_mode, pacman.x, pacman.y,
+                                  DIRECTION_INDEX[pacman.direction], DIRECTION_INDEX[pacman.next_direction],
+                                  pacman.mouth_angle)
+        ghosts = array('i')
+        for ghost in self.ghosts:
+            ghosts.extend((ghost.x, ghost.y, DIRECTION_INDEX[ghost.direction], ghost.speed,
+                           ghost.target_x, ghost.target_y, ghost.current_patrol, ghost.stuck_counter,
+                           ghost.mode_timer, ghost.scatter_mode))
+        # Corridor routes are immutable tuples, shared rather than copied
+        routes = (tuple((ghost.route, ghost.route_index, ghost.route_cell) for ghost in self.ghosts)
+                  if self.junction_ai else None)
+        return EngineSnapshot(state, ghosts, routes, self.maze.frozen_grid(),
+                              (self.maze.counts[CELL_WALL], self.maze.counts[CELL_PELLET],
+                               self.maze.counts[CELL_POWER_PELLET]),
+                              self.rng.getstate() if rng else None)
+    
+    def restore(self, snapshot: EngineSnapshot):
+        """Return to a snapshot taken from this engine or one with the same maze and ghosts"""
+        (self.score, self.lives, self.power_timer, self.frame_count, self.game_over, self.power_mode,
+         x, y, direction, next_direction, mouth_angle) = ENGINE_STATE.unpack(snapshot.state)
+        pacman = self.pacman
+        pacman.x, pacman.y, pacman.mouth_angle = x, y, mouth_angle
+        pacman.direction = DIRECTIONS[direction]
+        pacman.next_direction = DIRECTIONS[next_direction]
+        fields = snapshot.ghosts
+        for index, ghost in enumerate(self.ghosts):
+            (ghost.x, ghost.y, direction, ghost.speed, ghost.target_x, ghost.target_y,
+             ghost.current_patrol, ghost.stuck_counter, ghost.mode_timer,
+             scatter_mode) = fields[index * GHOST_STATE_FIELDS:(index + 1) * GHOST_STATE_FIELDS]
+            ghost.direction = DIRECTIONS[direction]
+            ghost.scatter_mode = bool(scatter_mode)
+        if snapshot.routes is not None:
+            for ghost, (route, route_index, route_cell) in zip(self.ghosts, snapshot.routes):
+                ghost.route, ghost.route_index, ghost.route_cell = route, route_index, route_cell
+        self.maze.restore_grid(snapshot.grid, snapshot.counts)
+        if snapshot.rng_state is not None:
+            self.rng.setstate(snapshot.rng_state)
+        self.events = []
+    
+    def clone(self) -> 'GameEngine':
+        """Independent engine in the same state, sharing the maze's layout and path indexes
+        
+        The clone gets its own grid, and its own random.Random continuing
+        from this engine's RNG state, so it plays out the same way until
+        either one is steered differently or reseeded.
+        """
+        clone = GameEngine(self.pathfinding, self.junction_ai, len(self.ghosts),
+                           self.ghost_hash is not None, self.ghost_pool is not None, self.maze.copy(), random.Random(),
+                           self.ghost_config)
+        clone.respawns = self.respawns
+        clone.restore(self.snapshot())
+        return clone
+    
+    def step(self, direction: Optional[Direction] = None) -> List[Tuple[str, object]]:
+        """Optionally steer Pacman, then advance one frame"""
+        if direction is not None:
+            self.pacman.set_direction(direction)
+        return self.update()
+    
+    def run(self, max_frames: int, controller=None) -> int:
+        """Simulate until game over or max_frames; controller(engine) may return a Direction"""
+        while not self.game_over and self.frame_count < max_frames:
+            self.step(controller(self) if controller is not None else None)
+        return self.score
+
+class FixedTimestep:
+    """Turns elapsed wall time into a whole number of fixed-length simulation ticks
+    
+    Leftover time carries over to the next call, and alpha is how far it
+    reaches into the next tick, for interpolating the render. When a frame
+    would owe more than max_catch_up ticks, the excess is dropped (and
+    counted) so a stall slows the game down instead of freezing it in
+    catch-up.
+    """
+    
+    def __init__(self, rate: int = TICK_RATE, max_catch_up: int = MAX_CATCH_UP_TICKS,
+                 clock=time.perf_counter):
+        self.step = 1.0 / rate
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.accumulator = 0.0
+        self.previous = None
+        self.dropped_ticks = 0
+    
+    def advance(self) -> int:
+        """Ticks to simulate for the time since the last call"""
+        now = self.clock()
+        if self.previous is not None:
+            self.accumulator += now - self.previous
+        self.previous = now
+        # The epsilon keeps float error from holding back a tick that is due
+        ticks = int(self.accumulator / self.step + 1e-9)
+        if ticks > self.max_catch_up:
+            self.dropped_ticks += ticks - self.max_catch_up
+            ticks = self.max_catch_up
+        self.accumulator = min(max(self.accumulator - ticks * self.step, 0.0), self.step * 0.999999)
+        return ticks
+    
+    @property
+    def alpha(self) -> float:
+        """Fraction of a tick since the last simulated one"""
+        return self.accumulator / self.step
+    
+    def reset(self):
+        """Forget elapsed time, e.g. after a pause or fast-forward"""
+        self.accumulator = 0.0
+        self.previous = None
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Reinforcement learning environments for Neon Pacman - a reset()/step()
+environment over GameEngine with grid-tensor observations, and a vectorized
+variant stepping many environments in worker processes through shared memory
+"""
+
+import multiprocessing
+import random
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pacman_engine import (
+    CELL_SIZE, CELL_WALL, CELL_PELLET, CELL_POWER_PELLET, MAZE_WIDTH, MAZE_HEIGHT,
+    DIRECTIONS, GameEngine, Maze,
+)
+
+# Gymnasium is optional: with it the environment is a gymnasium.Env with
+# spaces, without it the same API works standalone
+try:
+    import gymnasium
+    from gymnasium import spaces
+    GYMNASIUM_AVAILABLE = True
+except ImportError:
+    gymnasium = None
+    GYMNASIUM_AVAILABLE = False
+
+# Observation planes, one 0/1 byte per maze cell each
+OBSERVATION_CHANNELS = ('walls', 'pellets', 'power_pellets', 'pacman', 'ghosts', 'vulnerable_ghosts')
+# Actions 0-3 steer Pacman along DIRECTIONS, 4 keeps the current course
+NOOP = len(DIRECTIONS)
+ACTION_COUNT = NOOP + 1
+
+def observation_shape(width: int = MAZE_WIDTH, height: int = MAZE_HEIGHT) -> Tuple[int, int, int]:
+    """(channels, height, width) of an observation"""
+    return (len(OBSERVATION_CHANNELS), height, width)
+
+def env_observation_shape(maze: Optional[Maze] = None,
+                          maze_size: Optional[Tuple[int, int]] = None) -> Tuple[int, int, int]:
+    """Observation shape of a PacmanEnv built with these maze options"""
+    if maze is not None:
+        return observation_shape(maze.width, maze.height)
+    if maze_size is not None:
+        return observation_shape(*maze_size)
+    return observation_shape()
+
+class PacmanEnv(gymnasium.Env if GYMNASIUM_AVAILABLE else object):
+    """One game as a reset()/step(action) environment
+
+    The reward is the score gained during the step. Episodes end when the
+    game does (terminated) or after max_steps frames (truncated). Each
+    action is held for frame_skip frames. Observations are written into
+    one preallocated array, which may be passed in (e.g. a slice of shared
+    memory) and is overwritten by every reset and step.
+    
+    Every episode gets a fresh maze: a copy of maze as passed in, a newly
+    generated maze_size = (width, height) maze seeded from the episode
+    seed, or by default the classic layout.
+    """
+
+    metadata = {"render_modes": []}
+
+    def __init__(self, max_steps: int = 3000, frame_skip: int = 1,
+                 observation: Optional[np.ndarray] = None, maze: Optional[Maze] = None,
+                 maze_size: Optional[Tuple[int, int]] = None, **engine_options):
+        if maze is not None and maze_size is not None:
+            raise ValueError("pass either maze or maze_size, not both")
+        self.max_steps = max_steps
+        self.frame_skip = frame_skip
+        self.engine_options = engine_options
+        # Copied now, so later changes to the caller's maze leave episodes alone
+        self.maze = maze.copy() if maze is not None else None
+        self.maze_size = maze_size
+        shape = env_observation_shape(maze, maze_size)
+        self.observation = observation if observation is not None else np.zeros(shape, dtype=np.uint8)
+        if self.observation.shape != shape or self.observation.dtype != np.uint8:
+            raise ValueError(f"observation buffer must be uint8 with shape {shape}")
+        if GYMNASIUM_AVAILABLE:
+            self.observation_space = spaces.Box(0, 1, shape, dtype=np.uint8)
+            self.action_space = spaces.Discrete(ACTION_COUNT)
+        self.seeds = random.Random()
+        self.engine = None
+
+    def reset(self, seed: Optional[int] = None, options: Optional[dict] = None) -> Tuple[np.ndarray, Dict]:
+        """Start a new game; a seed makes this and every later episode reproducible"""
+        if seed is not None:
+            self.seeds.seed(seed)
+        rng = random.Random(self.seeds.getrandbits(64))
+        if self.maze is not None:
+            maze = self.maze.copy()
+        elif self.maze_size is not None:
+            maze = Maze(*self.maze_size, seed=self.seeds.getrandbits(32))
+        else:
+            maze = None
+        self.engine = GameEngine(maze=maze, rng=rng, **self.engine_options)
+        return self.observe(), self.info()
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict]:
+        """Apply action and advance frame_skip frames"""
+        engine = self.engine
+        if action != NOOP:
+            engine.pacman.set_direction(DIRECTIONS[action])
+        score = engine.score
+        for _ in range(self.frame_skip):
+            engine.update()
+            if engine.game_over:
+                break
+        terminated = engine.game_over
+        truncated = not terminated and engine.frame_count >= self.max_steps
+        return self.observe(), float(engine.score - score), terminated, truncated, self.info()
+
+    def observe(self) -> np.ndarray:
+        """Write the current state into the observation array"""
+        engine = self.engine
+        observation = self.observation
+        cells = engine.maze.cells
+        for plane, flag in enumerate((CELL_WALL, CELL_PELLET, CELL_POWER_PELLET)):
+            np.bitwise_and(cells, flag, out=observation[plane])
+            if flag > 1:
+                observation[plane] >>= flag.bit_length() - 1
+        observation[3:] = 0
+        height, width = cells.shape
+        pacman = engine.pacman
+        observation[3, min(pacman.y // CELL_SIZE, height - 1), min(pacman.x // CELL_SIZE, width - 1)] = 1
+        ghosts = observation[5 if engine.power_mode else 4]
+        for ghost in engine.ghosts:
+            ghosts[min(ghost.y // CELL_SIZE, height - 1), min(ghost.x // CELL_SIZE, width - 1)] = 1
+        return observation
+
+    def info(self) -> Dict:
+        engine = self.engine
+        return {'score': engine.score, 'lives': engine.lives, 'frame': engine.frame_count}
+
+# Commands from VectorPacmanEnv to its workers
+_STEP, _RESET, _CLOSE = 1, 2, 3
+
+def _shared_views(buffer, num_envs: int, shape: Tuple[int, int, int]) -> Dict[str, np.ndarray]:
+    """Named arrays laid out over one shared buffer, for observations of the given shape"""
+    fields = (('observations', np.uint8, (num_envs,) + shape),
+              ('rewards', np.float32, (num_envs,)),
+              ('terminated', np.bool_, (num_envs,)),
+              ('truncated', np.bool_, (num_envs,)),
+              ('actions', np.int8, (num_envs,)),
+              ('scores', np.int32, (num_envs,)),
+              ('lives', np.int32, (num_envs,)),
+              ('seeds', np.int64, (num_envs,)),
+              ('command', np.int32, (1,)))
+    views = {}
+    offset = 0
+    for name, dtype, shape in fields:
+        dtype = np.dtype(dtype)
+        offset = -(-offset // dtype.itemsize) * dtype.itemsize
+        count = int(np.prod(shape))
+        if buffer is not None:
+            views[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape)
+        offset += count * dtype.itemsize
+    views['nbytes'] = offset
+    return views
+
+def _run_envs(envs: Sequence[PacmanEnv], indices: range, views: Dict[str, np.ndarray], command: int):
+    """Carry out a command for the given envs, auto-resetting finished episodes"""
+    for index, env in zip(indices, envs):
+        if command == _RESET:
+            seed = int(views['seeds'][index])
+            env.reset(seed=seed if seed >= 0 else None)
+            reward, terminated, truncated = 0.0, False, False
+        else:
+            _, reward, terminated, truncated, _ = env.step(int(views['actions'][index]))
+            if terminated or truncated:
+                views['scores'][index] = env.engine.score
+                views['lives'][index] = env.engine.lives
+                env.reset()
+        views['rewards'][index] = reward
+        views['terminated'][index] = terminated
+        views['truncated'][index] = truncated
+        if not (terminated or truncated):
+            views['scores'][index] = env.engine.score
+            views['lives'][index] = env.engine.lives
+
+def _vector_worker(buffer, num_envs: int, indices: range, env_options: dict, start, done):
+    views = _shared_views(buffer, num_envs, env_observation_shape(env_options.get('maze'),
+                                                                  env_options.get('maze_size')))
+    envs = [PacmanEnv(observation=views['observations'][index], **env_options) for index in indices]
+    while True:
+        start.acquire()
+        command = int(views['command'][0])
+        if command == _CLOSE:
+            done.release()
+            return
+        _run_envs(envs, indices, views, command)
+        done.release()
+
+class VectorPacmanEnv:
+    """num_envs environments stepped together, split over worker processes
+
+    Observations, actions, rewards and flags live in one shared-memory
+    block that the workers write into directly; a step is a command word
+    and a semaphore round trip per worker, with nothing pickled. Finished
+    episodes reset in the same step: their rewards and flags are final,
+    scores and lives are the finished game's, and the observation is the
+    new episode's first. Returned arrays are views into the shared block
+    and are overwritten by the next call. With workers=0 the environments
+    run in this process.
+    """
+
+    def __init__(self, num_envs: int, workers: Optional[int] = None, **env_options):
+        self.num_envs = num_envs
+        workers = min(num_envs, multiprocessing.cpu_count() if workers is None else workers)
+        self.workers = workers
+        shape = env_observation_shape(env_options.get('maze'), env_options.get('maze_size'))
+        self.buffer = multiprocessing.RawArray('b', _shared_views(None, num_envs, shape)['nbytes'])
+        self.views = _shared_views(self.buffer, num_envs, shape)
+        self.processes = []
+        self.signals = []
+        self.local = None
+        if workers == 0:
+            self.local = [PacmanEnv(observation=self.views['observations'][index], **env_options)
+                          for index in range(num_envs)]
+            return
+        for worker in range(workers):
+            indices = range(worker * num_envs // workers, (worker + 1) * num_envs // workers)
+            start, done = multiprocessing.Semaphore(0), multiprocessing.Semaphore(0)
+            process = multiprocessing.Process(target=_vector_worker, daemon=True,
+                                              args=(self.buffer, num_envs, indices, env_options, start, done))
+            process.start()
+            self.processes.append(process)
+            self.signals.append((start, done))
+
+    def _command(self, command: int):
+        if self.local is not None:
+            _run_envs(self.local, range(self.num_envs), self.views, command)
+            return
+        self.views['command'][0] = command
+        for start, _ in self.signals:
+            start.release()
+        for _, done in self.signals:
+            done.acquire()
+
+    def reset(self, seed: Optional[int] = None) -> np.ndarray:
+        """Start every environment; env i is seeded with seed + i"""
+        self.views['seeds'][:] = np.arange(self.num_envs) + seed if seed is not None else -1
+        self._command(_RESET)
+        return self.views['observations']
+
+    def step(self, actions) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """Apply one action per environment and advance them all"""
+        self.views['actions'][:] = actions
+        self._command(_STEP)
+        views = self.views
+        return (views['observations'], views['rewards'], views['terminated'], views['truncated'],
+                {'score': views['scores'], 'lives': views['lives']})
+
+    def close(self):
+        """Stop the worker processes"""
+        if self.processes:
+            self._command(_CLOSE)
+            for process in self.processes:
+                process.join()
+            self.processes = []
+            self.signals = []
+
+    def __enter__(self) -> 'VectorPacmanEnv':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vectorized Neon Pacman environment throughput")
+    parser.add_argument("--envs", type=int, default=16, help="environments")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (0 runs in-process)")
+    parser.add_argument("--steps", type=int, default=500, help="vector steps to time")
+    parser.add_argument("--frame-skip", type=int, default=1, help="frames per action")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with VectorPacmanEnv(args.envs, args.workers, frame_skip=args.frame_skip) as envs:
+        envs.reset(seed=0)
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            envs.step(rng.integers(0, ACTION_COUNT, args.envs))
+        elapsed = time.perf_counter() - start
+    print(f"🏃 {args.envs * args.steps / elapsed:,.0f} env steps/s "
+          f"({args.envs} envs, {envs.workers or 'no'} workers, frame skip {args.frame_skip})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Binary level files for Neon Pacman - a fixed header and the maze's flag grid,
+optionally followed by its distance matrix and junction table, loaded through
+copy-on-write mmaps so level packs open instantly and share pages between
+processes
+
+The junction table grows with the number of junctions, but the distance
+matrix holds two bytes per pair of walkable cells, O(cells^2): 2 MB for
+the classic maze, 573 MB for a 201x151 generated one. Save large levels
+with junctions=True alone.
+"""
+
+import mmap
+import struct
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from pacman_engine import (
+    CELL_WALL, CELL_PELLET, CELL_POWER_PELLET, DIRECTIONS,
+    Maze, MazeDistances, JunctionGraph,
+)
+
+LEVEL_MAGIC = b"NPLV"
+PACK_MAGIC = b"NPLP"
+FORMAT_VERSION = 1
+
+# Section flags
+HAS_DISTANCES = 1
+HAS_JUNCTIONS = 2
+
+# magic, version, flags, width, height, Pacman start, four ghost starts and
+# respawns, wall/pellet/power pellet counts, distance diameter, junction
+# node count, then grid, distance and junction offsets from the level start
+LEVEL_HEADER = struct.Struct("<4sHHII" + "II" * 9 + "III" + "II" + "QQQ")
+# magic, version, reserved, level count; then (offset, size) per level
+PACK_HEADER = struct.Struct("<4sHHI")
+PACK_ENTRY = struct.Struct("<QQ")
+
+# Sections start on cache-line boundaries and pack levels on page
+# boundaries, so every table is aligned for NumPy and pages are not split
+SECTION_ALIGN = 64
+PAGE_ALIGN = mmap.ALLOCATIONGRANULARITY
+
+def _aligned(offset: int, alignment: int) -> int:
+    return -(-offset // alignment) * alignment
+
+def level_bytes(maze: Maze, tables: bool = False, *, distances: Optional[bool] = None,
+                junctions: Optional[bool] = None) -> bytes:
+    """Serialize a maze, with its distance and junction tables if asked
+
+    tables asks for both; the distance matrix is then left out of mazes
+    with more walkable cells than uint16 distances cover, while asking
+    for distances explicitly raises ValueError on them.
+    """
+    if len(maze.ghost_starts) != 4 or len(maze.ghost_respawns) != 4:
+        raise ValueError("level files hold exactly four ghost starts and respawns")
+    walkable = maze.width * maze.height - maze.counts[CELL_WALL]
+    if distances is None:
+        distances = tables and walkable <= MazeDistances.UNREACHABLE
+    if junctions is None:
+        junctions = tables
+
+    # Grid, distance and junction sections, in header offset order
+    sections = [bytes(maze.grid), None, None]
+    flags = 0
+    diameter = 0
+    nodes = 0
+    if distances:
+        table = maze.distances()
+        sections[1] = table.matrix.astype("<u2", copy=False).tobytes()
+        diameter = table.diameter
+        flags |= HAS_DISTANCES
+    if junctions:
+        graph = maze.junctions()
+        ordered = sorted(graph.nodes, key=lambda cell: (cell[1], cell[0]))
+        edges = np.full((len(ordered), len(DIRECTIONS), 3), -1, dtype="<i4")
+        for n, node in enumerate(ordered):
+            for direction, ((x, y), length) in graph.edges[node].items():
+                edges[n, DIRECTIONS.index(direction)] = (x, y, length)
+        sections[2] = np.array(ordered, dtype="<i4").reshape(-1, 2).tobytes() + edges.tobytes()
+        nodes = len(ordered)
+        flags |= HAS_JUNCTIONS
+
+    offsets = []
+    position = LEVEL_HEADER.size
+    for section in sections:
+        if section is None:
+            offsets.append(0)
+            continue
+        position = _aligned(position, SECTION_ALIGN)
+        offsets.append(position)
+        position += len(section)
+
+    spawns = [maze.pacman_start] + list(maze.ghost_starts) + list(maze.ghost_respawns)
+    header = LEVEL_HEADER.pack(
+        LEVEL_MAGIC, FORMAT_VERSION, flags, maze.width, maze.height,
+        *(value for cell in spawns for value in cell),
+        maze.counts[CELL_WALL], maze.counts[CELL_PELLET], maze.counts[CELL_POWER_PELLET],
+        diameter, nodes, *offsets)
+
+    data = bytearray(position)
+    data[:len(header)] = header
+    for offset, section in zip(offsets, sections):
+        if section is not None:
+            data[offset:offset + len(section)] = section
+    return bytes(data)
+
+def read_level(buffer, offset: int = 0) -> Maze:
+    """Maze over the level at offset in a writable buffer, without copying the grid"""
+    view = memoryview(buffer)
+    fields = LEVEL_HEADER.unpack_from(view, offset)
+    magic, version, flags, width, height = fields[:5]
+    if magic != LEVEL_MAGIC:
+        raise ValueError(f"not a level: bad magic {magic!r}")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported level format version {version}")
+    spawns = list(zip(fields[5:23:2], fields[6:23:2]))
+    walls, pellets, power_pellets, diameter, nodes = fields[23:28]
+    grid_offset, distances_offset, junctions_offset = (offset + value for value in fields[28:31])
+
+    maze = Maze.from_grid(view[grid_offset:grid_offset + width * height], width, height,
+                          {CELL_WALL: walls, CELL_PELLET: pellets, CELL_POWER_PELLET: power_pellets})
+    maze.pacman_start = spawns[0]
+    maze.ghost_starts = spawns[1:5]
+    maze.ghost_respawns = spawns[5:9]
+
+    wall_mask = (maze.cells & CELL_WALL) != 0
+    distances = None
+    if flags & HAS_DISTANCES:
+        count = width * height - walls
+        matrix = np.frombuffer(view, dtype="<u2", count=count * count,
+                               offset=distances_offset).reshape(count, count)
+        distances = MazeDistances.from_matrix(wall_mask, matrix, diameter)
+    junctions = None
+    if flags & HAS_JUNCTIONS:
+        cells = np.frombuffer(view, dtype="<i4", count=nodes * 2, offset=junctions_offset)
+        table = np.frombuffer(view, dtype="<i4", count=nodes * len(DIRECTIONS) * 3,
+                              offset=junctions_offset + cells.nbytes).reshape(nodes, len(DIRECTIONS), 3)
+        edges = {}
+        for (x, y), row in zip(cells.reshape(-1, 2).tolist(), table.tolist()):
+            edges[(x, y)] = {direction: ((end_x, end_y), length)
+                             for direction, (end_x, end_y, length) in zip(DIRECTIONS, row) if length >= 0}
+        junctions = JunctionGraph(wall_mask, width, height, edges)
+    maze.attach_tables(distances, junctions)
+    return maze
+
+def _map(f, length: int = 0, offset: int = 0) -> mmap.mmap:
+    # Copy-on-write: pages stay shared with the file and other processes
+    # until a game writes to them, and writes never reach the file or
+    # other mazes loaded from it
+    return mmap.mmap(f.fileno(), length, access=mmap.ACCESS_COPY, offset=offset)
+
+def save_level(path: str, maze: Maze, tables: bool = False, **sections):
+    """Write one maze to a level file; see level_bytes for the tables"""
+    with open(path, "wb") as f:
+        f.write(level_bytes(maze, tables, **sections))
+
+def load_level(path: str) -> Maze:
+    """Memory-map a level file"""
+    with open(path, "rb") as f:
+        return read_level(_map(f))
+
+def save_level_pack(path: str, mazes: Sequence[Maze], tables: bool = False, **sections):
+    """Write mazes to one file, each level starting on a page boundary"""
+    position = _aligned(PACK_HEADER.size + PACK_ENTRY.size * len(mazes), PAGE_ALIGN)
+    entries = []
+    with open(path, "wb") as f:
+        f.seek(position)
+        for maze in mazes:
+            data = level_bytes(maze, tables, **sections)
+            entries.append((position, len(data)))
+            f.write(data)
+            position = _aligned(position + len(data), PAGE_ALIGN)
+            f.seek(position)
+        f.truncate(entries[-1][0] + entries[-1][1] if entries else position)
+        f.seek(0)
+        f.write(PACK_HEADER.pack(PACK_MAGIC, FORMAT_VERSION, 0, len(mazes)))
+        for entry in entries:
+            f.write(PACK_ENTRY.pack(*entry))
+
+class LevelPack:
+    """Memory-mapped level pack; opening reads only the index, levels load on access"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        header = self.file.read(PACK_HEADER.size)
+        if len(header) < PACK_HEADER.size or header[:4] != PACK_MAGIC:
+            self.file.close()
+            raise ValueError(f"{path} is not a level pack: bad magic {header[:4]!r}")
+        _, version, _, count = PACK_HEADER.unpack(header)
+        if version != FORMAT_VERSION:
+            self.file.close()
+            raise ValueError(f"{path} uses unsupported level pack version {version}")
+        index = self.file.read(PACK_ENTRY.size * count)
+        self.entries: List[tuple] = list(PACK_ENTRY.iter_unpack(index))
+
+    def close(self):
+        """Close the pack file; mazes already loaded keep their mappings"""
+        self.file.close()
+
+    def __enter__(self) -> 'LevelPack':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, index: int) -> Maze:
+        """Level at index, in its own copy-on-write mapping of the file"""
+        offset, size = self.entries[index]
+        return read_level(_map(self.file, size, offset))
+
+    def __iter__(self) -> Iterator[Maze]:
+        return (self[i] for i in range(len(self)))
+
+    def level_size(self, index: int) -> int:
+        """Bytes taken by the level at index"""
+        return self.entries[index][1]
@@ -3,455 +3,780 @@
 Neon Pacman with AI - A modern, neon-styled Pacman game featuring AI-powered ghosts
 """
 
+import time
+# Startup timing begins before the heavy imports
+IMPORT_STARTED = time.perf_counter()
+
 import pygame
 import sys
+import os
 import math
 import random
-from enum import Enum
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import List, Tuple, Optional
 import numpy as np
 
-# Initialize Pygame
-pygame.init()
-
-# Initialize audio with error handling
-try:
-    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-    AUDIO_AVAILABLE = True
-except pygame.error:
-    print("⚠️  Audio not available in this environment")
-    AUDIO_AVAILABLE = False
-
-# Constants
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
-CELL_SIZE = 20
-MAZE_WIDTH = SCREEN_WIDTH // CELL_SIZE
-MAZE_HEIGHT = SCREEN_HEIGHT // CELL_SIZE
-
-# Neon Colors
-NEON_BLUE = (0, 255, 255)
-NEON_PINK = (255, 20, 147)
-NEON_GREEN = (57, 255, 20)
-NEON_YELLOW = (255, 255, 0)
-NEON_PURPLE = (138, 43, 226)
-NEON_RED = (255, 0, 100)
-NEON_ORANGE = (255, 165, 0)
-BLACK = (0, 0, 0)
-DARK_BLUE = (0, 0, 50)
-GLOW_WHITE = (255, 255, 255)
-
-# Game Constants
-PACMAN_SPEED = 4
-GHOST_SPEED = 3
-PELLET_SCORE = 10
-POWER_PELLET_SCORE = 50
-LIVES = 3
-
-class Direction(Enum):
-    UP = (0, -1)
-    DOWN = (0, 1)
-    LEFT = (-1, 0)
-    RIGHT = (1, 0)
-
-class GhostType(Enum):
-    RED = "aggressive"
-    PINK = "ambush"
-    BLUE = "patrol"
-    PURPLE = "random"
+# Simulation types and constants are re-exported for game scripts
+from pacman_engine import *
+from pacman_profiler import FrameProfiler, NULL_PROFILER
+
+# Pygame subsystems start on first use rather than at import, so scripts
+# and tests that only need the classes never open a window or audio device.
+# AUDIO_AVAILABLE is None until init_audio() has tried the mixer.
+AUDIO_AVAILABLE = None
+_audio_lock = threading.Lock()
+
+def init_video():
+    """Initialize the display and font subsystems (cheap once done)"""
+    pygame.display.init()
+    pygame.font.init()
+
+def init_audio() -> bool:
+    """Open the mixer on first use; returns whether audio is available
+    
+    Call from the main thread: SDL subsystem init is not thread-safe.
+    """
+    global AUDIO_AVAILABLE
+    with _audio_lock:
+        if pygame.mixer.get_init():
+            # Already opened, here or by the host (e.g. pygame.init())
+            AUDIO_AVAILABLE = True
+        elif AUDIO_AVAILABLE is not False:
+            # Initialize audio with error handling
+            try:
+                pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+                AUDIO_AVAILABLE = True
+            except pygame.error:
+                print("⚠️  Audio not available in this environment")
+                AUDIO_AVAILABLE = False
+        return AUDIO_AVAILABLE
+
+# Cold-start targets for the startup report, in milliseconds from the
+# start of this module's import
+STARTUP_BUDGET_MS = {'import': 400, 'first_frame': 800}
+
+# Render cache limits
+GLOW_CACHE_SIZE = 256
+GLOW_INTENSITY_STEPS = 20  # Glow intensity is quantized to 1/20 steps
+TEXT_CACHE_SIZE = 128
+WALL_PULSE_LEVELS = 16  # Distinct wall brightness levels in power mode
+PELLET_PULSE_PHASES = 6  # Pre-rendered pulse frames for regular pellets
+POWER_PELLET_PULSE_PHASES = 16  # Pre-rendered pulse/rotation frames for power pellets
+PROFILER_OVERLAY_REFRESH = 15  # Frames between re-renders of the profiler overlay text
+
+# Particle pool size, fade steps per sprite set, and ghost trail length in ticks
+PARTICLE_CAPACITY = 4096
+PARTICLE_FADE_LEVELS = 8
+PARTICLE_DRAG = 0.92  # Velocity kept per tick
+GHOST_TRAIL_TICKS = 18
+
+# Sound effects as data: a tone sweeping linearly from start to end Hz
+# over duration seconds at a fixed volume. Adding an effect is one entry;
+# it is synthesized once and then loaded from the sound cache.
+SOUND_DEFINITIONS = {
+    'pellet': {'wave': 'sine', 'duration': 0.1, 'start': 800, 'end': 800, 'volume': 0.3},
+    'power_pellet': {'wave': 'sine', 'duration': 0.3, 'start': 400, 'end': 800, 'volume': 0.4},
+    'ghost_death': {'wave': 'sine', 'duration': 0.5, 'start': 600, 'end': 200, 'volume': 0.3},
+    'game_over': {'wave': 'sine', 'duration': 1.0, 'start': 200, 'end': 100, 'volume': 0.2},
+}
+# Bump when synthesis changes, so stale cached buffers are not reused
+SOUND_SYNTH_VERSION = 1
+
+WAVEFORMS = {
+    'sine': np.sin,
+    'square': lambda phase: np.where(np.sin(phase) >= 0, 1.0, -1.0),
+    'triangle': lambda phase: 2 / np.pi * np.arcsin(np.sin(phase)),
+}
+
+def synthesize_sound(definition: dict, sample_rate: int, channels: int = 2) -> np.ndarray:
+    """Render a sound definition to int16 samples, shaped (frames, channels)
+    
+    The frequency sweep is integrated into a running phase, so the pitch
+    glides without the clicks of recomputing sin(2*pi*f*t) per sample.
+    """
+    frames = int(definition['duration'] * sample_rate)
+    freq = np.linspace(definition['start'], definition['end'], frames, endpoint=False)
+    phase = np.empty(frames)
+    phase[0] = 0.0
+    np.cumsum(freq[:-1] * (2 * np.pi / sample_rate), out=phase[1:])
+    wave = WAVEFORMS[definition['wave']](phase) * (definition['volume'] * 32767)
+    samples = wave.astype(np.int16)
+    return np.repeat(samples[:, None], channels, axis=1) if channels > 1 else samples
+
+def sound_cache_dir() -> str:
+    """Where rendered sounds are kept between launches"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "neon-pacman", "sounds")
+
+def cached_sound(definition: dict, sample_rate: int, channels: int, cache_dir: Optional[str]) -> Tuple[np.ndarray, bool]:
+    """Samples for a definition, from the disk cache if rendered before; returns (samples, cache hit)"""
+    if cache_dir is None:
+        return synthesize_sound(definition, sample_rate, channels), False
+    key = repr((SOUND_SYNTH_VERSION, sorted(definition.items()), sample_rate, channels))
+    path = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + ".npy")
+    try:
+        return np.load(path), True
+    except (OSError, ValueError):
+        pass
+    samples = synthesize_sound(definition, sample_rate, channels)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write then rename, so a concurrent launch never reads half a file
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "wb") as f:
+            np.save(f, samples)
+        os.replace(temp, path)
+    except OSError:
+        pass  # A read-only cache only costs the synthesis next time
+    return samples, False
 
 class AudioManager:
     """Manages retro chiptune audio for the game"""
     
-    def __init__(self):
-        self.sounds = {}
+    def __init__(self, cache_dir: Optional[str] = "", background: bool = False):
+        # Every effect has an entry from the start; None until it is loaded
+        self.sounds = dict.fromkeys(SOUND_DEFINITIONS)
         self.music_playing = False
         self.volume = 0.7
+        # "" uses the default cache directory, None disables the cache
+        self.cache_dir = sound_cache_dir() if cache_dir == "" else cache_dir
+        self.cache_hits = 0
+        self.ready = threading.Event()
+        self.ready_at = None  # perf_counter() time the sounds finished loading
         
-        # Create simple chiptune-style sounds programmatically
-        self.create_sounds()
+        # The mixer opens here, on the calling thread; the sounds are then
+        # synthesized or loaded from the cache, optionally on a thread so
+        # that work overlaps the first frames. Effects played before then
+        # are skipped.
+        init_audio()
+        if background:
+            threading.Thread(target=self.create_sounds, name="sound-loader", daemon=True).start()
+        else:
+            self.create_sounds()
         
     def create_sounds(self):
-        """Create retro chiptune sounds using pygame"""
-        if not AUDIO_AVAILABLE:
-            # Create silent sounds as fallback
-            silent = np.zeros((1000, 2), dtype=np.int16)
-            for key in ['pellet', 'power_pellet', 'ghost_death', 'game_over']:
-                self.sounds[key] = None
-            return
-            
+        """Create retro chiptune sounds from SOUND_DEFINITIONS for the open mixer"""
         try:
-            # Create simple waveforms for retro sounds
-            sample_rate = 22050
-            
-            # Pellet collection sound (short beep)
-            duration = 0.1
-            frames = int(duration * sample_rate)
-            arr = np.zeros((frames, 2))
-            for i in range(frames):
-                wave = 0.3 * np.sin(2 * np.pi * 800 * i / sample_rate)
-                arr[i] = [wave, wave]
-            self.sounds['pellet'] = pygame.sndarray.make_sound((arr * 32767).astype(np.int16))
-            
-            # Power pellet sound (ascending beep)
-            duration = 0.3
-            frames = int(duration * sample_rate)
-            arr = np.zeros((frames, 2))
-            for i in range(frames):
-                freq = 400 + (i / frames) * 400
-                wave = 0.4 * np.sin(2 * np.pi * freq * i / sample_rate)
-                arr[i] = [wave, wave]
-            self.sounds['power_pellet'] = pygame.sndarray.make_sound((arr * 32767).astype(np.int16))
-            
-            # Ghost death sound (descending)
-            duration = 0.5
-            frames = int(duration * sample_rate)
-            arr = np.zeros((frames, 2))
-            for i in range(frames):
-                freq = 600 - (i / frames) * 400
-                wave = 0.3 * np.sin(2 * np.pi * freq * i / sample_rate)
-                arr[i] = [wave, wave]
-            self.sounds['ghost_death'] = pygame.sndarray.make_sound((arr * 32767).astype(np.int16))
-            
-            # Game over sound
-            duration = 1.0
-            frames = int(duration * sample_rate)
-            arr = np.zeros((frames, 2))
-            for i in range(frames):
-                freq = 200 - (i / frames) * 100
-                wave = 0.2 * np.sin(2 * np.pi * freq * i / sample_rate)
-                arr[i] = [wave, wave]
-            self.sounds['game_over'] = pygame.sndarray.make_sound((arr * 32767).astype(np.int16))
+            mixer = pygame.mixer.get_init()
+            if not mixer:
+                return
+            sample_rate, _, channels = mixer
+            for name, definition in SOUND_DEFINITIONS.items():
+                samples, hit = cached_sound(definition, sample_rate, channels, self.cache_dir)
+                self.cache_hits += hit
+                self.sounds[name] = pygame.sndarray.make_sound(samples)
             
         except Exception as e:
             print(f"Audio creation failed: {e}")
             # Create silent sounds as fallback
             silent = pygame.sndarray.make_sound(np.zeros((1000, 2), dtype=np.int16))
-            for key in ['pellet', 'power_pellet', 'ghost_death', 'game_over']:
+            for key in SOUND_DEFINITIONS:
                 self.sounds[key] = silent
+        finally:
+            self.ready_at = time.perf_counter()
+            self.ready.set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the sounds are loaded; returns False on timeout"""
+        return self.ready.wait(timeout)
     
     def play_sound(self, sound_name: str):
         """Play a sound effect"""
-        if AUDIO_AVAILABLE and sound_name in self.sounds and self.sounds[sound_name]:
-            self.sounds[sound_name].set_volume(self.volume)
-            self.sounds[sound_name].play()
+        sound = self.sounds.get(sound_name)
+        if sound is not None:
+            sound.set_volume(self.volume)
+            sound.play()
     
     def set_volume(self, volume: float):
         """Set master volume (0.0 to 1.0)"""
         self.volume = max(0.0, min(1.0, volume))
 
-class Maze:
-    """Represents the game maze"""
+class SurfaceCache:
+    """Bounded LRU cache of pre-rendered surfaces with hit/miss counters"""
     
-    def __init__(self):
-        self.width = MAZE_WIDTH
-        self.height = MAZE_HEIGHT
-        self.walls = set()
-        self.pellets = set()
-        self.power_pellets = set()
-        self.generate_maze()
-    
-    def generate_maze(self):
-        """Generate a simple maze layout"""
-        # Create border walls
-        for x in range(self.width):
-            self.walls.add((x, 0))
-            self.walls.add((x, self.height - 1))
-        for y in range(self.height):
-            self.walls.add((0, y))
-            self.walls.add((self.width - 1, y))
-        
-        # Add some internal walls for complexity
-        wall_patterns = [
-            # Horizontal walls
-            [(x, 5) for x in range(5, 15)],
-            [(x, 10) for x in range(10, 20)],
-            [(x, 15) for x in range(5, 25)],
-            [(x, 20) for x in range(15, 30)],
-            # Vertical walls
-            [(10, y) for y in range(8, 13)],
-            [(20, y) for y in range(3, 8)],
-            [(30, y) for y in range(12, 18)],
-        ]
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, factory):
+        """Return the cached surface for key, rendering it with factory() on a miss"""
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
         
-        for pattern in wall_patterns:
-            for pos in pattern:
-                if 0 < pos[0] < self.width - 1 and 0 < pos[1] < self.height - 1:
-                    self.walls.add(pos)
-        
-        # Generate pellets in empty spaces
-        for x in range(1, self.width - 1):
-            for y in range(1, self.height - 1):
-                if (x, y) not in self.walls:
-                    # Add power pellets in corners
-                    if (x < 3 or x > self.width - 4) and (y < 3 or y > self.height - 4):
-                        if random.random() < 0.3:  # 30% chance for power pellet in corners
-                            self.power_pellets.add((x, y))
-                    else:
-                        # Regular pellets everywhere else
-                        if random.random() < 0.7:  # 70% chance for regular pellet
-                            self.pellets.add((x, y))
-    
-    def is_wall(self, x: int, y: int) -> bool:
-        """Check if position is a wall"""
-        return (x, y) in self.walls
-    
-    def is_valid_position(self, x: int, y: int) -> bool:
-        """Check if position is valid (not a wall and within bounds)"""
-        return (0 <= x < self.width and 0 <= y < self.height and 
-                (x, y) not in self.walls)
-
-class Pacman:
-    """Player-controlled Pacman character"""
-    
-    def __init__(self, x: int, y: int):
-        self.x = x
-        self.y = y
-        self.direction = Direction.RIGHT
-        self.next_direction = Direction.RIGHT
-        self.speed = PACMAN_SPEED
-        self.radius = CELL_SIZE // 2 - 2
-        self.mouth_angle = 0
-        self.mouth_speed = 8
-    
-    def update(self, maze: Maze):
-        """Update Pacman's position and animation"""
-        # Try to change direction if requested
-        next_x = self.x + self.next_direction.value[0] * self.speed
-        next_y = self.y + self.next_direction.value[1] * self.speed
-        
-        if maze.is_valid_position(next_x // CELL_SIZE, next_y // CELL_SIZE):
-            self.direction = self.next_direction
-        
-        # Move in current direction
-        new_x = self.x + self.direction.value[0] * self.speed
-        new_y = self.y + self.direction.value[1] * self.speed
-        
-        # Check collision with walls
-        if maze.is_valid_position(new_x // CELL_SIZE, new_y // CELL_SIZE):
-            self.x = new_x
-            self.y = new_y
-        
-        # Screen wrapping
-        if self.x < 0:
-            self.x = SCREEN_WIDTH
-        elif self.x > SCREEN_WIDTH:
-            self.x = 0
-        
-        # Update mouth animation
-        self.mouth_angle = (self.mouth_angle + self.mouth_speed) % 360
-    
-    def set_direction(self, direction: Direction):
-        """Set the next direction for Pacman"""
-        self.next_direction = direction
-    
-    def get_grid_pos(self) -> Tuple[int, int]:
-        """Get Pacman's position in grid coordinates"""
-        return (self.x // CELL_SIZE, self.y // CELL_SIZE)
-
-class Ghost:
-    """AI-powered ghost with different behavioral patterns"""
-    
-    def __init__(self, x: int, y: int, ghost_type: GhostType, color: Tuple[int, int, int]):
-        self.x = x
-        self.y = y
-        self.ghost_type = ghost_type
-        self.color = color
-        self.direction = random.choice(list(Direction))
-        self.speed = GHOST_SPEED
-        self.target_x = x
-        self.target_y = y
-        self.patrol_points = []
-        self.current_patrol = 0
-        self.stuck_counter = 0
-        self.mode_timer = 0
-        self.scatter_mode = False
-        self.home_corner = (x, y)  # Each ghost's home corner
-        
-        # Initialize patrol points and home corners for different ghost types
-        if ghost_type == GhostType.BLUE:
-            self.patrol_points = [
-                (2 * CELL_SIZE, 2 * CELL_SIZE),
-                ((MAZE_WIDTH - 3) * CELL_SIZE, 2 * CELL_SIZE),
-                ((MAZE_WIDTH - 3) * CELL_SIZE, (MAZE_HEIGHT - 3) * CELL_SIZE),
-                (2 * CELL_SIZE, (MAZE_HEIGHT - 3) * CELL_SIZE)
-            ]
-        
-        # Set home corners for scatter mode
-        if ghost_type == GhostType.RED:
-            self.home_corner = ((MAZE_WIDTH - 2) * CELL_SIZE, 2 * CELL_SIZE)
-        elif ghost_type == GhostType.PINK:
-            self.home_corner = (2 * CELL_SIZE, 2 * CELL_SIZE)
-        elif ghost_type == GhostType.BLUE:
-            self.home_corner = ((MAZE_WIDTH - 2) * CELL_SIZE, (MAZE_HEIGHT - 2) * CELL_SIZE)
-        elif ghost_type == GhostType.PURPLE:
-            self.home_corner = (2 * CELL_SIZE, (MAZE_HEIGHT - 2) * CELL_SIZE)
-    
-    def update(self, maze: Maze, pacman: Pacman, other_ghosts: List['Ghost']):
-        """Update ghost AI and movement"""
-        # Update mode timer for scatter/chase behavior
-        self.mode_timer += 1
-        if self.mode_timer > 300:  # Switch modes every 5 seconds at 60 FPS
-            self.scatter_mode = not self.scatter_mode
-            self.mode_timer = 0
-        
-        self.choose_target(pacman, other_ghosts)
-        self.move_towards_target(maze)
-    
-    def choose_target(self, pacman: Pacman, other_ghosts: List['Ghost']):
-        """Choose target based on ghost AI type and current mode"""
-        # In scatter mode, all ghosts go to their home corners
-        if self.scatter_mode:
-            self.target_x = self.home_corner[0]
-            self.target_y = self.home_corner[1]
-            return
+        self.misses += 1
+        surface = factory()
+        self.entries[key] = surface
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return surface
+    
+    def clear(self):
+        """Drop all cached surfaces and reset the counters"""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+    
+    def stats(self) -> dict:
+        """Return cache size and hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+class GlowCache(SurfaceCache):
+    """Glow sprites keyed on (color, radius, quantized intensity)"""
+    
+    def __init__(self, max_size: int = GLOW_CACHE_SIZE):
+        super().__init__(max_size)
+    
+    def get_glow(self, color, radius: int, intensity: float = 1.0):
+        """Return a glow sprite of size radius*6 centered on (radius*3, radius*3)"""
+        level = int(round(intensity * GLOW_INTENSITY_STEPS))
+        key = (tuple(color), radius, level)
+        return self.get(key, lambda: self.render_glow(color, radius, level / GLOW_INTENSITY_STEPS))
+    
+    @staticmethod
+    def render_glow(color, radius: int, intensity: float):
+        """Render the multi-layer glow sprite"""
+        glow_surface = pygame.Surface((radius * 6, radius * 6), pygame.SRCALPHA)
         
-        if self.ghost_type == GhostType.RED:
-            # Aggressive: Direct chase with slight randomness to avoid clustering
-            self.target_x = pacman.x
-            self.target_y = pacman.y
-            
-            # Add slight offset if too close to other red ghosts
-            for ghost in other_ghosts:
-                if ghost != self and ghost.ghost_type == GhostType.RED:
-                    distance = math.sqrt((self.x - ghost.x)**2 + (self.y - ghost.y)**2)
-                    if distance < CELL_SIZE * 3:
-                        offset = random.randint(-2, 2) * CELL_SIZE
-                        self.target_x += offset
-                        self.target_y += offset
-            
-        elif self.ghost_type == GhostType.PINK:
-            # Ambush: Predict Pacman's movement with improved logic
-            prediction_distance = 4 * CELL_SIZE
-            
-            # Consider Pacman's current direction and speed
-            future_x = pacman.x + pacman.direction.value[0] * prediction_distance
-            future_y = pacman.y + pacman.direction.value[1] * prediction_distance
-            
-            # Add strategic positioning - try to cut off escape routes
-            if abs(pacman.x - self.x) > abs(pacman.y - self.y):
-                # Pacman is more horizontally distant, predict vertical movement
-                future_y += pacman.direction.value[1] * prediction_distance * 2
-            else:
-                # Pacman is more vertically distant, predict horizontal movement
-                future_x += pacman.direction.value[0] * prediction_distance * 2
-            
-            self.target_x = future_x
-            self.target_y = future_y
-            
-        elif self.ghost_type == GhostType.BLUE:
-            # Patrol: Enhanced patrol with dynamic adjustment
-            if self.patrol_points:
-                target_point = self.patrol_points[self.current_patrol]
-                distance_to_target = math.sqrt(
-                    (self.x - target_point[0])**2 + (self.y - target_point[1])**2
-                )
-                
-                if distance_to_target < CELL_SIZE * 1.5:
-                    self.current_patrol = (self.current_patrol + 1) % len(self.patrol_points)
-                
-                # If Pacman is very close, temporarily chase instead of patrol
-                pacman_distance = math.sqrt((self.x - pacman.x)**2 + (self.y - pacman.y)**2)
-                if pacman_distance < CELL_SIZE * 5:
-                    self.target_x = pacman.x
-                    self.target_y = pacman.y
-                else:
-                    self.target_x = target_point[0]
-                    self.target_y = target_point[1]
-            
-        elif self.ghost_type == GhostType.PURPLE:
-            # Random: Improved random movement with occasional chase
-            if random.random() < 0.15:  # 15% chance to change target
-                if random.random() < 0.3:  # 30% of the time, chase Pacman
-                    self.target_x = pacman.x + random.randint(-3, 3) * CELL_SIZE
-                    self.target_y = pacman.y + random.randint(-3, 3) * CELL_SIZE
-                else:
-                    # Random movement
-                    self.target_x = random.randint(2, MAZE_WIDTH - 3) * CELL_SIZE
-                    self.target_y = random.randint(2, MAZE_HEIGHT - 3) * CELL_SIZE
-    
-    def move_towards_target(self, maze: Maze):
-        """Move towards the chosen target using pathfinding"""
-        # Simple pathfinding: choose direction that gets closest to target
-        best_direction = self.direction
-        best_distance = float('inf')
-        
-        for direction in Direction:
-            new_x = self.x + direction.value[0] * self.speed
-            new_y = self.y + direction.value[1] * self.speed
+        # Create multiple glow layers for better effect
+        for i in range(5):
+            alpha = min(255, int((80 - i * 12) * intensity))
+            if alpha > 0:
+                glow_radius = radius + i * 3
+                glow_color = (*color, alpha)
+                pygame.draw.circle(glow_surface, glow_color, 
+                                 (radius * 3, radius * 3), glow_radius)
+        return glow_surface
+
+class TextCache(SurfaceCache):
+    """Rendered text keyed on (font, string, color)"""
+    
+    def __init__(self, max_size: int = TEXT_CACHE_SIZE):
+        super().__init__(max_size)
+    
+    def render(self, font, text: str, color):
+        """Return text rendered antialiased in color"""
+        key = (font, text, tuple(color))
+        return self.get(key, lambda: font.render(text, True, color))
+
+# HUD labels of the first four ghosts
+GHOST_LABELS = (
+    ("Red: Aggressive", NEON_RED),
+    ("Pink: Ambush", NEON_PINK),
+    ("Blue: Patrol", NEON_BLUE),
+    ("Purple: Random", NEON_PURPLE),
+)
+
+class Hud:
+    """Score, lives and ghost-mode labels, re-rendered only when they change"""
+    
+    def __init__(self, text_cache: TextCache, font, small_font):
+        self.text_cache = text_cache
+        self.font = font
+        self.small_font = small_font
+        self.state = None
+        self.items = []  # (surface, position) pairs to blit every frame
+        self.rebuilds = 0
+    
+    def get(self, score: int, lives: int, power_mode: bool, ghosts):
+        """Return the (surface, position) pairs for this state"""
+        state = (score, lives, power_mode, tuple(ghost.scatter_mode for ghost in ghosts[:len(GHOST_LABELS)]))
+        if state != self.state:
+            self.state = state
+            self.rebuilds += 1
+            render = self.text_cache.render
+            self.items = [(render(self.font, f"Score: {score}", NEON_GREEN), (10, 10)),
+                          (render(self.font, f"Lives: {lives}", NEON_RED), (10, 50))]
+            for i, ((info, color), scatter) in enumerate(zip(GHOST_LABELS, state[3])):
+                mode_text = " (Scatter)" if scatter else " (Chase)"
+                text_color = color if not power_mode else (100, 100, 255)
+                self.items.append((render(self.small_font, info + mode_text, text_color),
+                                   (SCREEN_WIDTH - 200, 10 + i * 25)))
+        return self.items
+
+def maze_view_size(maze) -> Tuple[int, int]:
+    """Pixel size of the maze layers: as much of the maze as the screen shows
+    
+    Mazes are drawn from the screen's top-left corner, so nothing past the
+    screen edge, plus the strongest screen shake, is ever visible.
+    """
+    margin = max(EVENT_SHAKE.values())
+    return (min(maze.width * CELL_SIZE, SCREEN_WIDTH + margin),
+            min(maze.height * CELL_SIZE, SCREEN_HEIGHT + margin))
+
+class WallLayer:
+    """Pre-composited wall layer, built once per maze
+    
+    Like the pellet layers, it covers only the part of the maze the screen
+    can show (see maze_view_size), so power-mode modulation never touches
+    offscreen walls.
+    """
+    
+    def __init__(self, maze, glow_cache: GlowCache):
+        self.maze = maze
+        size = maze_view_size(maze)
+        walls = self.visible_walls(maze, size)
+        self.normal = self.render(walls, glow_cache, size, 1.0)
+        # Power mode pulses only the wall bodies, so keep them apart from the glow
+        self.power_walls = self.render(walls, None, size, 1.2)
+        self.power_glow = self.render(walls, glow_cache, size, 1.2, walls=False)
+        # Scratch surface holding the power layer modulated to the current pulse
+        self.modulated = pygame.Surface(size, pygame.SRCALPHA)
+        self.modulated_level = None
+        # Solid tint; a MULT blit from it is far cheaper than a MULT fill
+        self.tint = pygame.Surface(size)
+    
+    @staticmethod
+    def visible_walls(maze, size) -> List[Tuple[int, int]]:
+        """Wall cells whose bodies or glow reach into a layer of size, in (x, y) order"""
+        # The glow spreads three glow radii (half a cell each) from the cell center
+        reach = 2
+        columns = min(maze.width, size[0] // CELL_SIZE + reach + 1)
+        rows = min(maze.height, size[1] // CELL_SIZE + reach + 1)
+        ys, xs = np.nonzero(maze.cells[:rows, :columns] & CELL_WALL)
+        order = np.lexsort((ys, xs))
+        return list(zip(xs[order].tolist(), ys[order].tolist()))
+    
+    @staticmethod
+    def render(cells, glow_cache, size, intensity: float, walls: bool = True):
+        """Draw walls and/or their glow onto a transparent, premultiplied-alpha surface"""
+        layer = pygame.Surface(size, pygame.SRCALPHA)
+        glow_radius = CELL_SIZE // 2
+        glow = None
+        if glow_cache is not None:
+            glow = glow_cache.get_glow(NEON_BLUE, glow_radius, intensity).premul_alpha()
+        for wall_x, wall_y in cells:
+            x, y = wall_x * CELL_SIZE, wall_y * CELL_SIZE
+            if glow is not None:
+                layer.blit(glow, (x + CELL_SIZE//2 - glow_radius * 3, y + CELL_SIZE//2 - glow_radius * 3),
+                           special_flags=pygame.BLEND_PREMULTIPLIED)
+            if walls:
+                pygame.draw.rect(layer, NEON_BLUE, 
+                               (x + 2, y + 2, CELL_SIZE - 4, CELL_SIZE - 4))
+        return layer
+    
+    def get(self, power_mode: bool, frame_count: int):
+        """Return the layer to blit this frame with BLEND_PREMULTIPLIED"""
+        if not power_mode:
+            return self.normal
+        
+        # Brightness pulse: modulate the wall bodies only when the quantized level changes
+        brightness = 0.7 + 0.3 * math.sin(frame_count * 0.1)
+        level = int(round((brightness - 0.7) / 0.3 * (WALL_PULSE_LEVELS - 1)))
+        if level != self.modulated_level:
+            value = int(255 * (0.7 + 0.3 * level / (WALL_PULSE_LEVELS - 1)))
+            self.modulated.fill((0, 0, 0, 0))
+            self.modulated.blit(self.power_walls, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            self.tint.fill((value, value, value))
+            self.modulated.blit(self.tint, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+            self.modulated.blit(self.power_glow, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+            self.modulated_level = level
+        return self.modulated
+
+class PelletSprites:
+    """Pre-rendered pulse-phase sprites for one kind of pellet"""
+    
+    def __init__(self, glow_cache: GlowCache, power: bool = False):
+        self.power = power
+        self.phases = POWER_PELLET_PULSE_PHASES if power else PELLET_PULSE_PHASES
+        # Pulse angular speed per frame, matching the original per-frame math.sin
+        self.rate = 0.2 if power else 0.15
+        self.frames = [self.render(glow_cache, 2 * math.pi * k / self.phases)
+                       for k in range(self.phases)]
+        # Every phase sprite shares the size of the largest one
+        self.half = self.frames[0].get_width() // 2
+        self.changes = {}  # (phase, phase) to the sprite region that differs
+    
+    def render(self, glow_cache: GlowCache, angle: float):
+        """Render one premultiplied pellet sprite at the given pulse angle"""
+        size = 72 if self.power else 24
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        center = (size // 2, size // 2)
+        
+        if self.power:
+            # Strong pulsing and rotating effect; rotation advances half as fast as the pulse
+            pulse = 0.7 + 0.3 * math.sin(angle)
+            rotation = angle / 2
+            glow_radius = int(12 * pulse)
+            glow = glow_cache.get_glow(NEON_GREEN, glow_radius, pulse * 1.5)
+            sprite.blit(glow, (center[0] - glow_radius * 3, center[1] - glow_radius * 3))
             
-            # Check if move is valid
-            if maze.is_valid_position(new_x // CELL_SIZE, new_y // CELL_SIZE):
-                distance = math.sqrt((new_x - self.target_x)**2 + (new_y - self.target_y)**2)
-                
-                # Avoid reversing direction unless stuck
-                if direction.value[0] == -self.direction.value[0] and direction.value[1] == -self.direction.value[1]:
-                    if self.stuck_counter < 10:
-                        continue
-                
-                if distance < best_distance:
-                    best_distance = distance
-                    best_direction = direction
-        
-        # Move in chosen direction
-        new_x = self.x + best_direction.value[0] * self.speed
-        new_y = self.y + best_direction.value[1] * self.speed
-        
-        if maze.is_valid_position(new_x // CELL_SIZE, new_y // CELL_SIZE):
-            self.x = new_x
-            self.y = new_y
-            self.direction = best_direction
-            self.stuck_counter = 0
+            radius = int(8 * pulse)
+            for i in range(8):
+                dot_angle = rotation + i * math.pi / 4
+                px = center[0] + radius * math.cos(dot_angle) * 0.5
+                py = center[1] + radius * math.sin(dot_angle) * 0.5
+                pygame.draw.circle(sprite, NEON_GREEN, (int(px), int(py)), 2)
+            pygame.draw.circle(sprite, NEON_GREEN, center, radius)
         else:
-            self.stuck_counter += 1
+            pulse = 0.8 + 0.2 * math.sin(angle)
+            glow_radius = int(4 * pulse)
+            glow = glow_cache.get_glow(NEON_YELLOW, glow_radius, pulse)
+            sprite.blit(glow, (center[0] - glow_radius * 3, center[1] - glow_radius * 3))
+            pygame.draw.circle(sprite, NEON_YELLOW, center, int(3 * pulse))
+        return sprite.premul_alpha()
+    
+    def phase(self, frame_count: int) -> int:
+        """Return the phase index for a frame"""
+        return int(frame_count * self.rate / (2 * math.pi) * self.phases + 0.5) % self.phases
+    
+    def get(self, frame_count: int):
+        """Return the sprite for a frame"""
+        return self.frames[self.phase(frame_count)]
+    
+    def changed_rect(self, old: int, new: int):
+        """Sprite-relative region whose pixels differ between two phases, None if identical"""
+        key = (min(old, new), max(old, new))
+        if key not in self.changes:
+            a, b = self.frames[old], self.frames[new]
+            diff = ((pygame.surfarray.array3d(a) != pygame.surfarray.array3d(b)).any(axis=2) |
+                    (pygame.surfarray.array_alpha(a) != pygame.surfarray.array_alpha(b)))
+            xs, ys = np.nonzero(diff)
+            self.changes[key] = (pygame.Rect(int(xs.min()), int(ys.min()), int(xs.max() - xs.min()) + 1,
+                                             int(ys.max() - ys.min()) + 1) if len(xs) else None)
+        return self.changes[key]
+    
+    def position(self, cell: Tuple[int, int]) -> Tuple[int, int]:
+        """Top-left blit position of the sprite centered on a cell"""
+        return (cell[0] * CELL_SIZE + CELL_SIZE//2 - self.half,
+                cell[1] * CELL_SIZE + CELL_SIZE//2 - self.half)
+
+class PelletLayer:
+    """Persistent pellet surfaces, one per pulse phase, patched as pellets are eaten
+    
+    The surfaces cover only the part of the maze the screen can show (see
+    maze_view_size); pellets beyond it are tracked but never drawn.
+    """
+    
+    def __init__(self, maze, sprites: PelletSprites):
+        self.maze = maze
+        self.sprites = sprites
+        self.cells = set(maze.pellets)
+        # Cells whose sprites can overlap a given cell
+        self.reach = (2 * sprites.half + CELL_SIZE - 1) // CELL_SIZE
+        size = maze_view_size(maze)
+        self.view = pygame.Rect((0, 0), size)
+        # Columns and rows of cells whose sprites can reach into the view
+        self.columns = (size[0] + sprites.half) // CELL_SIZE + 1
+        self.rows = (size[1] + sprites.half) // CELL_SIZE + 1
+        visible = sorted(cell for cell in self.cells if self.in_view(cell))
+        self.surfaces = []
+        for sprite in sprites.frames:
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            surface.blits([(sprite, sprites.position(cell)) for cell in visible], False)
+            self.surfaces.append(surface)
+    
+    def in_view(self, cell: Tuple[int, int]) -> bool:
+        """Whether the sprite of a pellet can show on the layer"""
+        return cell[0] < self.columns and cell[1] < self.rows
+    
+    def remove(self, cell: Tuple[int, int]):
+        """Erase one pellet, repainting only the neighbors its sprite overlapped"""
+        if cell not in self.cells:
+            return
+        self.cells.discard(cell)
+        if not self.in_view(cell):
+            return
         
-        # Screen wrapping
-        if self.x < 0:
-            self.x = SCREEN_WIDTH
-        elif self.x > SCREEN_WIDTH:
-            self.x = 0
+        dirty = self.sprite_rect(cell)
+        neighbors = [
+            (cx, cy)
+            for cx in range(cell[0] - self.reach, cell[0] + self.reach + 1)
+            for cy in range(cell[1] - self.reach, cell[1] + self.reach + 1)
+            if (cx, cy) in self.cells
+        ]
+        for surface, sprite in zip(self.surfaces, self.sprites.frames):
+            surface.set_clip(dirty)
+            surface.fill((0, 0, 0, 0))
+            for neighbor in neighbors:
+                surface.blit(sprite, self.sprites.position(neighbor))
+            surface.set_clip(None)
     
-    def get_grid_pos(self) -> Tuple[int, int]:
-        """Get ghost's position in grid coordinates"""
-        return (self.x // CELL_SIZE, self.y // CELL_SIZE)
+    def sprite_rect(self, cell: Tuple[int, int]):
+        """Region covered by the sprite of a pellet"""
+        x, y = self.sprites.position(cell)
+        size = 2 * self.sprites.half
+        return pygame.Rect(x, y, size, size)
+    
+    def sync(self, pellets):
+        """Patch out any pellets removed from the maze without going through remove()"""
+        for cell in self.cells - set(pellets):
+            self.remove(cell)
+    
+    def get(self, frame_count: int):
+        """Return the layer to blit this frame with BLEND_PREMULTIPLIED"""
+        return self.surfaces[self.sprites.phase(frame_count)]
+    
+    def changed_rects(self, old: int, new: int) -> List[pygame.Rect]:
+        """Layer regions that differ between two pulse phases, one rect per horizontal run of pellets"""
+        changed = self.sprites.changed_rect(old, new)
+        if changed is None:
+            return []
+        rects = []
+        run_start = previous = None
+        for cell in sorted(filter(self.in_view, self.cells), key=lambda cell: (cell[1], cell[0])):
+            if previous is None or cell != (previous[0] + 1, previous[1]):
+                if run_start is not None:
+                    rects.append(self.run_rect(run_start, previous, changed))
+                run_start = cell
+            previous = cell
+        if run_start is not None:
+            rects.append(self.run_rect(run_start, previous, changed))
+        return rects
+    
+    def run_rect(self, first: Tuple[int, int], last: Tuple[int, int], changed) -> pygame.Rect:
+        """Changed region of a run of pellets from first to last along one row"""
+        x, y = self.sprites.position(first)
+        right = self.sprites.position(last)[0] + changed.right
+        return pygame.Rect(x + changed.x, y + changed.y, right - x - changed.x, changed.height)
 
-class Game:
-    """Main game class"""
+class DirtyRectTracker:
+    """Collects the screen regions that changed this frame for partial display updates"""
     
     def __init__(self):
+        self.rects = []
+        self.previous = []  # Last frame's regions, so vacated areas get repainted too
+        self.full = True
+        self.state = None
+    
+    def mark(self, rect):
+        """Mark a region as changed this frame"""
+        self.rects.append(pygame.Rect(rect))
+    
+    def mark_full(self):
+        """Push the whole screen this frame"""
+        self.full = True
+    
+    def check_state(self, state):
+        """Fall back to a full update whenever a screen-wide state changes"""
+        if state != self.state:
+            self.state = state
+            self.full = True
+    
+    def present(self):
+        """Push this frame to the display and start collecting the next one"""
+        if self.full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.previous + self.rects)
+        self.previous = self.rects
+        self.rects = []
+        self.full = False
+
+class ParticleSystem:
+    """Fixed pool of fading particles, aged and spawned with NumPy
+    
+    Positions, velocities, ages and lifetimes are preallocated arrays;
+    spawning fills free slots (dropping particles when the pool is full)
+    and update() ages every slot in a few vectorized operations. Each
+    color gets one small set of pre-rendered fade-level sprites, and all
+    live particles are drawn with a single Surface.blits call.
+    """
+    
+    def __init__(self, capacity: int = PARTICLE_CAPACITY, seed: Optional[int] = None):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.int32)
+        self.lifetime = np.ones(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.rng = np.random.default_rng(seed)
+        self.palette = {}  # Color to index into sprites
+        self.sprites = []  # Per color, PARTICLE_FADE_LEVELS sprites from opaque to faint
+        self.flat_sprites = []
+        self.dropped = 0  # Spawns lost to a full pool
+    
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.alive))
+    
+    def color_index(self, color) -> int:
+        """Index of a color's sprite set, rendering it on first use"""
+        color = tuple(color)
+        index = self.palette.get(color)
+        if index is None:
+            index = self.palette[color] = len(self.sprites)
+            self.sprites.append([self.render(color, 1 - level / PARTICLE_FADE_LEVELS)
+                                 for level in range(PARTICLE_FADE_LEVELS)])
+        return index
+    
+    @staticmethod
+    def render(color, opacity: float):
+        """One 6x6 particle sprite"""
+        sprite = pygame.Surface((6, 6), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*color, int(255 * opacity)), (3, 3), 3)
+        return sprite
+    
+    def spawn(self, x, y, vx, vy, lifetime: int, color_index):
+        """Add particles; arguments are scalars or equal-length arrays"""
+        x, y, vx, vy, color_index = np.broadcast_arrays(x, y, vx, vy, color_index)
+        free = np.flatnonzero(~self.alive)[:len(x)]
+        count = len(free)
+        self.dropped += len(x) - count
+        self.x[free] = x[:count]
+        self.y[free] = y[:count]
+        self.vx[free] = vx[:count]
+        self.vy[free] = vy[:count]
+        self.color[free] = color_index[:count]
+        self.age[free] = 0
+        self.lifetime[free] = lifetime
+        self.alive[free] = True
+    
+    def burst(self, x: float, y: float, color, count: int, speed: float, lifetime: int):
+        """Particles flying out from (x, y) in random directions"""
+        angle = self.rng.uniform(0, 2 * np.pi, count)
+        velocity = self.rng.uniform(0.3, 1.0, count) * speed
+        self.spawn(np.full(count, x), np.full(count, y), np.cos(angle) * velocity, np.sin(angle) * velocity,
+                   lifetime, self.color_index(color))
+    
+    def update(self):
+        """Advance every particle one tick and retire the expired ones"""
+        if not self.alive.any():
+            return
+        self.x += self.vx
+        self.y += self.vy
+        self.vx *= PARTICLE_DRAG
+        self.vy *= PARTICLE_DRAG
+        self.age += 1
+        self.alive &= self.age < self.lifetime
+    
+    def clear(self):
+        self.alive[:] = False
+    
+    def draw(self, surface, offset: Tuple[int, int] = (0, 0), dirty: Optional['DirtyRectTracker'] = None):
+        """Blit every live particle, fading with age"""
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return
+        # Index into the flattened sprite sets: color * PARTICLE_FADE_LEVELS + fade level
+        frames = (self.color[live] * PARTICLE_FADE_LEVELS +
+                  self.age[live] * PARTICLE_FADE_LEVELS // self.lifetime[live]).tolist()
+        if len(self.flat_sprites) != len(self.sprites) * PARTICLE_FADE_LEVELS:
+            self.flat_sprites = [sprite for sprites in self.sprites for sprite in sprites]
+        xs = (self.x[live] + (offset[0] - 3)).astype(np.int32).tolist()
+        ys = (self.y[live] + (offset[1] - 3)).astype(np.int32).tolist()
+        rects = surface.blits(zip(map(self.flat_sprites.__getitem__, frames), zip(xs, ys)),
+                              doreturn=dirty is not None)
+        if dirty is not None:
+            for rect in rects:
+                dirty.mark(rect)
+
+# Sound effect and screen shake triggered by each engine event
+EVENT_SOUNDS = {
+    'pellet': 'pellet',
+    'power_pellet': 'power_pellet',
+    'ghost_eaten': 'ghost_death',
+    'life_lost': 'ghost_death',
+    'game_over': 'game_over',
+}
+EVENT_SHAKE = {
+    'power_pellet': 10,
+    'ghost_eaten': 5,
+    'life_lost': 15,
+}
+# Particle burst per engine event: count, speed, lifetime in ticks and
+# color (None for the ghost's own)
+EVENT_PARTICLES = {
+    'pellet': (6, 1.5, 12, NEON_YELLOW),
+    'power_pellet': (24, 3.0, 30, NEON_GREEN),
+    'ghost_eaten': (40, 4.0, 36, None),
+    'life_lost': (48, 4.0, 45, NEON_YELLOW),
+}
+
+def _engine_property(name: str):
+    """Expose a GameEngine attribute as a read/write Game attribute"""
+    return property(lambda self: getattr(self.engine, name),
+                    lambda self, value: setattr(self.engine, name, value))
+
+class Game:
+    """Main game class: renders a GameEngine and feeds it keyboard input"""
+    
+    score = _engine_property('score')
+    lives = _engine_property('lives')
+    game_over = _engine_property('game_over')
+    power_mode = _engine_property('power_mode')
+    power_timer = _engine_property('power_timer')
+    frame_count = _engine_property('frame_count')
+    maze = _engine_property('maze')
+    pacman = _engine_property('pacman')
+    ghosts = _engine_property('ghosts')
+    
+    def __init__(self, dirty_rects: bool = False, engine: Optional[GameEngine] = None,
+                 rng: Optional[random.Random] = None, render_fps: int = 60,
+                 profiler: Optional[FrameProfiler] = None):
+        init_video()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Neon Pacman with AI")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
         
-        # Game state
-        self.score = 0
-        self.lives = LIVES
-        self.game_over = False
+        # Simulation state lives in the engine
+        self.engine = engine if engine is not None else GameEngine()
         self.paused = False
-        self.power_mode = False
-        self.power_timer = 0
-        self.frame_count = 0
         
-        # Visual effects
+        # Simulation runs at TICK_RATE whatever the render rate; render_fps
+        # caps drawing (0 for uncapped) and fast-forward runs ticks flat out
+        self.timestep = FixedTimestep()
+        self.render_fps = render_fps
+        self.fast_forward = False
+        # Optional pacman_replay.Recording of the player's inputs
+        self.recorder = None
+        # Optional pacman_autopilot.Autopilot steering Pacman instead of the keys
+        self.autopilot = None
+        
+        # Visual effects draw from their own RNG, so the render rate never
+        # shifts the simulation's random stream
+        self.rng = rng if rng is not None else random.Random()
         self.screen_shake = 0
-        self.last_positions = {}  # For particle trails
+        self.particles = ParticleSystem(seed=self.rng.getrandbits(32))
+        self.last_positions = {}  # For particle trails and interpolation
+        self.last_pacman = (self.pacman.x, self.pacman.y)
         
-        # Audio
-        self.audio = AudioManager()
+        self.glow_cache = GlowCache()
+        self.text_cache = TextCache()
+        self.hud = Hud(self.text_cache, self.font, self.small_font)
+        # Screen dimmer behind the pause and game over text, and the power
+        # mode text backdrop (resized with the text)
+        self.dim_overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.dim_overlay.fill(BLACK)
+        self.dim_overlay.set_alpha(128)
+        self.power_backdrop = pygame.Surface((0, 0))
+        self.wall_layer = None
+        self.pellet_layer = None
+        self.pellet_phase = None  # Pulse phase of the pellet layer last drawn
+        self.pellet_sprites = None
+        self.power_pellet_sprites = None
+        # Optional partial display updates instead of a full flip every frame
+        self.dirty_rects = DirtyRectTracker() if dirty_rects else None
         
-        # Initialize game objects
-        self.maze = Maze()
-        self.pacman = Pacman(CELL_SIZE * 2, CELL_SIZE * 2)
+        # Audio loads in the background while the first frames render
+        self.audio = AudioManager(background=True)
+        # perf_counter() time the first frame reached the display
+        self.first_frame_at = None
         
-        # Create ghosts with different AI types
-        self.ghosts = [
-            Ghost(CELL_SIZE * 18, CELL_SIZE * 10, GhostType.RED, NEON_RED),
-            Ghost(CELL_SIZE * 20, CELL_SIZE * 10, GhostType.PINK, NEON_PINK),
-            Ghost(CELL_SIZE * 18, CELL_SIZE * 12, GhostType.BLUE, NEON_BLUE),
-            Ghost(CELL_SIZE * 20, CELL_SIZE * 12, GhostType.PURPLE, NEON_PURPLE)
-        ]
+        # Phase timings; the null profiler costs next to nothing until F3
+        # swaps in a real one
+        self.set_profiler(profiler if profiler is not None else NULL_PROFILER)
+        self.show_profiler = False
+        self.profiler_font = None
+        self.profiler_overlay = None
+        self.profiler_overlay_age = 0
         
         # Store initial positions for particle trails
         for ghost in self.ghosts:
@@ -466,126 +791,158 @@ class Game:
                 if event.key == pygame.K_ESCAPE:
                     return False
                 elif event.key == pygame.K_UP:
-                    self.pacman.set_direction(Direction.UP)
+                    self.steer(Direction.UP)
                 elif event.key == pygame.K_DOWN:
-                    self.pacman.set_direction(Direction.DOWN)
+                    self.steer(Direction.DOWN)
                 elif event.key == pygame.K_LEFT:
-                    self.pacman.set_direction(Direction.LEFT)
+                    self.steer(Direction.LEFT)
                 elif event.key == pygame.K_RIGHT:
-                    self.pacman.set_direction(Direction.RIGHT)
+                    self.steer(Direction.RIGHT)
                 elif event.key == pygame.K_SPACE:
                     self.paused = not self.paused
+                elif event.key == pygame.K_f:
+                    self.fast_forward = not self.fast_forward
+                    self.timestep.reset()
+                elif event.key == pygame.K_a:
+                    self.toggle_autopilot()
+                elif event.key == pygame.K_F3:
+                    self.toggle_profiler()
         
         return True
     
+    def snapshot(self) -> EngineSnapshot:
+        """Capture the simulation state (see GameEngine.snapshot)"""
+        return self.engine.snapshot()
+    
+    def restore(self, snapshot: EngineSnapshot):
+        """Rewind the simulation to a snapshot and drop effects from the abandoned timeline"""
+        self.engine.restore(snapshot)
+        self.last_positions = {id(ghost): (ghost.x, ghost.y) for ghost in self.ghosts}
+        self.last_pacman = (self.pacman.x, self.pacman.y)
+        self.screen_shake = 0
+        self.particles.clear()
+        if self.dirty_rects is not None:
+            self.dirty_rects.mark_full()
+    
+    def set_profiler(self, profiler):
+        """Time the game's phases, and the engine's ghost AI, with profiler"""
+        self.profiler = profiler
+        self.engine.profiler = profiler
+    
+    def toggle_profiler(self):
+        """Show or hide the phase timing overlay, starting to profile on first use"""
+        if not self.profiler.enabled:
+            self.set_profiler(FrameProfiler())
+        self.show_profiler = not self.show_profiler
+        self.profiler_overlay = None
+        if self.dirty_rects is not None:
+            self.dirty_rects.mark_full()
+    
+    def toggle_autopilot(self):
+        """Hand Pacman to the search autopilot, or take it back"""
+        if self.autopilot is None:
+            from pacman_autopilot import Autopilot
+            self.autopilot = Autopilot(self.engine)
+        else:
+            self.autopilot.close()
+            self.autopilot = None
+    
+    def steer(self, direction: Direction):
+        """Queue Pacman's next direction, noting it in the recording if there is one"""
+        self.pacman.set_direction(direction)
+        if self.recorder is not None:
+            self.recorder.record(self.frame_count, direction)
+    
     def update(self):
         """Update game logic"""
         if self.game_over or self.paused:
             return
         
-        self.frame_count += 1
+        profiler = self.profiler
+        start = lap = profiler.begin()
+        if self.autopilot is not None:
+            direction = self.autopilot.choose(self.engine)
+            if direction is not None:
+                self.steer(direction)
+            lap = profiler.lap('update.autopilot', lap)
         
-        # Update power mode
-        if self.power_mode:
-            self.power_timer -= 1
-            if self.power_timer <= 0:
-                self.power_mode = False
-        
-        # Update Pacman
-        self.pacman.update(self.maze)
-        
-        # Store previous positions for particle trails
+        # Store previous positions for particle trails and interpolation
         for ghost in self.ghosts:
             self.last_positions[id(ghost)] = (ghost.x, ghost.y)
+        self.last_pacman = (self.pacman.x, self.pacman.y)
         
-        # Update ghosts
-        for ghost in self.ghosts:
-            ghost.update(self.maze, self.pacman, self.ghosts)
-        
-        # Check pellet collection
-        pacman_grid = self.pacman.get_grid_pos()
-        if pacman_grid in self.maze.pellets:
-            self.maze.pellets.remove(pacman_grid)
-            self.score += PELLET_SCORE
-            self.audio.play_sound('pellet')
-        
-        if pacman_grid in self.maze.power_pellets:
-            self.maze.power_pellets.remove(pacman_grid)
-            self.score += POWER_PELLET_SCORE
-            self.power_mode = True
-            self.power_timer = 300  # 5 seconds at 60 FPS
-            self.screen_shake = 10
-            self.audio.play_sound('power_pellet')
-        
-        # Check ghost collisions
-        for ghost in self.ghosts:
-            distance = math.sqrt((self.pacman.x - ghost.x)**2 + (self.pacman.y - ghost.y)**2)
-            if distance < CELL_SIZE:
-                if self.power_mode:
-                    # In power mode, ghosts are vulnerable
-                    self.score += 200
-                    self.screen_shake = 5
-                    # Reset ghost position
-                    ghost.x = CELL_SIZE * (18 + self.ghosts.index(ghost) % 2)
-                    ghost.y = CELL_SIZE * (10 + self.ghosts.index(ghost) // 2)
-                    self.audio.play_sound('ghost_death')
+        events = self.engine.update()
+        lap = profiler.lap('update.engine', lap)
+        
+        # Age the particles, then drop trail particles where moving ghosts were
+        particles = self.particles
+        particles.update()
+        trail = [(x, y, particles.color_index(ghost.color))
+                 for ghost, (x, y) in ((ghost, self.last_positions[id(ghost)]) for ghost in self.ghosts)
+                 if (x, y) != (ghost.x, ghost.y)]
+        if trail:
+            xs, ys, colors = zip(*trail)
+            particles.spawn(np.array(xs), np.array(ys), 0.0, 0.0, GHOST_TRAIL_TICKS, np.array(colors))
+        
+        for name, payload in events:
+            if name == 'pellet' and self.pellet_layer is not None:
+                self.pellet_layer.remove(payload)
+                if self.dirty_rects is not None:
+                    self.dirty_rects.mark(self.pellet_layer.sprite_rect(payload))
+            if name in EVENT_SHAKE:
+                self.screen_shake = EVENT_SHAKE[name]
+            if name in EVENT_SOUNDS:
+                self.audio.play_sound(EVENT_SOUNDS[name])
+            if name in EVENT_PARTICLES:
+                count, speed, lifetime, color = EVENT_PARTICLES[name]
+                if name in ('pellet', 'power_pellet'):
+                    x, y = payload[0] * CELL_SIZE + CELL_SIZE // 2, payload[1] * CELL_SIZE + CELL_SIZE // 2
+                elif name == 'ghost_eaten':
+                    # The ghost has already respawned; burst where it was caught
+                    x, y = self.last_positions[id(payload)]
+                    color = payload.color
                 else:
-                    # Normal collision - lose life
-                    self.lives -= 1
-                    self.screen_shake = 15
-                    self.audio.play_sound('ghost_death')
-                    if self.lives <= 0:
-                        self.game_over = True
-                        self.audio.play_sound('game_over')
-                    else:
-                        # Reset positions
-                        self.pacman.x = CELL_SIZE * 2
-                        self.pacman.y = CELL_SIZE * 2
-                        for i, g in enumerate(self.ghosts):
-                            g.x = CELL_SIZE * (18 + i % 2)
-                            g.y = CELL_SIZE * (10 + i // 2)
+                    x, y = self.last_pacman
+                particles.burst(x, y, color, count, speed, lifetime)
         
         # Update screen shake
         if self.screen_shake > 0:
             self.screen_shake -= 1
-        
-        # Check win condition
-        if not self.maze.pellets and not self.maze.power_pellets:
-            self.game_over = True
+        profiler.lap('update.effects', lap)
+        profiler.lap('update', start)
     
     def draw_glow_effect(self, surface, color, center, radius, intensity=1.0):
         """Draw an enhanced glowing effect with multiple layers"""
-        glow_surface = pygame.Surface((radius * 6, radius * 6), pygame.SRCALPHA)
-        
-        # Create multiple glow layers for better effect
-        for i in range(5):
-            alpha = int((80 - i * 12) * intensity)
-            if alpha > 0:
-                glow_radius = radius + i * 3
-                glow_color = (*color, alpha)
-                pygame.draw.circle(glow_surface, glow_color, 
-                                 (radius * 3, radius * 3), glow_radius)
-        
+        glow_surface = self.glow_cache.get_glow(color, radius, intensity)
         surface.blit(glow_surface, (center[0] - radius * 3, center[1] - radius * 3))
     
     def draw_particle_trail(self, surface, start_pos, end_pos, color, particles=5):
-        """Draw a particle trail effect"""
+        """Draw a particle trail effect from the particle system's cached sprites"""
+        sprites = self.particles.sprites[self.particles.color_index(color)]
+        batch = []
         for i in range(particles):
             t = i / particles
             x = int(start_pos[0] + (end_pos[0] - start_pos[0]) * t)
             y = int(start_pos[1] + (end_pos[1] - start_pos[1]) * t)
-            alpha = int(255 * (1 - t))
-            particle_color = (*color, alpha)
-            
-            particle_surface = pygame.Surface((6, 6), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surface, particle_color, (3, 3), 3)
-            surface.blit(particle_surface, (x - 3, y - 3))
+            batch.append((sprites[int(t * PARTICLE_FADE_LEVELS)], (x - 3, y - 3)))
+        surface.blits(batch, doreturn=False)
     
-    def draw(self):
-        """Render the game"""
+    @staticmethod
+    def interpolate(previous, x: int, y: int, alpha: float) -> Tuple[float, float]:
+        """Position alpha of the way from previous to (x, y); jumps (respawns, wrapping) snap"""
+        px, py = previous
+        if abs(x - px) > CELL_SIZE or abs(y - py) > CELL_SIZE:
+            return x, y
+        return px + (x - px) * alpha, py + (y - py) * alpha
+    
+    def draw(self, alpha: float = 1.0):
+        """Render the game, alpha of the way from the previous tick to the current one"""
+        profiler = self.profiler
+        start = lap = profiler.begin()
+        
         # Apply screen shake
-        shake_x = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
-        shake_y = random.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
+        shake_x = self.rng.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
+        shake_y = self.rng.randint(-self.screen_shake, self.screen_shake) if self.screen_shake > 0 else 0
         
         # Clear screen with dark background
         if self.power_mode:
@@ -595,54 +952,51 @@ class Game:
         else:
             self.screen.fill(DARK_BLUE)
         
-        # Draw maze walls with enhanced neon glow
-        for wall_pos in self.maze.walls:
-            x, y = wall_pos[0] * CELL_SIZE + shake_x, wall_pos[1] * CELL_SIZE + shake_y
-            center = (x + CELL_SIZE//2, y + CELL_SIZE//2)
-            
-            # Enhanced glow for walls
-            intensity = 1.2 if self.power_mode else 1.0
-            self.draw_glow_effect(self.screen, NEON_BLUE, center, CELL_SIZE//2, intensity)
-            
-            # Draw wall with slight animation
-            wall_brightness = 255 if not self.power_mode else int(255 * (0.7 + 0.3 * math.sin(self.frame_count * 0.1)))
-            wall_color = (0, wall_brightness, wall_brightness)
-            pygame.draw.rect(self.screen, wall_color, 
-                           (x + 2, y + 2, CELL_SIZE - 4, CELL_SIZE - 4))
-        
-        # Draw pellets with pulsing effect
-        for pellet_pos in self.maze.pellets:
-            x, y = pellet_pos[0] * CELL_SIZE + shake_x, pellet_pos[1] * CELL_SIZE + shake_y
-            center = (x + CELL_SIZE//2, y + CELL_SIZE//2)
-            
-            # Pulsing effect
-            pulse = 0.8 + 0.2 * math.sin(self.frame_count * 0.15)
-            self.draw_glow_effect(self.screen, NEON_YELLOW, center, int(4 * pulse), pulse)
-            pygame.draw.circle(self.screen, NEON_YELLOW, center, int(3 * pulse))
+        # Draw maze walls from the pre-composited layer
+        if self.wall_layer is None or self.wall_layer.maze is not self.maze:
+            self.wall_layer = WallLayer(self.maze, self.glow_cache)
+        self.screen.blit(self.wall_layer.get(self.power_mode, self.frame_count), (shake_x, shake_y),
+                         special_flags=pygame.BLEND_PREMULTIPLIED)
+        lap = profiler.lap('draw.walls', lap)
+        
+        # Draw pellets from the pulse-phase layers
+        if self.pellet_sprites is None:
+            self.pellet_sprites = PelletSprites(self.glow_cache)
+            self.power_pellet_sprites = PelletSprites(self.glow_cache, power=True)
+        if self.pellet_layer is None or self.pellet_layer.maze is not self.maze:
+            self.pellet_layer = PelletLayer(self.maze, self.pellet_sprites)
+            self.pellet_phase = None
+        elif len(self.pellet_layer.cells) != len(self.maze.pellets):
+            self.pellet_layer.sync(self.maze.pellets)
+        self.screen.blit(self.pellet_layer.get(self.frame_count), (shake_x, shake_y),
+                         special_flags=pygame.BLEND_PREMULTIPLIED)
         
-        # Draw power pellets with enhanced effects
+        dirty = self.dirty_rects
+        phase = self.pellet_sprites.phase(self.frame_count)
+        if dirty is not None:
+            # Screen-wide changes (shake, power pulse, overlays, a new maze) need a full flip
+            dirty.check_state((self.power_mode, self.paused, self.game_over, self.screen_shake > 0, self.maze))
+            if self.screen_shake > 0 or self.power_mode or self.pellet_phase is None:
+                dirty.mark_full()
+            elif phase != self.pellet_phase:
+                # A pellet pulse step only changes the pellets themselves
+                for rect in self.pellet_layer.changed_rects(self.pellet_phase, phase):
+                    dirty.mark(rect)
+        self.pellet_phase = phase
+        
+        # Power pellets are few, so blit their current phase sprite directly
+        power_sprite = self.power_pellet_sprites.get(self.frame_count)
         for pellet_pos in self.maze.power_pellets:
-            x, y = pellet_pos[0] * CELL_SIZE + shake_x, pellet_pos[1] * CELL_SIZE + shake_y
-            center = (x + CELL_SIZE//2, y + CELL_SIZE//2)
-            
-            # Strong pulsing and rotating effect
-            pulse = 0.7 + 0.3 * math.sin(self.frame_count * 0.2)
-            rotation = self.frame_count * 0.1
-            
-            self.draw_glow_effect(self.screen, NEON_GREEN, center, int(12 * pulse), pulse * 1.5)
-            
-            # Draw rotating power pellet
-            radius = int(8 * pulse)
-            for i in range(8):
-                angle = rotation + i * math.pi / 4
-                px = center[0] + radius * math.cos(angle) * 0.5
-                py = center[1] + radius * math.sin(angle) * 0.5
-                pygame.draw.circle(self.screen, NEON_GREEN, (int(px), int(py)), 2)
-            
-            pygame.draw.circle(self.screen, NEON_GREEN, center, radius)
+            x, y = self.power_pellet_sprites.position(pellet_pos)
+            self.screen.blit(power_sprite, (x + shake_x, y + shake_y),
+                             special_flags=pygame.BLEND_PREMULTIPLIED)
+            if dirty is not None:
+                dirty.mark(power_sprite.get_rect(topleft=(x + shake_x, y + shake_y)))
+        lap = profiler.lap('draw.pellets', lap)
         
         # Draw Pacman with enhanced effects
-        pacman_center = (int(self.pacman.x + shake_x), int(self.pacman.y + shake_y))
+        pacman_x, pacman_y = self.interpolate(self.last_pacman, self.pacman.x, self.pacman.y, alpha)
+        pacman_center = (int(pacman_x + shake_x), int(pacman_y + shake_y))
         
         # Power mode effect for Pacman
         if self.power_mode:
@@ -651,6 +1005,10 @@ class Game:
                                 self.pacman.radius, power_intensity)
         else:
             self.draw_glow_effect(self.screen, NEON_YELLOW, pacman_center, self.pacman.radius)
+        if dirty is not None:
+            glow_size = self.pacman.radius * 6
+            dirty.mark(pygame.Rect(0, 0, glow_size, glow_size).move(
+                pacman_center[0] - glow_size // 2, pacman_center[1] - glow_size // 2))
         
         # Draw Pacman with mouth animation
         mouth_start_angle = self.pacman.mouth_angle
@@ -684,16 +1042,17 @@ class Game:
                 y = pacman_center[1] + self.pacman.radius * math.sin(math.radians(angle))
                 mouth_points.append((int(x), int(y)))
             pygame.draw.polygon(self.screen, DARK_BLUE, mouth_points)
+        lap = profiler.lap('draw.pacman', lap)
+        
+        # Trails and bursts, under the ghosts
+        self.particles.draw(self.screen, (shake_x, shake_y), dirty)
+        lap = profiler.lap('draw.particles', lap)
         
-        # Draw ghosts with enhanced effects and particle trails
+        # Draw ghosts with enhanced effects
         for ghost in self.ghosts:
-            ghost_center = (int(ghost.x + shake_x), int(ghost.y + shake_y))
-            
-            # Draw particle trail
-            if id(ghost) in self.last_positions:
-                last_pos = self.last_positions[id(ghost)]
-                trail_start = (int(last_pos[0] + shake_x), int(last_pos[1] + shake_y))
-                self.draw_particle_trail(self.screen, trail_start, ghost_center, ghost.color)
+            last_pos = self.last_positions.get(id(ghost), (ghost.x, ghost.y))
+            ghost_x, ghost_y = self.interpolate(last_pos, ghost.x, ghost.y, alpha)
+            ghost_center = (int(ghost_x + shake_x), int(ghost_y + shake_y))
             
             # Ghost color changes in power mode
             ghost_color = ghost.color
@@ -713,6 +1072,10 @@ class Game:
                 glow_intensity = 0.5  # Much dimmer when vulnerable
             
             self.draw_glow_effect(self.screen, ghost_color, ghost_center, CELL_SIZE//2, glow_intensity)
+            if dirty is not None:
+                glow_size = (CELL_SIZE//2) * 6
+                dirty.mark(pygame.Rect(0, 0, glow_size, glow_size).move(
+                    ghost_center[0] - glow_size // 2, ghost_center[1] - glow_size // 2))
             
             # Draw ghost body
             pygame.draw.circle(self.screen, ghost_color, ghost_center, CELL_SIZE//2 - 2)
@@ -733,56 +1096,41 @@ class Game:
                 # Small indicator for scatter mode
                 indicator_pos = (ghost_center[0], ghost_center[1] - CELL_SIZE//2 - 5)
                 pygame.draw.circle(self.screen, NEON_ORANGE, indicator_pos, 2)
+        lap = profiler.lap('draw.ghosts', lap)
         
-        # Enhanced UI
-        score_text = self.font.render(f"Score: {self.score}", True, NEON_GREEN)
-        lives_text = self.font.render(f"Lives: {self.lives}", True, NEON_RED)
-        self.screen.blit(score_text, (10, 10))
-        self.screen.blit(lives_text, (10, 50))
+        # Enhanced UI: score, lives and ghost modes, with their text cached
+        hud_items = self.hud.get(self.score, self.lives, self.power_mode, self.ghosts)
+        rects = self.screen.blits(hud_items, doreturn=dirty is not None)
+        if dirty is not None:
+            for rect in rects:
+                dirty.mark(rect)
         
+        text = self.text_cache.render
         # Power mode indicator
         if self.power_mode:
-            power_text = self.font.render(f"POWER MODE: {self.power_timer // 60 + 1}s", True, NEON_GREEN)
+            power_text = text(self.font, f"POWER MODE: {self.power_timer // 60 + 1}s", NEON_GREEN)
             text_rect = power_text.get_rect(center=(SCREEN_WIDTH // 2, 30))
             
             # Pulsing effect for power mode text
             pulse = 0.8 + 0.2 * math.sin(self.frame_count * 0.4)
-            glow_surface = pygame.Surface(power_text.get_size(), pygame.SRCALPHA)
-            glow_surface.fill((*NEON_GREEN, int(100 * pulse)))
-            self.screen.blit(glow_surface, (text_rect.x - 2, text_rect.y - 2))
+            if self.power_backdrop.get_size() != power_text.get_size():
+                self.power_backdrop = pygame.Surface(power_text.get_size())
+                self.power_backdrop.fill(NEON_GREEN)
+            self.power_backdrop.set_alpha(int(100 * pulse))
+            self.screen.blit(self.power_backdrop, (text_rect.x - 2, text_rect.y - 2))
             self.screen.blit(power_text, text_rect)
         
-        # Draw AI ghost info with mode indicators
-        ghost_info = [
-            ("Red: Aggressive", NEON_RED),
-            ("Pink: Ambush", NEON_PINK), 
-            ("Blue: Patrol", NEON_BLUE),
-            ("Purple: Random", NEON_PURPLE)
-        ]
-        
-        for i, (info, color) in enumerate(ghost_info):
-            ghost = self.ghosts[i]
-            mode_text = " (Scatter)" if ghost.scatter_mode else " (Chase)"
-            full_text = info + mode_text
-            
-            text_color = color if not self.power_mode else (100, 100, 255)
-            text = self.small_font.render(full_text, True, text_color)
-            self.screen.blit(text, (SCREEN_WIDTH - 200, 10 + i * 25))
-        
         # Draw game over screen
         if self.game_over:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(128)
-            overlay.fill(BLACK)
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.dim_overlay, (0, 0))
             
             if not self.maze.pellets and not self.maze.power_pellets:
-                game_over_text = self.font.render("YOU WIN!", True, NEON_GREEN)
+                game_over_text = text(self.font, "YOU WIN!", NEON_GREEN)
             else:
-                game_over_text = self.font.render("GAME OVER", True, NEON_RED)
+                game_over_text = text(self.font, "GAME OVER", NEON_RED)
             
-            final_score_text = self.font.render(f"Final Score: {self.score}", True, NEON_GREEN)
-            restart_text = self.small_font.render("Press ESC to quit", True, NEON_YELLOW)
+            final_score_text = text(self.font, f"Final Score: {self.score}", NEON_GREEN)
+            restart_text = text(self.small_font, "Press ESC to quit", NEON_YELLOW)
             
             self.screen.blit(game_over_text, 
                            (SCREEN_WIDTH//2 - game_over_text.get_width()//2, SCREEN_HEIGHT//2 - 50))
@@ -793,41 +1141,136 @@ class Game:
         
         # Draw pause screen
         if self.paused:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            overlay.set_alpha(128)
-            overlay.fill(BLACK)
-            self.screen.blit(overlay, (0, 0))
+            self.screen.blit(self.dim_overlay, (0, 0))
             
-            pause_text = self.font.render("PAUSED", True, NEON_YELLOW)
-            continue_text = self.small_font.render("Press SPACE to continue", True, NEON_GREEN)
+            pause_text = text(self.font, "PAUSED", NEON_YELLOW)
+            continue_text = text(self.small_font, "Press SPACE to continue", NEON_GREEN)
             
             self.screen.blit(pause_text, 
                            (SCREEN_WIDTH//2 - pause_text.get_width()//2, SCREEN_HEIGHT//2 - 25))
             self.screen.blit(continue_text, 
                            (SCREEN_WIDTH//2 - continue_text.get_width()//2, SCREEN_HEIGHT//2 + 25))
         
-        pygame.display.flip()
+        if self.show_profiler:
+            self.draw_profiler_overlay()
+        lap = profiler.lap('draw.hud', lap)
+        
+        if dirty is not None:
+            dirty.present()
+        else:
+            pygame.display.flip()
+        profiler.lap('draw.flip', lap)
+        profiler.lap('draw', start)
+        if self.first_frame_at is None:
+            self.first_frame_at = time.perf_counter()
+    
+    def draw_profiler_overlay(self):
+        """Rolling p50/p95/p99 per phase in the bottom-left corner, re-rendered every few frames"""
+        self.profiler_overlay_age += 1
+        if self.profiler_overlay is None or self.profiler_overlay_age >= PROFILER_OVERLAY_REFRESH:
+            self.profiler_overlay_age = 0
+            table = [('phase', 'p50', 'p95', 'p99 ms')]
+            for phase, stats in self.profiler.summary().items():
+                table.append((phase, f"{stats['p50']:.2f}", f"{stats['p95']:.2f}", f"{stats['p99']:.2f}"))
+            if self.profiler_font is None:
+                self.profiler_font = pygame.font.Font(None, 18)
+            cells = [[self.profiler_font.render(text, True, NEON_GREEN) for text in row] for row in table]
+            widths = [max(row[column].get_width() for row in cells) + 10 for column in range(4)]
+            row_height = self.profiler_font.get_linesize()
+            overlay = pygame.Surface((sum(widths) + 2, row_height * len(cells) + 12), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, 170))
+            for row_index, row in enumerate(cells):
+                x = 6
+                for column, (cell, width) in enumerate(zip(row, widths)):
+                    # Phase names align left, timings right
+                    offset = 0 if column == 0 else width - 10 - cell.get_width()
+                    overlay.blit(cell, (x + offset, 6 + row_index * row_height))
+                    x += width
+            self.profiler_overlay = overlay
+        rect = self.profiler_overlay.get_rect(bottomleft=(10, SCREEN_HEIGHT - 10))
+        self.screen.blit(self.profiler_overlay, rect)
+        if self.dirty_rects is not None:
+            self.dirty_rects.mark(rect)
     
     def run(self):
-        """Main game loop"""
+        """Main game loop: fixed-rate simulation ticks, interpolated rendering"""
         running = True
         while running:
+            lap = self.profiler.begin()
             running = self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(60)  # 60 FPS
+            self.profiler.lap('events', lap)
+            if self.fast_forward:
+                # Simulate flat out, drawing the latest state once per frame budget
+                deadline = time.perf_counter() + 1.0 / (self.render_fps or 60)
+                while time.perf_counter() < deadline and not (self.game_over or self.paused):
+                    self.update()
+                self.draw()
+            else:
+                # Slow frames run several ticks and skip their renders
+                for _ in range(self.timestep.advance()):
+                    self.update()
+                self.draw(self.timestep.alpha)
+                self.clock.tick(self.render_fps)
         
+        if self.autopilot is not None:
+            self.autopilot.close()
         pygame.quit()
         return self.score
 
+def startup_report(game: Game) -> dict:
+    """Milliseconds from the start of this module's import to each startup milestone
+    
+    first_frame and sounds are None until the game has drawn a frame and
+    finished loading its sounds.
+    """
+    since_import = lambda at: (at - IMPORT_STARTED) * 1000 if at is not None else None
+    return {
+        'import': since_import(IMPORT_FINISHED),
+        'first_frame': since_import(game.first_frame_at),
+        'sounds': since_import(game.audio.ready_at),
+    }
+
+def print_startup_report() -> bool:
+    """Start a game, draw one frame, print startup timings; returns whether they met STARTUP_BUDGET_MS"""
+    game = Game()
+    game.draw()
+    game.audio.wait()
+    report = startup_report(game)
+    within = True
+    print("⏱️  Startup")
+    for name, ms in report.items():
+        budget = STARTUP_BUDGET_MS.get(name)
+        status = ""
+        if budget is not None:
+            status = f"  (budget {budget} ms) {'✅' if ms <= budget else '❌'}"
+            within &= ms <= budget
+        print(f"  {name:<12} {ms:8.1f} ms{status}")
+    pygame.quit()
+    return within
+
 def main():
     """Main function"""
+    if '--startup-report' in sys.argv[1:]:
+        sys.exit(0 if print_startup_report() else 1)
+    
     print("🎮 Neon Pacman with AI")
     print("=" * 40)
     print("Controls:")
     print("  Arrow Keys - Move Pacman")
     print("  SPACE - Pause/Unpause")
+    print("  F - Fast-forward")
+    print("  A - Autopilot on/off")
+    print("  F3 - Frame profiler overlay")
     print("  ESC - Quit")
+    print("\nOptions:")
+    print("  --dirty-rects - Only push changed screen regions (software renderers)")
+    print("  --pathfinding - Ghosts follow shortest maze paths")
+    print("  --junction-ai - Ghosts only make decisions at junctions")
+    print("  --seed N - Play a procedurally generated maze, with seeded randomness")
+    print("  --record FILE - Save the game's inputs for pacman_replay.py")
+    print("  --autopilot - Start with Pacman steered by the search autopilot")
+    print("  --profile FILE - Profile every frame and save a trace (.json for trace viewers, or .csv)")
+    print("  --startup-report - Time import and first frame against the startup budget, then exit")
     print("\nAI Ghost Types:")
     print("  🔴 Red: Aggressive chaser")
     print("  🩷 Pink: Ambush predictor") 
@@ -846,8 +1289,35 @@ def main():
         print(f"🏆 Current High Score: {high_score}")
         print("=" * 40)
     
-    game = Game()
+    options = sys.argv[1:]
+    seed = int(options[options.index('--seed') + 1]) if '--seed' in options else None
+    record = options[options.index('--record') + 1] if '--record' in options else None
+    # Recordings replay from the seed, so recorded games always have one
+    rng_seed = seed if seed is not None or record is None else random.randrange(2**32)
+    game = Game(dirty_rects='--dirty-rects' in options,
+                engine=GameEngine(pathfinding='--pathfinding' in options,
+                                  junction_ai='--junction-ai' in options,
+                                  maze=Maze(seed=seed) if seed is not None else None,
+                                  rng=random.Random(rng_seed) if rng_seed is not None else None),
+                rng=random.Random(rng_seed) if rng_seed is not None else None)
+    if record is not None:
+        from pacman_replay import Recording
+        game.recorder = Recording.for_engine(game.engine, rng_seed, seed)
+    if '--autopilot' in options:
+        game.toggle_autopilot()
+    profile = options[options.index('--profile') + 1] if '--profile' in options else None
+    if profile is not None:
+        game.set_profiler(FrameProfiler())
     final_score = game.run()
+    if profile is not None:
+        game.profiler.export(profile)
+        print(f"⏱️  Saved frame profile to {profile}")
+        for phase, stats in game.profiler.summary().items():
+            print(f"  {phase:<16} p50 {stats['p50']:6.2f}  p95 {stats['p95']:6.2f}  p99 {stats['p99']:6.2f} ms")
+    if record is not None:
+        game.recorder.finish(game.engine)
+        game.recorder.save(record)
+        print(f"🎬 Recorded {game.frame_count} frames to {record}")
     
     # Save high score if beaten
     if final_score > high_score:
@@ -872,5 +1342,7 @@ def save_high_score(score):
     except Exception as e:
         print(f"Could not save high score: {e}")
 
+IMPORT_FINISHED = time.perf_counter()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Frame profiler for Neon Pacman - named phase timings kept in fixed-size ring
+buffers, with rolling percentiles for the in-game overlay and Chrome trace
+JSON or CSV export; NullProfiler stands in at near-zero cost when disabled
+"""
+
+import csv
+import json
+import os
+from array import array
+from time import perf_counter
+from typing import Dict, List, Sequence, Tuple
+
+# Samples kept per phase for percentiles, and timed spans kept for traces
+PHASE_CAPACITY = 600  # 10 seconds of frames at 60 FPS
+TRACE_CAPACITY = 20000
+PERCENTILES = (50, 95, 99)
+
+class PhaseTimes:
+    """Ring buffer of the most recent durations of one phase, in seconds"""
+
+    __slots__ = ('samples', 'index', 'count', 'total')
+
+    def __init__(self, capacity: int):
+        self.samples = array('d', bytes(capacity * 8))
+        self.index = 0
+        self.count = 0  # Samples ever recorded
+        self.total = 0.0
+
+    def add(self, duration: float):
+        self.samples[self.index] = duration
+        self.index = (self.index + 1) % len(self.samples)
+        self.count += 1
+        self.total += duration
+
+    def recent(self) -> List[float]:
+        """Buffered durations, oldest first"""
+        if self.count < len(self.samples):
+            return list(self.samples[:self.count])
+        return list(self.samples[self.index:]) + list(self.samples[:self.index])
+
+    def percentiles(self, points: Sequence[float] = PERCENTILES) -> Tuple[float, ...]:
+        """Nearest-rank percentiles of the buffered durations, 0.0 when empty"""
+        ordered = sorted(self.recent())
+        if not ordered:
+            return tuple(0.0 for _ in points)
+        last = len(ordered) - 1
+        return tuple(ordered[min(last, max(0, int(-(-point * len(ordered) // 100)) - 1))] for point in points)
+
+class _Scope:
+    """Context manager timing one phase; reused, so phases must not nest within themselves"""
+
+    __slots__ = ('profiler', 'phase', 'start')
+
+    def __init__(self, profiler: 'FrameProfiler', phase: str):
+        self.profiler = profiler
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.phase, self.start, perf_counter())
+
+class FrameProfiler:
+    """Times named phases of the frame
+
+    Phases are timed either with a scope:
+
+        with profiler.scope('engine.ghosts'):
+            ...
+
+    or, for a run of consecutive sections, with laps that each end one
+    section and start the next:
+
+        t = profiler.begin()
+        ...
+        t = profiler.lap('draw.walls', t)
+
+    Dotted names are only a convention; spans nest in traces by time. The
+    latest PHASE_CAPACITY durations per phase feed percentiles, and the
+    latest TRACE_CAPACITY spans of all phases feed the exports.
+    """
+
+    enabled = True
+
+    def __init__(self, capacity: int = PHASE_CAPACITY, trace_capacity: int = TRACE_CAPACITY):
+        self.capacity = capacity
+        self.phases: Dict[str, PhaseTimes] = {}
+        self.scopes: Dict[str, _Scope] = {}
+        self.origin = perf_counter()
+        # Trace ring: phase number, start and duration of each span
+        self.names: List[str] = []
+        self.numbers: Dict[str, int] = {}
+        self.trace_phase = array('i', bytes(trace_capacity * 4))
+        self.trace_start = array('d', bytes(trace_capacity * 8))
+        self.trace_duration = array('d', bytes(trace_capacity * 8))
+        self.trace_index = 0
+        self.trace_count = 0
+
+    def begin(self) -> float:
+        """Start time for the first lap"""
+        return perf_counter()
+
+    def lap(self, phase: str, start: float) -> float:
+        """Record phase as running from start until now; returns now, to start the next lap"""
+        now = perf_counter()
+        self.record(phase, start, now)
+        return now
+
+    def scope(self, phase: str) -> _Scope:
+        """Context manager recording the time spent in its block as phase"""
+        scope = self.scopes.get(phase)
+        if scope is None:
+            scope = self.scopes[phase] = _Scope(self, phase)
+        return scope
+
+    def record(self, phase: str, start: float, end: float):
+        """Add one span of phase, in perf_counter() seconds"""
+        times = self.phases.get(phase)
+        if times is None:
+            times = self.phases[phase] = PhaseTimes(self.capacity)
+            self.numbers[phase] = len(self.names)
+            self.names.append(phase)
+        times.add(end - start)
+        index = self.trace_index
+        self.trace_phase[index] = self.numbers[phase]
+        self.trace_start[index] = start
+        self.trace_duration[index] = end - start
+        self.trace_index = (index + 1) % len(self.trace_phase)
+        self.trace_count += 1
+
+    def percentiles(self, phase: str, points: Sequence[float] = PERCENTILES) -> Tuple[float, ...]:
+        """Rolling percentiles of phase in milliseconds"""
+        times = self.phases.get(phase)
+        if times is None:
+            return tuple(0.0 for _ in points)
+        return tuple(value * 1000 for value in times.percentiles(points))
+
+    def summary(self) -> Dict[str, dict]:
+        """Per phase: samples recorded, mean, p50, p95 and p99 in milliseconds"""
+        summary = {}
+        for phase in sorted(self.phases):
+            times = self.phases[phase]
+            p50, p95, p99 = (value * 1000 for value in times.percentiles((50, 95, 99)))
+            summary[phase] = {'count': times.count, 'mean': times.total / times.count * 1000,
+                              'p50': p50, 'p95': p95, 'p99': p99}
+        return summary
+
+    def spans(self) -> List[Tuple[str, float, float]]:
+        """Buffered (phase, start, duration) spans in start order, times in seconds since creation"""
+        count = min(self.trace_count, len(self.trace_phase))
+        first = self.trace_index - count
+        spans = [(self.names[self.trace_phase[i]], self.trace_start[i] - self.origin, self.trace_duration[i])
+                 for i in (first + k for k in range(count))]
+        spans.sort(key=lambda span: (span[1], -span[2]))
+        return spans
+
+    def export_chrome_trace(self, path: str):
+        """Write the spans as Chrome trace JSON, for chrome://tracing, Perfetto or speedscope"""
+        pid = os.getpid()
+        events = [{'name': phase, 'cat': phase.split('.')[0], 'ph': 'X', 'pid': pid, 'tid': 0,
+                   'ts': round(start * 1e6, 3), 'dur': round(duration * 1e6, 3)}
+                  for phase, start, duration in self.spans()]
+        with open(path, "w") as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def export_csv(self, path: str):
+        """Write the spans as phase, start_ms, duration_ms rows"""
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(('phase', 'start_ms', 'duration_ms'))
+            for phase, start, duration in self.spans():
+                writer.writerow((phase, f"{start * 1000:.4f}", f"{duration * 1000:.4f}"))
+
+    def export(self, path: str):
+        """Export to CSV for .csv paths, Chrome trace JSON otherwise"""
+        if path.endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_chrome_trace(path)
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+_NULL_SCOPE = _NullScope()
+
+class NullProfiler:
+    """Profiler that records nothing: every call is a constant-time no-op"""
+
+    enabled = False
+
+    def begin(self) -> float:
+        return 0.0
+
+    def lap(self, phase: str, start: float) -> float:
+        return 0.0
+
+    def scope(self, phase: str) -> _NullScope:
+        return _NULL_SCOPE
+
+    def record(self, phase: str, start: float, end: float):
+        pass
+
+    def percentiles(self, phase: str, points: Sequence[float] = PERCENTILES) -> Tuple[float, ...]:
+        return tuple(0.0 for _ in points)
+
+    def summary(self) -> Dict[str, dict]:
+        return {}
+
+# Shared default for code that may or may not be profiled
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Input recordings for Neon Pacman - a game's seed and options plus a
+run-length-encoded stream of direction changes, replayed headlessly far
+faster than real time, optionally saving every Nth frame as a PNG
+"""
+
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+from typing import Iterator, Optional, Tuple
+
+from pacman_engine import DIRECTIONS, DIRECTION_INDEX, TICK_RATE, Direction, GameEngine, Maze
+
+RECORDING_MAGIC = b"NPRC"
+RECORDING_VERSION = 1
+
+# Option flags
+PATHFINDING = 1
+JUNCTION_AI = 2
+GENERATED_MAZE = 4
+
+# magic, version, flags, seed, maze seed, ghost count, frames, final score,
+# input stream length
+RECORDING_HEADER = struct.Struct("<4sHHQQIIII")
+
+def _write_varint(data: bytearray, value: int):
+    while value >= 0x80:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+
+def _read_varint(data: bytes, position: int) -> Tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+class Recording:
+    """Seed, engine options and the direction changes of one game
+
+    Inputs are stored as runs: a varint count of frames since the previous
+    change, then the new direction as one byte. Presses that repeat the
+    direction Pacman already has queued change nothing and are not stored,
+    so a whole game is typically a few hundred bytes.
+    """
+
+    def __init__(self, seed: int, maze_seed: Optional[int] = None, pathfinding: bool = False,
+                 junction_ai: bool = False, ghost_count: int = 4):
+        self.seed = seed
+        self.maze_seed = maze_seed
+        self.pathfinding = pathfinding
+        self.junction_ai = junction_ai
+        self.ghost_count = ghost_count
+        self.data = bytearray()
+        self.last_frame = 0
+        self.last_direction = None
+        self.frames = 0
+        self.score = 0
+
+    @classmethod
+    def for_engine(cls, engine: GameEngine, seed: int, maze_seed: Optional[int] = None) -> 'Recording':
+        """Recording of a game about to be played on engine, built from seed"""
+        return cls(seed, maze_seed, engine.pathfinding, engine.junction_ai, len(engine.ghosts))
+
+    def engine(self) -> GameEngine:
+        """Fresh engine in the recorded game's starting state"""
+        maze = Maze(seed=self.maze_seed) if self.maze_seed is not None else None
+        return GameEngine(pathfinding=self.pathfinding, junction_ai=self.junction_ai,
+                          ghost_count=self.ghost_count, maze=maze, rng=random.Random(self.seed))
+
+    def record(self, frame: int, direction: Direction):
+        """Note a direction change requested before the update of frame + 1"""
+        if direction is self.last_direction:
+            return
+        _write_varint(self.data, frame - self.last_frame)
+        self.data.append(DIRECTION_INDEX[direction])
+        self.last_frame = frame
+        self.last_direction = direction
+
+    def finish(self, engine: GameEngine):
+        """Record where the game ended, for replays to stop at and check"""
+        self.frames = engine.frame_count
+        self.score = engine.score
+
+    def inputs(self) -> Iterator[Tuple[int, Direction]]:
+        """Recorded (frame, direction) changes in order"""
+        frame = position = 0
+        while position < len(self.data):
+            delta, position = _read_varint(self.data, position)
+            frame += delta
+            yield frame, DIRECTIONS[self.data[position]]
+            position += 1
+
+    def to_bytes(self) -> bytes:
+        flags = ((PATHFINDING if self.pathfinding else 0) | (JUNCTION_AI if self.junction_ai else 0) |
+                 (GENERATED_MAZE if self.maze_seed is not None else 0))
+        header = RECORDING_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, flags, self.seed,
+                                       self.maze_seed or 0, self.ghost_count, self.frames,
+                                       self.score, len(self.data))
+        return header + bytes(self.data)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Recording':
+        if len(data) < RECORDING_HEADER.size or data[:4] != RECORDING_MAGIC:
+            raise ValueError("not a Neon Pacman recording")
+        (_, version, flags, seed, maze_seed, ghost_count, frames, score,
+         length) = RECORDING_HEADER.unpack_from(data)
+        if version != RECORDING_VERSION:
+            raise ValueError(f"unsupported recording version {version}")
+        recording = cls(seed, maze_seed if flags & GENERATED_MAZE else None,
+                        bool(flags & PATHFINDING), bool(flags & JUNCTION_AI), ghost_count)
+        recording.data = bytearray(data[RECORDING_HEADER.size:RECORDING_HEADER.size + length])
+        recording.frames = frames
+        recording.score = score
+        return recording
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Recording':
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+def replay(recording: Recording, render_every: int = 0, output: Optional[str] = None) -> GameEngine:
+    """Re-simulate a recording and return the engine in its final state
+
+    With render_every, the game is drawn every that many frames and, when
+    output is a directory, saved there as frame_NNNNNN.png.
+    """
+    engine = recording.engine()
+    game = None
+    if render_every:
+        # Draw offscreen unless a display was asked for
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        import pygame
+        from pacman_neon import Game
+        game = Game(engine=engine, rng=random.Random(recording.seed))
+        if output is not None:
+            os.makedirs(output, exist_ok=True)
+
+    inputs = recording.inputs()
+    pending = next(inputs, None)
+    while engine.frame_count < recording.frames and not engine.game_over:
+        while pending is not None and pending[0] <= engine.frame_count:
+            engine.pacman.set_direction(pending[1])
+            pending = next(inputs, None)
+        if game is None:
+            engine.update()
+            continue
+        game.update()
+        if engine.frame_count % render_every == 0:
+            game.draw()
+            if output is not None:
+                pygame.image.save(game.screen, os.path.join(output, f"frame_{engine.frame_count:06d}.png"))
+    return engine
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a Neon Pacman input recording")
+    parser.add_argument("recording", help="recording file written with pacman_neon.py --record")
+    parser.add_argument("--render-every", type=int, default=0, metavar="N",
+                        help="draw every Nth frame (0 for a headless replay)")
+    parser.add_argument("--output", help="directory to save rendered frames to as PNGs")
+    args = parser.parse_args()
+
+    recording = Recording.load(args.recording)
+    start = time.perf_counter()
+    engine = replay(recording, args.render_every, args.output)
+    elapsed = time.perf_counter() - start
+
+    print(f"🎬 Replayed {engine.frame_count} frames in {elapsed:.2f}s "
+          f"({engine.frame_count / TICK_RATE / max(elapsed, 1e-9):.0f}x real time)")
+    print(f"🏆 Score: {engine.score} (recorded {recording.score})")
+    if (engine.frame_count, engine.score) != (recording.frames, recording.score):
+        print("❌ Replay diverged from the recording")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
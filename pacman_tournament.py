@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Ghost AI tournaments for Neon Pacman - plays seeded headless episodes of a
+scripted or bot Pacman against every ghost configuration of a parameter grid
+over a process pool, streaming one result row per episode to CSV or Parquet
+and reporting per-configuration statistics
+"""
+
+import argparse
+import csv
+import itertools
+import math
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pacman_engine import (
+    CELL_SIZE, CELL_PELLET, CELL_POWER_PELLET, DIRECTIONS,
+    DEFAULT_GHOST_CONFIG, Direction, GameEngine, GhostConfig,
+)
+
+# Parquet output needs pyarrow; CSV works without it
+try:
+    import pyarrow
+    import pyarrow.parquet
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+PACMAN_BOTS = ('greedy', 'random', 'autopilot')
+
+# Columns of a result row, in file order
+RESULT_FIELDS = (('config', 'seed') + GhostConfig._fields +
+                 ('pacman', 'score', 'frames', 'pellets_eaten', 'lives_lost', 'capture_time', 'cleared'))
+
+# Parquet rows are buffered and written as row groups of this size
+PARQUET_ROW_GROUP = 256
+
+def config_grid(params: Dict[str, Sequence]) -> List[GhostConfig]:
+    """Every combination of the given GhostConfig field values, defaults elsewhere"""
+    for name in params:
+        if name not in GhostConfig._fields:
+            raise ValueError(f"unknown ghost parameter {name!r} (choose from {', '.join(GhostConfig._fields)})")
+    names = list(params)
+    return [DEFAULT_GHOST_CONFIG._replace(**dict(zip(names, values)))
+            for values in itertools.product(*(params[name] for name in names))]
+
+def parse_param(text: str) -> Tuple[str, list]:
+    """'name=v1,v2,...' to (name, values), typed like the GhostConfig default"""
+    name, _, values = text.partition("=")
+    if name not in GhostConfig._fields or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=V1,V2,... with NAME one of {', '.join(GhostConfig._fields)}")
+    kind = type(getattr(DEFAULT_GHOST_CONFIG, name))
+    return name, [kind(value) for value in values.split(",")]
+
+class GreedyPacman:
+    """Scripted Pacman: at each cell center, heads for the nearest pellet by maze
+    distance, refusing cells within two steps of a dangerous ghost"""
+
+    def __init__(self, engine: GameEngine):
+        maze = engine.maze
+        self.distances = maze.distances()
+        self.cell_numbers = np.full(maze.width * maze.height, -1, dtype=np.intp)
+        for number, (x, y) in enumerate(self.distances.cells):
+            self.cell_numbers[y * maze.width + x] = number
+
+    def __call__(self, engine: GameEngine) -> Optional[Direction]:
+        pacman = engine.pacman
+        if pacman.x % CELL_SIZE or pacman.y % CELL_SIZE:
+            return None
+        maze = engine.maze
+        index = self.distances.index
+        pellets = self.cell_numbers[np.flatnonzero(maze.cells.ravel() & (CELL_PELLET | CELL_POWER_PELLET))]
+        pellets = pellets[pellets >= 0]
+        ghosts = [index[cell] for cell in (ghost.get_grid_pos() for ghost in engine.ghosts) if cell in index]
+        x, y = pacman.get_grid_pos()
+        best, best_cost = None, math.inf
+        for direction in DIRECTIONS:
+            dx, dy = direction.value
+            cell = index.get(((x + dx) % maze.width, y + dy))
+            if cell is None:
+                continue
+            row = self.distances.matrix[cell]
+            cost = int(row[pellets].min()) if len(pellets) else 0
+            if ghosts and not engine.power_mode and int(row[ghosts].min()) <= 2:
+                cost += 10000
+            if cost < best_cost:
+                best, best_cost = direction, cost
+        return best
+
+class RandomPacman:
+    """Scripted Pacman: turns at random at cell centers, never reversing"""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def __call__(self, engine: GameEngine) -> Optional[Direction]:
+        pacman = engine.pacman
+        if pacman.x % CELL_SIZE or pacman.y % CELL_SIZE:
+            return None
+        x, y = pacman.get_grid_pos()
+        back = (-pacman.direction.value[0], -pacman.direction.value[1])
+        choices = [d for d in DIRECTIONS if d.value != back
+                   and engine.maze.is_valid_position(x + d.value[0], y + d.value[1])]
+        return self.rng.choice(choices) if choices else None
+
+def play_episode(config_index: int, config: GhostConfig, seed: int, pacman: str = 'greedy',
+                 max_frames: int = 3000, engine_options: Optional[dict] = None) -> dict:
+    """Play one seeded headless game and return its result row
+
+    capture_time is the frame of the first life lost, None if Pacman was
+    never caught. Everything is derived from the seed, so a row is
+    reproducible in any process.
+    """
+    engine = GameEngine(rng=random.Random(seed), ghost_config=config, **(engine_options or {}))
+    autopilot = None
+    if pacman == 'greedy':
+        controller = GreedyPacman(engine)
+    elif pacman == 'random':
+        controller = RandomPacman(seed)
+    elif pacman == 'autopilot':
+        from pacman_autopilot import Autopilot
+        autopilot = Autopilot(engine, workers=0, time_budget=None, max_rollouts=16, seed=seed)
+        controller = autopilot.choose
+    else:
+        raise ValueError(f"unknown Pacman bot {pacman!r} (choose from {', '.join(PACMAN_BOTS)})")
+
+    pellets_eaten = 0
+    capture_time = None
+    lives = engine.lives
+    while not engine.game_over and engine.frame_count < max_frames:
+        for name, _ in engine.step(controller(engine)):
+            if name == 'pellet' or name == 'power_pellet':
+                pellets_eaten += 1
+            elif name == 'life_lost' and capture_time is None:
+                capture_time = engine.frame_count
+    if autopilot is not None:
+        autopilot.close()
+
+    row = {'config': config_index, 'seed': seed}
+    row.update(config._asdict())
+    row.update(pacman=pacman, score=engine.score, frames=engine.frame_count, pellets_eaten=pellets_eaten,
+               lives_lost=lives - engine.lives, capture_time=capture_time,
+               cleared=engine.game_over and engine.lives > 0)
+    return row
+
+def _play_task(task: tuple) -> dict:
+    return play_episode(*task)
+
+class ResultWriter:
+    """Appends result rows to a .csv or .parquet file as they arrive
+
+    CSV rows are flushed one by one; Parquet rows go out in row groups of
+    PARQUET_ROW_GROUP, so an interrupted run keeps what it finished.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        if self.parquet:
+            if not PARQUET_AVAILABLE:
+                raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow")
+            self.rows = []
+            self.writer = None
+        else:
+            self.file = open(path, "w", newline="")
+            self.writer = csv.DictWriter(self.file, RESULT_FIELDS)
+            self.writer.writeheader()
+
+    def write(self, row: dict):
+        if not self.parquet:
+            self.writer.writerow(row)
+            self.file.flush()
+            return
+        self.rows.append(row)
+        if len(self.rows) >= PARQUET_ROW_GROUP:
+            self._flush_parquet()
+
+    def _flush_parquet(self):
+        if not self.rows:
+            return
+        if self.writer is None:
+            # Explicit schema, so a first row group without captures still types capture_time
+            types = {'pacman': pyarrow.string(), 'cleared': pyarrow.bool_()}
+            types.update((name, pyarrow.float64()) for name in GhostConfig._fields
+                         if isinstance(getattr(DEFAULT_GHOST_CONFIG, name), float))
+            self.schema = pyarrow.schema([(name, types.get(name, pyarrow.int64())) for name in RESULT_FIELDS])
+            self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+        table = pyarrow.Table.from_pylist(self.rows, schema=self.schema)
+        self.writer.write_table(table)
+        self.rows = []
+
+    def close(self):
+        if self.parquet:
+            self._flush_parquet()
+            if self.writer is not None:
+                self.writer.close()
+        else:
+            self.file.close()
+
+    def __enter__(self) -> 'ResultWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def run_tournament(configs: Sequence[GhostConfig], seeds: Sequence[int], pacman: str = 'greedy',
+                   max_frames: int = 3000, workers: Optional[int] = None,
+                   engine_options: Optional[dict] = None) -> Iterator[dict]:
+    """Play every config against every seed, yielding result rows as episodes finish
+
+    Episodes are independent tasks spread over a process pool, so the
+    throughput grows with the worker count; with workers=0 they run in
+    this process, in order. Every config meets the same seeds, which keeps
+    the comparison paired.
+    """
+    tasks = [(index, config, seed, pacman, max_frames, engine_options)
+             for index, config in enumerate(configs) for seed in seeds]
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    if workers == 0:
+        for task in tasks:
+            yield _play_task(task)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(_play_task, task) for task in tasks]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+def summarize(rows: Sequence[dict]) -> List[dict]:
+    """Per-config statistics of result rows, in config order"""
+    by_config = {}
+    for row in rows:
+        by_config.setdefault(row['config'], []).append(row)
+    summary = []
+    for index in sorted(by_config):
+        episodes = by_config[index]
+        captures = [row['capture_time'] for row in episodes if row['capture_time'] is not None]
+        stats = {'config': index, 'episodes': len(episodes)}
+        stats.update((name, episodes[0][name]) for name in GhostConfig._fields)
+        stats.update(
+            capture_rate=len(captures) / len(episodes),
+            capture_time=statistics.mean(captures) if captures else None,
+            capture_time_median=statistics.median(captures) if captures else None,
+            pellets_eaten=statistics.mean(row['pellets_eaten'] for row in episodes),
+            lives_lost=statistics.mean(row['lives_lost'] for row in episodes),
+            score=statistics.mean(row['score'] for row in episodes),
+        )
+        summary.append(stats)
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ghost AI configurations over seeded headless games")
+    parser.add_argument("--param", type=parse_param, action="append", default=[], metavar="NAME=V1,V2",
+                        help=f"values to try for a GhostConfig field ({', '.join(GhostConfig._fields)}); "
+                             "repeat for a grid")
+    parser.add_argument("--pacman", choices=PACMAN_BOTS, default="greedy", help="Pacman bot")
+    parser.add_argument("--episodes", type=int, default=20, help="seeded games per config")
+    parser.add_argument("--seed", type=int, default=0, help="first game seed")
+    parser.add_argument("--max-frames", type=int, default=3000, help="frame limit per game")
+    parser.add_argument("--workers", type=int, default=None, help="processes (0 runs in-process)")
+    parser.add_argument("--pathfinding", action="store_true", help="ghosts steer by maze distance")
+    parser.add_argument("--junction-ai", action="store_true", help="ghosts only decide at junctions")
+    parser.add_argument("--output", default="tournament.csv", help="result file, .csv or .parquet")
+    args = parser.parse_args()
+    if args.output.endswith(".parquet") and not PARQUET_AVAILABLE:
+        parser.error("Parquet output needs pyarrow: pip install pyarrow")
+
+    configs = config_grid(dict(args.param))
+    seeds = range(args.seed, args.seed + args.episodes)
+    options = {'pathfinding': args.pathfinding, 'junction_ai': args.junction_ai}
+    total = len(configs) * len(seeds)
+    print(f"🏟️  {len(configs)} configs x {len(seeds)} seeds = {total} episodes, {args.pacman} Pacman")
+
+    rows = []
+    start = time.perf_counter()
+    with ResultWriter(args.output) as writer:
+        for row in run_tournament(configs, seeds, args.pacman, args.max_frames, args.workers, options):
+            writer.write(row)
+            rows.append(row)
+            print(f"\r⏳ {len(rows)}/{total} episodes", end="", flush=True)
+    elapsed = time.perf_counter() - start
+    print(f"\r✅ {total} episodes in {elapsed:.1f}s ({total / elapsed:.1f}/s), results in {args.output}")
+
+    varied = [name for name, _ in args.param]
+    print()
+    print(f"{'config':>6} " + "".join(f"{name:>20}" for name in varied) +
+          f"{'caught':>8}{'capture t':>11}{'pellets':>9}{'lives lost':>12}{'score':>8}")
+    for stats in summarize(rows):
+        capture = f"{stats['capture_time']:.0f}" if stats['capture_time'] is not None else "-"
+        print(f"{stats['config']:>6} " + "".join(f"{stats[name]:>20}" for name in varied) +
+              f"{stats['capture_rate']:>8.0%}{capture:>11}{stats['pellets_eaten']:>9.1f}"
+              f"{stats['lives_lost']:>12.2f}{stats['score']:>8.0f}")
+
+if __name__ == "__main__":
+    main()
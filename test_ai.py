@@ -54,9 +54,84 @@ def test_ai_behaviors():
     print("\n🎉 All AI systems tested successfully!")
     return True
 
+def test_maze_distances():
+    """Test the precomputed maze distance index and shortest-path steering"""
+    print("🧪 Testing Maze Distances")
+    print("=" * 40)
+    
+    # A wall between two cells forces a detour
+    walls = {(x, 0) for x in range(5)} | {(x, 4) for x in range(5)}
+    walls |= {(0, y) for y in range(5)} | {(4, y) for y in range(5)} | {(2, 1), (2, 2)}
+    distances = MazeDistances(walls, 5, 5)
+    assert distances.distance((1, 1), (3, 1)) == 6
+    assert distances.distance((1, 1), (1, 1)) == 0
+    assert distances.distance((1, 1), (2, 1)) == MazeDistances.UNREACHABLE
+    assert distances.stats()['bytes'] == MazeDistances.estimate_bytes(len(distances.cells))
+    
+    # Mazes with the same walls share one index
+    maze = Maze()
+    assert maze.distances() is MazeDistances.for_walls(maze.walls, maze.width, maze.height)
+    
+    # Only the most recent layouts stay cached
+    for seed in range(LAYOUT_CACHE_SIZE + 2):
+        Maze(41, 31, seed=seed).distances()
+    assert len(MazeDistances._cache) == LAYOUT_CACHE_SIZE
+    print(f"✅ Distance index: {maze.distances().stats()}")
+    
+    # Below the wall at row 5, straight-line steering breaks the left/right tie
+    # towards the long way round; the maze distance picks the short one
+    ghost = Ghost(12 * CELL_SIZE, 6 * CELL_SIZE, GhostType.RED, NEON_RED)
+    ghost.direction = Direction.UP
+    ghost.target_x, ghost.target_y = 12 * CELL_SIZE, 3 * CELL_SIZE
+    ghost.move_towards_target(maze)
+    assert ghost.direction == Direction.LEFT
+    ghost = Ghost(12 * CELL_SIZE, 6 * CELL_SIZE, GhostType.RED, NEON_RED)
+    ghost.direction = Direction.UP
+    ghost.target_x, ghost.target_y = 12 * CELL_SIZE, 3 * CELL_SIZE
+    ghost.pathfinding = True
+    ghost.move_towards_target(maze)
+    assert ghost.direction == Direction.RIGHT
+    print("✅ Pathfinding ghost heads around the wall")
+
+def test_junction_graph():
+    """Test the junction graph and ghosts that only decide at its nodes"""
+    print("🧪 Testing Junction Graph")
+    print("=" * 40)
+    
+    # An H: two vertical corridors joined across the middle
+    open_cells = {(1, y) for y in range(1, 6)} | {(5, y) for y in range(1, 6)} | {(x, 3) for x in range(2, 5)}
+    walls = {(x, y) for x in range(7) for y in range(7)} - open_cells
+    graph = JunctionGraph(walls, 7, 7)
+    assert graph.nodes == {(1, 1), (1, 3), (1, 5), (5, 1), (5, 3), (5, 5)}
+    assert graph.edges[(1, 3)][Direction.RIGHT] == ((5, 3), 4)
+    assert graph.edges[(1, 1)] == {Direction.DOWN: ((1, 3), 2)}
+    print(f"✅ Junction graph: {graph.stats()}")
+    
+    decisions = []
+    
+    class CountingGhost(Ghost):
+        def choose_target(self, *args):
+            decisions.append(self.get_grid_pos())
+            super().choose_target(*args)
+    
+    maze = Maze()
+    maze.walls = walls
+    ghost = CountingGhost(CELL_SIZE, CELL_SIZE, GhostType.RED, NEON_RED)
+    ghost.direction = Direction.DOWN
+    ghost.junction_ai = True
+    pacman = Pacman(5 * CELL_SIZE, 5 * CELL_SIZE)
+    for _ in range(60):
+        ghost.update(maze, pacman, [ghost])
+        assert maze.is_valid_position(ghost.x // CELL_SIZE, ghost.y // CELL_SIZE)
+    assert decisions and set(decisions) <= graph.nodes
+    assert len(decisions) < 10
+    print(f"✅ Ghost decided {len(decisions)} times in 60 frames, at nodes only")
+
 if __name__ == "__main__":
     try:
         test_ai_behaviors()
+        test_maze_distances()
+        test_junction_graph()
         print("\n✅ ALL TESTS PASSED!")
     except Exception as e:
         print(f"\n❌ TEST FAILED: {e}")
@@ -180,10 +180,265 @@ def test_ai_performance():
     
     print("✅ AI Performance: All ghosts showing intelligent behavior")
 
+def test_glow_cache():
+    """Test that glow sprites are reused and the cache stays bounded"""
+    print("\n🌟 Glow Cache Test")
+    print("-" * 30)
+    
+    cache = GlowCache(max_size=3)
+    first = cache.get_glow(NEON_BLUE, 10, 1.0)
+    again = cache.get_glow(NEON_BLUE, 10, 1.01)  # Quantizes to the same level
+    assert first is again
+    assert cache.hits == 1 and cache.misses == 1
+    assert first.get_size() == (60, 60)
+    
+    for radius in range(1, 6):
+        cache.get_glow(NEON_YELLOW, radius, 0.8)
+    assert len(cache.entries) == 3
+    assert cache.stats()['misses'] == 6
+    
+    print("✅ Glow Cache: sprites reused, LRU bounded")
+
+def test_sound_synthesis():
+    """Test vectorized synthesis against a per-sample reference and the disk cache"""
+    import tempfile
+    print("\n🎵 Sound Synthesis Test")
+    print("-" * 30)
+    
+    definition = SOUND_DEFINITIONS['power_pellet']
+    samples = synthesize_sound(definition, 22050)
+    frames = int(definition['duration'] * 22050)
+    assert samples.shape == (frames, 2) and samples.dtype == np.int16
+    phase = 0.0
+    for i in range(0, frames, 997):
+        phase = 2 * np.pi * sum(definition['start'] + (definition['end'] - definition['start']) * k / frames
+                                for k in range(i)) / 22050
+        assert abs(int(samples[i, 0]) - int(np.sin(phase) * definition['volume'] * 32767)) <= 1
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        first = AudioManager(cache_dir=cache_dir)
+        second = AudioManager(cache_dir=cache_dir)
+        if init_audio():
+            assert first.cache_hits == 0 and second.cache_hits == len(SOUND_DEFINITIONS)
+            assert len(os.listdir(cache_dir)) == len(SOUND_DEFINITIONS)
+        assert set(second.sounds) == set(SOUND_DEFINITIONS)
+    
+    print("✅ Sound Synthesis: matches per-sample reference, cached on disk")
+
+def test_lazy_startup():
+    """Test that importing opens no pygame subsystems and sounds load in the background"""
+    import subprocess
+    print("\n⏱️  Lazy Startup Test")
+    print("-" * 30)
+    
+    code = (
+        "import pygame, pacman_neon\n"
+        "assert not pygame.display.get_init() and not pygame.mixer.get_init()\n"
+        "assert pacman_neon.AUDIO_AVAILABLE is None\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    
+    # A mixer the host already started is used, not skipped
+    code = (
+        "import pygame, pacman_neon\n"
+        "pygame.init()\n"
+        "assert pygame.mixer.get_init()\n"
+        "audio = pacman_neon.AudioManager(cache_dir=None)\n"
+        "assert pacman_neon.AUDIO_AVAILABLE is True\n"
+        "assert all(sound is not None for sound in audio.sounds.values())\n"
+    )
+    # The dummy driver opens anywhere, sound card or not
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+                   env=dict(os.environ, SDL_AUDIODRIVER="dummy"))
+    
+    audio = AudioManager(background=True)
+    assert set(audio.sounds) == set(SOUND_DEFINITIONS)
+    assert audio.wait(10)
+    if init_audio():
+        assert all(sound is not None for sound in audio.sounds.values())
+    
+    game = Game()
+    assert game.first_frame_at is None
+    game.draw()
+    
+    # F3 swaps in a real profiler and shows its overlay
+    assert not game.profiler.enabled
+    game.toggle_profiler()
+    game.update()
+    game.draw()
+    assert game.profiler.enabled and game.engine.profiler is game.profiler
+    assert {'update', 'engine.ghosts', 'draw.walls', 'draw.flip'} <= set(game.profiler.summary())
+    assert game.profiler_overlay is not None
+    report = startup_report(game)
+    assert 0 < report['import'] <= report['first_frame']
+    
+    print(f"✅ Lazy Startup: import {report['import']:.0f} ms, first frame {report['first_frame']:.0f} ms")
+
+def test_pellet_layer():
+    """Test that eating a pellet patches only that pellet out of every pulse phase"""
+    print("\n🟡 Pellet Layer Test")
+    print("-" * 30)
+    
+    maze = Maze()
+    maze.pellets = {(5, 7), (6, 7)}
+    layer = PelletLayer(maze, PelletSprites(GlowCache()))
+    center = lambda cell: (cell[0] * CELL_SIZE + CELL_SIZE // 2, cell[1] * CELL_SIZE + CELL_SIZE // 2)
+    
+    for surface in layer.surfaces:
+        assert surface.get_at(center((5, 7))).a == 255
+    
+    layer.remove((5, 7))
+    assert layer.cells == {(6, 7)}
+    for surface in layer.surfaces:
+        assert surface.get_at(center((5, 7))).a == 0
+        assert surface.get_at(center((6, 7))).a == 255
+    
+    # Pellets removed behind the layer's back are picked up by sync()
+    maze.pellets.discard((6, 7))
+    layer.sync(maze.pellets)
+    assert not layer.cells
+    
+    # Mazes larger than the screen get screen-sized layers; pellets off it are only tracked
+    big = Maze(401, 301, seed=0)
+    sprites = PelletSprites(GlowCache())
+    layer = PelletLayer(big, sprites)
+    assert all(surface.get_size() == maze_view_size(big) for surface in layer.surfaces)
+    assert maze_view_size(big)[0] < big.width * CELL_SIZE
+    assert WallLayer(big, GlowCache()).get(True, 0).get_size() == maze_view_size(big)
+    far = max(big.pellets)
+    layer.remove(far)
+    assert far not in layer.cells and len(layer.cells) == len(big.pellets) - 1
+    reach = layer.view.inflate(4 * sprites.half, 4 * sprites.half)
+    assert all(reach.colliderect(rect) for rect in layer.changed_rects(0, 1))
+    
+    print("✅ Pellet Layer: eaten pellets patched out of all phases")
+
+def test_dirty_rects():
+    """Test that the dirty-rect tracker pushes changed regions and falls back to full flips"""
+    print("\n🖼️  Dirty Rect Test")
+    print("-" * 30)
+    
+    pushed = []
+    original_flip, original_update = pygame.display.flip, pygame.display.update
+    pygame.display.flip = lambda: pushed.append('flip')
+    pygame.display.update = lambda rects: pushed.append(list(rects))
+    try:
+        tracker = DirtyRectTracker()
+        tracker.check_state(('normal',))
+        tracker.mark((0, 0, 10, 10))
+        tracker.present()  # First frame is always a full flip
+        
+        tracker.check_state(('normal',))
+        tracker.mark((20, 0, 10, 10))
+        tracker.present()  # Last frame's region is repainted along with this one
+        
+        tracker.check_state(('power',))
+        tracker.present()
+    finally:
+        pygame.display.flip, pygame.display.update = original_flip, original_update
+    
+    assert pushed[0] == 'flip'
+    assert pushed[1] == [pygame.Rect(0, 0, 10, 10), pygame.Rect(20, 0, 10, 10)]
+    assert pushed[2] == 'flip'
+    
+    # Pellet pulse steps repaint the pellet runs, not the whole screen
+    maze = Maze()
+    maze.pellets = {(5, 7), (6, 7), (9, 7)}
+    sprites = PelletSprites(GlowCache())
+    layer = PelletLayer(maze, sprites)
+    assert layer.changed_rects(0, 0) == []
+    rects = layer.changed_rects(0, 1)
+    assert len(rects) == 2 and rects[0].width > rects[1].width
+    assert rects[0].collidepoint(5 * CELL_SIZE + CELL_SIZE // 2, 7 * CELL_SIZE + CELL_SIZE // 2)
+    
+    # Seeded, with the ghosts held still, so no shake or power mode forces a flip
+    game = Game(dirty_rects=True, engine=GameEngine(rng=random.Random(0)), rng=random.Random(0))
+    for ghost in game.ghosts:
+        ghost.speed = 0
+    pushed = []
+    pygame.display.flip = lambda: pushed.append('flip')
+    pygame.display.update = lambda rects: pushed.append(list(rects))
+    try:
+        for _ in range(3 * TICK_RATE // 2):
+            game.update()
+            game.draw()
+    finally:
+        pygame.display.flip, pygame.display.update = original_flip, original_update
+    assert pushed.count('flip') == 1, "only the first frame should be a full flip"
+    screen_area = SCREEN_WIDTH * SCREEN_HEIGHT
+    assert max(sum(rect.width * rect.height for rect in rects) for rects in pushed[1:]) < screen_area
+    
+    print("✅ Dirty Rects: partial updates with full-flip fallback")
+
+def test_particles():
+    """Test that the particle pool ages, drops overflow, and bursts on engine events"""
+    print("\n✨ Particle Test")
+    print("-" * 30)
+    
+    particles = ParticleSystem(capacity=16, seed=0)
+    particles.burst(50, 50, NEON_PINK, 10, 2.0, 3)
+    particles.burst(50, 50, NEON_BLUE, 10, 2.0, 5)
+    assert len(particles) == 16 and particles.dropped == 4
+    assert len(particles.sprites) == 2 and len(particles.sprites[0]) == PARTICLE_FADE_LEVELS
+    surface = pygame.Surface((100, 100), pygame.SRCALPHA)
+    particles.draw(surface)
+    assert surface.get_bounding_rect().collidepoint(50, 50)
+    for _ in range(3):
+        particles.update()
+    assert len(particles) == 6  # The first burst has expired
+    particles.update()
+    assert not (np.abs(particles.x - 50) < 1e-3).all()
+    
+    game = Game(rng=random.Random(0))
+    pellet = next(iter(game.engine.maze.pellets))
+    game.engine.pacman.x, game.engine.pacman.y = pellet[0] * CELL_SIZE, pellet[1] * CELL_SIZE
+    game.update()
+    assert len(game.particles) >= EVENT_PARTICLES['pellet'][0]
+    game.draw()
+    
+    print(f"✅ Particles: pooled, aged and drawn in one batch ({len(game.particles)} live)")
+
+def test_text_cache():
+    """Test that HUD text is only re-rendered when score, lives or ghost modes change"""
+    print("\n🔤 Text Cache Test")
+    print("-" * 30)
+    
+    cache = TextCache(max_size=2)
+    font = pygame.font.Font(None, 24)
+    first = cache.render(font, "A", NEON_RED)
+    assert cache.render(font, "A", NEON_RED) is first
+    cache.render(font, "A", NEON_BLUE)
+    cache.render(font, "B", NEON_RED)
+    assert cache.render(font, "A", NEON_RED) is not first  # Evicted as least recently used
+    
+    game = Game(rng=random.Random(0))
+    game.draw()
+    rebuilds, misses = game.hud.rebuilds, game.text_cache.misses
+    game.paused = True
+    game.draw()
+    game.draw()
+    assert game.hud.rebuilds == rebuilds
+    assert game.text_cache.misses == misses + 2  # Pause text, rendered once
+    game.score += 10
+    game.draw()
+    assert game.hud.rebuilds == rebuilds + 1
+    game.ghosts[0].scatter_mode = not game.ghosts[0].scatter_mode
+    game.draw()
+    assert game.hud.rebuilds == rebuilds + 2
+    
+    print(f"✅ Text Cache: HUD rebuilt {game.hud.rebuilds} times, {game.text_cache.stats()['hit_rate']:.0%} hits")
+
 if __name__ == "__main__":
     try:
         success = test_all_features()
         test_ai_performance()
+        test_glow_cache()
+        test_sound_synthesis()
+        test_lazy_startup()
+        test_pellet_layer()
+        test_dirty_rects()
+        test_particles()
+        test_text_cache()
         
         if success:
             print("\n🚀 GAME READY FOR LAUNCH!")
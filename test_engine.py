@@ -0,0 +1,558 @@
+#!/usr/bin/env python3
+"""
+Test script for the headless simulation engine
+"""
+
+import sys
+import os
+import subprocess
+sys.path.append(os.path.dirname(__file__))
+
+from pacman_engine import *
+
+def test_engine_is_headless():
+    """Test that the engine runs without importing pygame"""
+    print("🧪 Testing Headless Engine")
+    print("=" * 40)
+    
+    code = (
+        "import sys\n"
+        "from pacman_engine import GameEngine\n"
+        "engine = GameEngine()\n"
+        "engine.run(600)\n"
+        "assert 'pygame' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    print("✅ Engine simulated 600 frames without pygame")
+
+def test_engine_events():
+    """Test scoring, events and collisions in the engine"""
+    engine = GameEngine()
+    
+    # Put a pellet and a power pellet right under Pacman's path
+    engine.maze.pellets.add((2, 2))
+    engine.maze.power_pellets.discard((2, 2))
+    events = engine.step(Direction.RIGHT)
+    assert ('pellet', (2, 2)) in events
+    assert engine.score == PELLET_SCORE
+    
+    engine.maze.power_pellets.add(engine.pacman.get_grid_pos())
+    events = engine.step()
+    assert any(name == 'power_pellet' for name, _ in events)
+    assert engine.power_mode and engine.power_timer == POWER_MODE_FRAMES
+    
+    # A vulnerable ghost on top of Pacman gets eaten and sent home
+    ghost = engine.ghosts[0]
+    ghost.x, ghost.y = engine.pacman.x, engine.pacman.y
+    ghost.speed = 0
+    score = engine.score
+    events = engine.step()
+    assert ('ghost_eaten', ghost) in events
+    assert engine.score >= score + GHOST_SCORE
+    assert (ghost.x, ghost.y) == engine.respawn_point(0)
+    
+    # Out of power mode, a collision costs a life
+    engine.power_mode = False
+    ghost.x, ghost.y = engine.pacman.x, engine.pacman.y
+    events = engine.step()
+    assert ('life_lost', ghost) in events
+    assert engine.lives == LIVES - 1
+    assert (engine.pacman.x, engine.pacman.y) == (CELL_SIZE * 2, CELL_SIZE * 2)
+    
+    print("✅ Engine events: pellets, power mode, ghost eaten, life lost")
+
+def test_engine_run():
+    """Test a full headless game with a simple controller"""
+    directions = list(Direction)
+    engine = GameEngine()
+    score = engine.run(2000, lambda e: directions[(e.frame_count // 40) % 4])
+    assert score == engine.score
+    assert engine.game_over or engine.frame_count == 2000
+    print(f"✅ Headless game finished: score {score} after {engine.frame_count} frames")
+
+def test_spatial_hash():
+    """Test spatial hash queries and a swarm engine using them"""
+    import random
+    
+    nearby = SpatialHash(CELL_SIZE)
+    nearby.sync([(0, 0), (25, 5), (200, 200)])
+    assert nearby.query(10, 10, CELL_SIZE) == [0, 1]
+    nearby.move(1, 300, 300)
+    assert nearby.query(10, 10, CELL_SIZE) == [0]
+    nearby.sync([(0, 0)])
+    assert len(nearby) == 1 and nearby.query(300, 300, CELL_SIZE) == []
+    
+    # Hashed and scanning swarms play out identically
+    engines = []
+    for spatial_hash in (True, False):
+        random.seed(2)
+        engine = GameEngine(ghost_count=120, spatial_hash=spatial_hash)
+        engine.lives = 1000
+        for _ in range(300):
+            engine.update()
+        engines.append(engine)
+    hashed, scanned = engines
+    assert hashed.score == scanned.score and hashed.lives == scanned.lives
+    assert [(g.x, g.y) for g in hashed.ghosts] == [(g.x, g.y) for g in scanned.ghosts]
+    print(f"✅ Spatial hash swarm of {len(hashed.ghosts)} ghosts matches the full scan")
+
+def test_ghost_pool():
+    """Test slotted entities and ghosts stored in a GhostPool"""
+    import random
+    
+    ghost = Ghost(0, 0, GhostType.RED, NEON_RED)
+    assert not hasattr(ghost, '__dict__') and not hasattr(Pacman(0, 0), '__dict__')
+    
+    pool = GhostPool(8)
+    pooled = pool.add(100, 60, GhostType.BLUE, NEON_BLUE)
+    pooled.x += 3
+    pooled.direction = Direction.LEFT
+    pooled.scatter_mode = True
+    assert (pool.x[0], pool.direction[0], pool.scatter_mode[0]) == (103, DIRECTION_INDEX[Direction.LEFT], 1)
+    assert pooled.direction == Direction.LEFT and pooled.scatter_mode is True
+    pool.view('x')[0] = 40
+    assert pooled.x == 40
+    pool.add(300, 300, GhostType.RED, NEON_RED)
+    assert list(pool.within(50, 60, CELL_SIZE)) == [0]
+    
+    # Pooled and slotted engines play out identically
+    states = []
+    for ghost_pool in (False, True):
+        random.seed(4)
+        engine = GameEngine(ghost_count=12, ghost_pool=ghost_pool)
+        engine.run(600)
+        states.append((engine.score, engine.lives, [(g.x, g.y, g.direction) for g in engine.ghosts]))
+    assert states[0] == states[1]
+    print(f"✅ GhostPool views: {pool.bytes_per_ghost()} buffer bytes per ghost")
+
+def test_maze_grid():
+    """Test the flag grid behind the maze cell sets"""
+    maze = Maze()
+    assert len(maze.walls) == maze.count(CELL_WALL) == len(set(maze.walls))
+    assert maze.remaining_pellets() == len(maze.pellets) + len(maze.power_pellets)
+    assert (0, 0) in maze.walls and (-1, 0) not in maze.walls and "cell" not in maze.walls
+    assert not (set(maze.walls) & set(maze.pellets))
+    
+    cell = next(iter(maze.pellets))
+    maze.pellets.remove(cell)
+    assert cell not in maze.pellets and maze.count(CELL_PELLET) == len(maze.pellets)
+    maze.pellets = [cell]
+    assert set(maze.pellets) == {cell} and maze.pellets | {(1, 1)} == {cell, (1, 1)}
+    try:
+        maze.pellets.add((maze.width, 0))
+        assert False, "off-grid cells should be rejected"
+    except ValueError:
+        pass
+    
+    # Wall edits drop the cached path indexes
+    distances = maze.distances()
+    maze.walls.add(cell)
+    assert maze.distances() is not distances and cell not in maze.distances()
+    print("✅ Maze grid keeps its cell sets, counts and path indexes in step")
+
+def test_maze_generator():
+    """Test seeded procedural mazes and a game played on one"""
+    maze = Maze(41, 31, seed=5)
+    assert (maze.cells == Maze(41, 31, seed=5).cells).all()
+    assert not (maze.cells == Maze(41, 31, seed=6).cells).all()
+    walls = (maze.cells & CELL_WALL) != 0
+    assert (walls == walls[:, ::-1]).all(), "layout should be left-right symmetric"
+    
+    # Every open cell is reachable from Pacman's spawn
+    distances = maze.distances()
+    assert len(distances.cells) == maze.width * maze.height - len(maze.walls)
+    assert all(distances.distance(maze.pacman_start, cell) != MazeDistances.UNREACHABLE
+               for cell in distances.cells)
+    assert len(maze.power_pellets) == 4
+    assert maze.pacman_start not in maze.pellets
+    
+    large = Maze(1000, 1000, seed=1)
+    assert large.remaining_pellets() > 0 and large.generate_time < 5
+    try:
+        Maze(10, 10, seed=1)
+        assert False, "tiny mazes should be rejected"
+    except ValueError:
+        pass
+    
+    engine = GameEngine(maze=maze)
+    assert (engine.pacman.x // CELL_SIZE, engine.pacman.y // CELL_SIZE) == maze.pacman_start
+    engine.run(500)
+    assert engine.frame_count > 0
+    
+    # Ghosts scatter, patrol and wander over the whole of a large maze
+    big = Maze(160, 120, seed=3)
+    engine = GameEngine(maze=big)
+    far_x, far_y = (big.width - 2) * CELL_SIZE, (big.height - 2) * CELL_SIZE
+    blue = next(g for g in engine.ghosts if g.ghost_type == GhostType.BLUE)
+    assert blue.home_corner == (far_x, far_y)
+    assert max(x for x, _ in blue.patrol_points) > MAZE_WIDTH * CELL_SIZE
+    from pacman_batch import BatchEngine
+    batch = BatchEngine(1, 0, [g.ghost_type for g in engine.ghosts], big)
+    assert (far_x, far_y) in zip(batch.home_x.tolist(), batch.home_y.tolist())
+    print(f"✅ Generated mazes are reproducible, symmetric and connected (1000x1000 in {large.generate_time * 1000:.0f} ms)")
+
+def test_level_files():
+    """Test saving and memory-mapping levels and level packs"""
+    import os
+    import tempfile
+    from pacman_levels import LevelPack, load_level, save_level, save_level_pack
+    
+    maze = Maze()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "classic.lvl")
+        save_level(path, maze, tables=True)
+        loaded = load_level(path)
+        assert (loaded.cells == maze.cells).all() and loaded.counts == maze.counts
+        assert loaded.ghost_respawns == maze.ghost_respawns
+        assert (loaded.distances().matrix == maze.distances().matrix).all()
+        assert loaded.junctions().edges == maze.junctions().edges
+        
+        # Eating in a loaded maze stays private to it
+        cell = next(iter(loaded.pellets))
+        loaded.pellets.remove(cell)
+        assert cell in load_level(path).pellets
+        
+        # Junctions alone, and junctions kept when distances cannot fit uint16
+        junctions_path = os.path.join(directory, "junctions.lvl")
+        save_level(junctions_path, maze, junctions=True)
+        loaded = load_level(junctions_path)
+        assert loaded._distances is None and loaded.junctions().nodes == maze.junctions().nodes
+        assert dict(loaded.junctions().exits) == dict(maze.junctions().exits)
+        huge = Maze(401, 401, seed=0)
+        huge_path = os.path.join(directory, "huge.lvl")
+        save_level(huge_path, huge, tables=True)
+        loaded = load_level(huge_path)
+        assert loaded._distances is None and loaded.junctions().edges == huge.junctions().edges
+        
+        generated = [Maze(61, 45, seed=seed) for seed in range(3)]
+        pack_path = os.path.join(directory, "levels.pack")
+        save_level_pack(pack_path, generated)
+        with LevelPack(pack_path) as pack:
+            levels = list(pack)
+        assert len(levels) == 3
+        assert all((a.cells == b.cells).all() and a.pacman_start == b.pacman_start
+                   for a, b in zip(generated, levels))
+        engine = GameEngine(maze=levels[1])
+        engine.run(300)
+        
+        try:
+            LevelPack(path)
+            assert False, "a level file is not a pack"
+        except ValueError:
+            pass
+        del loaded, levels, engine
+    print("✅ Levels round-trip through files and level packs")
+
+def test_fixed_timestep():
+    """Test the fixed-timestep accumulator against a fake clock"""
+    now = [0.0]
+    timestep = FixedTimestep(rate=60, max_catch_up=5, clock=lambda: now[0])
+    assert timestep.advance() == 0
+    now[0] += 1 / 60 * 2.5
+    assert timestep.advance() == 2 and abs(timestep.alpha - 0.5) < 1e-6
+    now[0] += 1 / 120
+    assert timestep.advance() == 1 and timestep.alpha < 1e-6
+    
+    # A long stall runs at most max_catch_up ticks and drops the rest
+    now[0] += 1.0
+    assert timestep.advance() == 5 and timestep.dropped_ticks == 55
+    assert 0 <= timestep.alpha < 1
+    print("✅ Fixed timestep ticks, interpolates and bounds catch-up")
+
+def test_seeded_engine():
+    """Test that a seeded RNG and input stream replay a game exactly"""
+    import random
+    
+    def play(seed, noise):
+        random.seed(noise)  # The global random module must not matter
+        engine = GameEngine(rng=random.Random(seed), ghost_count=6)
+        directions = list(Direction)
+        for frame in range(1500):
+            engine.step(directions[frame // 40 % 4] if frame % 40 == 0 else None)
+        return (engine.score, engine.lives, engine.frame_count, set(engine.maze.pellets),
+                [(g.x, g.y, g.direction) for g in engine.ghosts])
+    
+    assert play(7, 1) == play(7, 2)
+    assert play(7, 1) != play(8, 1)
+    print("✅ Seeded engines replay identically regardless of global randomness")
+
+def test_replay():
+    """Test recording inputs and replaying them, headless and rendered"""
+    import tempfile
+    from pacman_replay import Recording, replay
+    
+    recording = Recording(seed=4, ghost_count=5)
+    engine = recording.engine()
+    directions = list(Direction)
+    while not engine.game_over and engine.frame_count < 2000:
+        if engine.frame_count % 25 == 0:
+            direction = directions[(engine.frame_count // 25 * 7) % 4]
+            recording.record(engine.frame_count, direction)
+            engine.pacman.set_direction(direction)
+        engine.update()
+    recording.finish(engine)
+    assert len(recording.data) < 2 * len(list(recording.inputs())) + 1
+    
+    loaded = Recording.from_bytes(recording.to_bytes())
+    replayed = replay(loaded)
+    assert (replayed.frame_count, replayed.score, replayed.lives) == (engine.frame_count, engine.score, engine.lives)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        rendered = replay(loaded, render_every=100, output=directory)
+        assert rendered.score == engine.score
+        assert len(os.listdir(directory)) == engine.frame_count // 100
+    print(f"✅ {engine.frame_count} recorded frames replay exactly from {len(recording.to_bytes())} bytes")
+
+def test_snapshot_restore():
+    """Test snapshots, rollback and copy-on-write clones"""
+    import random
+    
+    for junction_ai in (False, True):
+        engine = GameEngine(rng=random.Random(3), junction_ai=junction_ai, ghost_pool=junction_ai)
+        engine.run(200)
+        snapshot = engine.snapshot()
+        
+        def outcome():
+            engine.run(engine.frame_count + 600)
+            return (engine.score, engine.lives, engine.frame_count, engine.game_over,
+                    set(engine.maze.pellets), [(g.x, g.y, g.direction, g.target_x) for g in engine.ghosts])
+        
+        first = outcome()
+        engine.restore(snapshot)
+        assert outcome() == first
+        
+        # Clones play on without touching the original or its snapshot grid
+        engine.restore(snapshot)
+        pellets = len(engine.maze.pellets)
+        clone = engine.clone()
+        clone.run(clone.frame_count + 600)
+        assert clone.score == first[0] and len(engine.maze.pellets) == pellets
+        assert engine.snapshot().grid is snapshot.grid
+    
+    # Snapshots share the grid until a pellet is eaten
+    engine = GameEngine(rng=random.Random(4))
+    before = engine.snapshot(rng=False)
+    assert engine.snapshot(rng=False).grid is before.grid and before.rng_state is None
+    engine.maze.pellets.discard(next(iter(engine.maze.pellets)))
+    assert engine.snapshot().grid is not before.grid
+    engine.restore(before)
+    assert engine.maze.remaining_pellets() == before.counts[1] + before.counts[2]
+    print("✅ Snapshots restore exactly and clones share state copy-on-write")
+
+def test_autopilot():
+    """Test the search autopilot in-process and over a worker pool"""
+    import random
+    from pacman_autopilot import Autopilot, play
+    
+    scores = []
+    for _ in range(2):
+        engine = GameEngine(rng=random.Random(1))
+        autopilot = Autopilot(engine, workers=0, time_budget=None, max_rollouts=8, seed=1)
+        scores.append(play(engine, autopilot, 400))
+    idle = GameEngine(rng=random.Random(1))
+    idle.run(400)
+    assert scores[0] == scores[1], "a capped search should be reproducible"
+    assert scores[0] > idle.score
+    
+    engine = GameEngine(rng=random.Random(2))
+    autopilot = Autopilot(engine, workers=2, time_budget=0.005)
+    try:
+        play(engine, autopilot, 60)
+    finally:
+        autopilot.close()
+    assert autopilot.stats()['decisions'] > 0 and autopilot.rollouts >= autopilot.decisions
+    
+    # Too many cells for a distance matrix: the pellet pull falls back to Manhattan distance
+    engine = GameEngine(maze=Maze(401, 401, seed=1), rng=random.Random(3))
+    autopilot = Autopilot(engine, workers=0, time_budget=None, max_rollouts=4)
+    assert autopilot.local.distances is None
+    play(engine, autopilot, 30)
+    assert autopilot.stats()['decisions'] > 0
+    print(f"✅ Autopilot scored {scores[0]} in 400 frames against {idle.score} unsteered")
+
+def test_gym_env():
+    """Test the RL environment and that worker processes match in-process stepping"""
+    import numpy as np
+    from pacman_gym import PacmanEnv, VectorPacmanEnv, ACTION_COUNT, observation_shape
+    
+    env = PacmanEnv()
+    observation, info = env.reset(seed=5)
+    assert observation.shape == observation_shape() and observation.dtype == np.uint8
+    assert observation[3].sum() == 1 and observation[4].sum() == len(env.engine.ghosts)
+    assert observation[1].sum() == env.engine.maze.count(CELL_PELLET)
+    total = 0.0
+    for step in range(200):
+        observation, reward, terminated, truncated, info = env.step(step // 25 % ACTION_COUNT)
+        total += reward
+    assert total == info['score'] and not truncated
+    
+    # Other maze sizes: a fixed maze is copied fresh for every episode,
+    # maze_size generates a new one per episode
+    maze = Maze(41, 31, seed=4)
+    pellets = maze.remaining_pellets()
+    env = PacmanEnv(maze=maze)
+    assert env.reset(seed=1)[0].shape == observation_shape(41, 31)
+    while env.engine.maze.remaining_pellets() == pellets:
+        env.step(0)
+    env.reset()
+    assert env.engine.maze.remaining_pellets() == pellets == maze.remaining_pellets()
+    with VectorPacmanEnv(2, 1, maze_size=(45, 33)) as envs:
+        first = envs.reset(seed=2).copy()
+        assert first.shape == (2,) + observation_shape(45, 33)
+        assert not np.array_equal(first[0, 0], first[1, 0]), "each env should get its own maze"
+        envs.step([0, 1])
+    
+    def play(workers):
+        rng = np.random.default_rng(0)
+        results = []
+        with VectorPacmanEnv(4, workers, max_steps=150) as envs:
+            envs.reset(seed=9)
+            for _ in range(200):
+                observations, rewards, terminated, truncated, info = envs.step(rng.integers(0, ACTION_COUNT, 4))
+                results.append((observations.copy(), rewards.copy(), truncated.copy(), info['score'].copy()))
+        return results
+    
+    local, pooled = play(0), play(2)
+    assert sum(step[2].sum() for step in local) == 4, "every env should truncate and auto-reset once"
+    for a, b in zip(local, pooled):
+        assert all(np.array_equal(x, y) for x, y in zip(a, b))
+    print("✅ Gym environment steps identically in-process and in workers")
+
+def test_tournament():
+    """Test tournament episodes are reproducible across processes and stream to CSV"""
+    import csv
+    import tempfile
+    from pacman_tournament import config_grid, run_tournament, summarize, ResultWriter
+    
+    configs = config_grid({'chase_radius_cells': [3, 8], 'mode_period': [300]})
+    assert [c.chase_radius_cells for c in configs] == [3, 8] and configs[0].prediction_cells == 4
+    local = list(run_tournament(configs, range(2), max_frames=600, workers=0))
+    pooled = list(run_tournament(configs, range(2), max_frames=600, workers=2))
+    key = lambda row: (row['config'], row['seed'])
+    assert sorted(local, key=key) == sorted(pooled, key=key)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results.csv")
+        with ResultWriter(path) as writer:
+            for row in pooled:
+                writer.write(row)
+        with open(path, newline="") as f:
+            assert len(list(csv.DictReader(f))) == len(pooled)
+    
+    summary = summarize(local)
+    assert [stats['episodes'] for stats in summary] == [2, 2]
+    assert all(stats['pellets_eaten'] > 0 for stats in summary)
+    print(f"✅ Tournament played {len(local)} episodes, identical in-process and pooled")
+
+def test_profiler():
+    """Test phase ring buffers, percentiles, trace export and the null profiler"""
+    import json
+    import tempfile
+    from pacman_profiler import FrameProfiler, NullProfiler, NULL_PROFILER
+    
+    profiler = FrameProfiler(capacity=100, trace_capacity=50)
+    for i in range(1, 201):
+        profiler.record('phase', 0.0, i / 1000)
+    assert profiler.phases['phase'].count == 200
+    assert profiler.percentiles('phase') == (150.0, 195.0, 199.0)  # Only the last 100 are kept
+    assert len(profiler.spans()) == 50
+    
+    engine = GameEngine()
+    engine.profiler = profiler
+    lap = profiler.begin()
+    with profiler.scope('frame'):
+        engine.update()
+    profiler.lap('after', lap)
+    summary = profiler.summary()
+    assert summary['engine.ghosts']['count'] == 1 and summary['frame']['p99'] >= summary['engine.ghosts']['p99']
+    
+    with tempfile.TemporaryDirectory() as directory:
+        trace = os.path.join(directory, "trace.json")
+        profiler.export(trace)
+        with open(trace) as f:
+            events = json.load(f)['traceEvents']
+        assert {'frame', 'engine.ghosts', 'after'} <= {event['name'] for event in events}
+        assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+        table = os.path.join(directory, "trace.csv")
+        profiler.export(table)
+        with open(table) as f:
+            assert f.readline().strip() == "phase,start_ms,duration_ms"
+    
+    assert isinstance(NULL_PROFILER, NullProfiler) and not NULL_PROFILER.enabled
+    with NULL_PROFILER.scope('anything'):
+        NULL_PROFILER.lap('anything', NULL_PROFILER.begin())
+    assert NULL_PROFILER.summary() == {}
+    print("✅ Profiler keeps rolling percentiles and exports Chrome traces")
+
+def test_benchmark_suite():
+    """Test a suite scenario's metrics and the baseline regression gate"""
+    from benchmark import run_scenario, compare_to_baseline
+    
+    metrics = run_scenario('headless', frames=60, alloc_frames=5, seed=0)
+    assert metrics['updates_per_sec'] > 0 and metrics['draws_per_sec'] is None
+    assert metrics['alloc_peak_kb'] >= 0
+    
+    baseline = {'scenarios': {'headless': dict(metrics)}}
+    results = {'scenarios': {'headless': dict(metrics)}}
+    assert not any(row[5] for row in compare_to_baseline(results, baseline, 0.15))
+    results['scenarios']['headless']['updates_per_sec'] = metrics['updates_per_sec'] * 0.5
+    regressed = [row[1] for row in compare_to_baseline(results, baseline, 0.15) if row[5]]
+    assert regressed == ['updates_per_sec']
+    print(f"✅ Benchmark suite gates regressions ({metrics['updates_per_sec']:.0f} headless updates/s)")
+
+def test_batch_matches_engine():
+    """Test that the batch simulator reproduces GameEngine frame for frame"""
+    import random
+    import numpy as np
+    from pacman_batch import BatchEngine
+    
+    random.seed(5)
+    engines = [GameEngine() for _ in range(6)]
+    for engine in engines:
+        # Three ghosts keep the comparison deterministic (purple rolls its own dice)
+        engine.ghosts = engine.ghosts[:3]
+    batch = BatchEngine.from_engines(engines, seed=1)
+    directions = list(Direction)
+    
+    for frame in range(800):
+        actions = np.array([(frame // (23 + n * 7) + n) % 4 if frame % 5 == 0 else -1
+                            for n in range(len(engines))])
+        for n, engine in enumerate(engines):
+            engine.step(directions[actions[n]] if actions[n] >= 0 else None)
+        batch.step(actions)
+        for n, engine in enumerate(engines):
+            expected = (engine.pacman.x, engine.pacman.y, engine.score, engine.lives,
+                        engine.game_over, [(g.x, g.y) for g in engine.ghosts])
+            actual = (batch.pacman_x[n], batch.pacman_y[n], batch.score[n], batch.lives[n],
+                      batch.game_over[n], [(batch.ghost_x[g, n], batch.ghost_y[g, n]) for g in range(3)])
+            assert expected == actual, f"frame {frame} game {n}: {expected} != {actual}"
+    
+    results = BatchEngine(500, seed=3).run(3000)
+    assert len(results['score']) == 500
+    assert (results['frames'] > 0).all()
+    print("✅ Batch simulator matches GameEngine for 800 frames")
+
+if __name__ == "__main__":
+    try:
+        test_engine_is_headless()
+        test_engine_events()
+        test_engine_run()
+        test_spatial_hash()
+        test_ghost_pool()
+        test_maze_grid()
+        test_maze_generator()
+        test_level_files()
+        test_fixed_timestep()
+        test_seeded_engine()
+        test_replay()
+        test_snapshot_restore()
+        test_autopilot()
+        test_gym_env()
+        test_tournament()
+        test_profiler()
+        test_benchmark_suite()
+        test_batch_matches_engine()
+        print("\n✅ ALL TESTS PASSED!")
+    except Exception as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        sys.exit(1)